@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+#
+# import_time.py
+#
+# Time taken to import operations.cumulus_operations in a fresh interpreter,
+# and the connections made and host names looked up while importing it:
+#
+#     python3 benchmarks/import_time.py [runs]
+#
+# Each run imports the module in a subprocess whose socket module counts
+# connect() and getaddrinfo() calls. Clients and credentials are built on
+# first use, so both counts should be 0.
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, socket, sys, time
+
+connections = []
+lookups = []
+
+
+class ProbeSocket(socket.socket):
+
+    def connect(self, address):
+        connections.append(address)
+        return super(ProbeSocket, self).connect(address)
+
+    def connect_ex(self, address):
+        connections.append(address)
+        return super(ProbeSocket, self).connect_ex(address)
+
+
+getaddrinfo = socket.getaddrinfo
+socket.socket = ProbeSocket
+socket.getaddrinfo = lambda *args, **kwargs: (lookups.append(args)
+                                              or getaddrinfo(*args, **kwargs))
+
+started = time.perf_counter()
+import operations.cumulus_operations
+print(json.dumps({'seconds': time.perf_counter() - started,
+                  'connections': len(connections), 'lookups': len(lookups)}))
+"""
+
+
+def run():
+    """
+    :return: dict of {'seconds', 'connections', 'lookups'} for one import
+    """
+    environment = dict(os.environ,
+                       PYTHONPATH=os.pathsep.join([ROOT] + sys.path))
+    output = subprocess.check_output([sys.executable, '-c', PROBE],
+                                     cwd=ROOT, env=environment)
+
+    return json.loads(output.decode('utf-8').splitlines()[-1])
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    print('{:>4} {:>10} {:>12} {:>8}'.format(
+        'run', 'seconds', 'connections', 'lookups'))
+    for number in range(1, runs + 1):
+        result = run()
+        print('{:>4} {:>10.3f} {:>12} {:>8}'.format(
+            number, result['seconds'], result['connections'],
+            result['lookups']))
+
+
+if __name__ == '__main__':
+    main()
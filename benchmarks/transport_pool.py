@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+#
+# transport_pool.py
+#
+# Throughput of the shared sessions against a local stand-in server as the
+# number of worker threads grows past requests' default pool of ten
+# connections per host:
+#
+#     python3 benchmarks/transport_pool.py
+#
+# Each thread count is run through a session from transport.build_session()
+# sized for the largest count, and through a default requests.Session. Past
+# ten workers the default session discards a connection every time it is
+# returned to a full pool and opens a new one for the next request;
+# "opened" counts the connections the server accepted, "churned" those
+# beyond one per worker.
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, 'tests')):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+import operations.transport as transport
+from stand_in_server import StandInServer
+
+WORKERS = (8, 16, 32, 64)
+# GETs sent per worker at each size.
+REQUESTS = 20
+# Seconds the stand-in takes to answer.
+LATENCY = 0.05
+
+
+def run(session, server, workers):
+    """
+    :return: (GETs per second, connections opened)
+    """
+    before = server.connections
+    started = time.time()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for response in executor.map(lambda _: session.get(server.url),
+                                     range(REQUESTS * workers)):
+            response.close()
+
+    return (REQUESTS * workers / (time.time() - started),
+            server.connections - before)
+
+
+def main():
+    import logging
+    from requests import Session
+
+    # the default session warns on every discarded connection
+    logging.getLogger('urllib3').setLevel(logging.ERROR)
+
+    print('{:>8} {:>8} {:>10} {:>8} {:>8}'.format(
+        'session', 'workers', 'GETs/s', 'opened', 'churned'))
+    with StandInServer(latency=lambda: LATENCY) as server:
+        for label in ('pooled', 'default'):
+            for workers in WORKERS:
+                if label == 'pooled':
+                    session = transport.build_session(transport.TransportConfig(
+                        pool_maxsize=max(WORKERS), rate_limit=False))
+                else:
+                    session = Session()
+                per_second, opened = run(session, server, workers)
+                session.close()
+                print('{:>8} {:>8} {:>10.0f} {:>8} {:>8}'.format(
+                    label, workers, per_second, opened,
+                    max(opened - workers, 0)))
+
+
+if __name__ == '__main__':
+    main()
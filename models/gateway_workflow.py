@@ -92,81 +92,34 @@ resource_set.append(
 # Create Subnets
 #***************
 
-print("Creating gateway subnet...")
-
-subnet_parameters = {'address_prefix': SUBNET_PREFIX}
-
-# cumulus.create_update_subnets(
-#     GROUP_NAME,
-#     VNET_NAME,
-#     SUBNET_NAME,
-#     subnet_parameters
-# )
-
-resource_set.append(
-    cumulus.get_subnets(
-        GROUP_NAME,
-        VNET_NAME,
-        SUBNET_NAME
-    )
-)
-
-print("Creating subnet 10_71_0_0")
-
-subnet_parameters = {'address_prefix': SUBNET_PREFIX_10_70_0_0}
-
-# cumulus.create_update_subnets(
-#     GROUP_NAME,
-#     VNET_NAME,
-#     SUBNET_NAME_10_70_0_0,
-#     subnet_parameters
-# )
-
-resource_set.append(
-    cumulus.get_subnets(
-        GROUP_NAME,
-        VNET_NAME,
-        SUBNET_NAME_10_70_0_0
-    )
-)
-
-print("Creating subnet 10_71_4_0")
-
-subnet_parameters = {'address_prefix': SUBNET_PREFIX_10_70_4_0}
-
-# cumulus.create_update_subnets(
+print("Creating gateway subnet and subnets 10_71_0_0, 10_71_4_0, 10_71_8_0...")
+
+subnets = [
+    {'name': SUBNET_NAME,
+     'address_prefix': SUBNET_PREFIX},
+    {'name': SUBNET_NAME_10_70_0_0,
+     'address_prefix': SUBNET_PREFIX_10_70_0_0},
+    {'name': SUBNET_NAME_10_70_4_0,
+     'address_prefix': SUBNET_PREFIX_10_70_4_0},
+    {'name': SUBNET_NAME_10_70_8_0,
+     'address_prefix': SUBNET_PREFIX_10_70_8_0}
+]
+
+# One virtual network update instead of one subnet operation per subnet
+# bulk_apply.apply_subnets(
 #     GROUP_NAME,
 #     VNET_NAME,
-#     SUBNET_NAME_10_70_4_0,
-#     subnet_parameters
+#     subnets
 # )
 
-resource_set.append(
-    cumulus.get_subnets(
-        GROUP_NAME,
-        VNET_NAME,
-        SUBNET_NAME_10_70_4_0
+for subnet in subnets:
+    resource_set.append(
+        cumulus.get_subnets(
+            GROUP_NAME,
+            VNET_NAME,
+            subnet['name']
+        )
     )
-)
-
-print("Creating subnet 10_71_8_0")
-
-subnet_parameters = {'address_prefix': SUBNET_PREFIX_10_70_8_0}
-
-# cumulus.create_update_subnets(
-#     GROUP_NAME,
-#     VNET_NAME,
-#     SUBNET_NAME_10_70_8_0,
-#     subnet_parameters
-# )
-
-resource_set.append(
-    cumulus.get_subnets(
-        GROUP_NAME,
-        VNET_NAME,
-        SUBNET_NAME_10_70_8_0
-    )
-)
 
 # Create Public IP Address
 #*************************
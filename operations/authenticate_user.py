@@ -1,32 +1,204 @@
-import models.data.pgm_test_data as data
+import threading
 
-from msrestazure.azure_cloud import AZURE_US_GOV_CLOUD
-from azure.mgmt.network import NetworkManagementClient
-from azure.mgmt.resource import ResourceManagementClient
+import operations.client_pool as client_pool
+import operations.provider_registration as provider_registration
+import operations.token_cache as token_cache
+import operations.token_refresher as token_refresher
+import operations.transport as transport
 
-from azure.common.credentials import ServicePrincipalCredentials
-from msrest.exceptions import AuthenticationError
+# Clients are built on first use rather than at import time, so importing
+# cumulus does not pay for an AAD token, the management client construction
+# or the Microsoft.Network provider registration until a call needs them.
 
-# Create Service Principal
-try:
-    credentials = ServicePrincipalCredentials(
-        client_id=data.CLIENT,
-        secret=data.KEY,
-        tenant=data.TENANT_ID,
-        cloud_environment=AZURE_US_GOV_CLOUD)
+PROVIDER_NAMESPACES = ['Microsoft.Network']
 
-except AuthenticationError as e:
-    print(e)
+_lock = threading.RLock()
+_credentials = {}
+_registered_subscriptions = set()
 
-network_client = NetworkManagementClient(
-    credentials,
-    data.subscription_id,
-    base_url=AZURE_US_GOV_CLOUD.endpoints.resource_manager)
 
-resource_client = ResourceManagementClient(
-    credentials,
-    data.subscription_id,
-    base_url=AZURE_US_GOV_CLOUD.endpoints.resource_manager)
+class LazyClient(object):
+    """
+    Stand-in for a management client that builds the real client on first
+    attribute access.
 
+    :param factory: (callable) – returns the underlying client.
+    """
 
-resource_client.providers.register('Microsoft.Network')
\ No newline at end of file
+    def __init__(self, factory):
+        self._factory = factory
+
+    def __getattr__(self, name):
+        return getattr(self._factory(), name)
+
+
+def default_cloud():
+    """
+    The cloud used when a call does not name one.
+
+    :return: Cloud
+    """
+    from msrestazure.azure_cloud import AZURE_US_GOV_CLOUD
+
+    return AZURE_US_GOV_CLOUD
+
+
+def get_credentials(cloud=None):
+    """
+    Create the Service Principal for a cloud the first time it is needed.
+
+    :param cloud: (Cloud) – defaults to default_cloud().
+    :return: ServicePrincipalCredentials
+    :raises: AuthenticationError
+    """
+    cloud = cloud or default_cloud()
+
+    with _lock:
+        credentials = _credentials.get(cloud.name)
+        if credentials is None:
+            import models.data.pgm_test_data as data
+
+            from msrest.exceptions import AuthenticationError
+
+            # Create Service Principal, reusing a cached token when possible
+            try:
+                credentials = token_cache.service_principal_credentials(
+                    client_id=data.CLIENT,
+                    secret=data.KEY,
+                    tenant=data.TENANT_ID,
+                    cloud_environment=cloud)
+
+            except AuthenticationError as e:
+                print(e)
+                raise
+
+            # Keep the shared token fresh for long-running operations
+            token_refresher.start(credentials)
+            _credentials[cloud.name] = credentials
+
+        return credentials
+
+
+def resolve_context(context=None):
+    """
+    Fill in the default subscription, cloud and credentials.
+
+    :param context: (ClientContext) – partial context, or None.
+    :return: ClientContext
+    """
+    context = context or client_pool.ClientContext()
+    if (context.subscription_id is not None and context.cloud is not None
+            and context.credentials is not None):
+        return context
+
+    import models.data.pgm_test_data as data
+
+    cloud = context.cloud or default_cloud()
+    return client_pool.ClientContext(
+        subscription_id=context.subscription_id or data.subscription_id,
+        cloud=cloud,
+        credentials=context.credentials or get_credentials(cloud))
+
+
+def _build_client(kind, context):
+    if kind == 'network':
+        from azure.mgmt.network import NetworkManagementClient as client_class
+
+        # once per subscription, before its first network client is used
+        register_providers(context)
+    else:
+        from azure.mgmt.resource import ResourceManagementClient as client_class
+
+    return client_class(
+        context.credentials,
+        context.subscription_id,
+        base_url=context.cloud.endpoints.resource_manager)
+
+
+pool = client_pool.ClientPool(_build_client)
+
+
+def configure_transport(**kwargs):
+    """
+    Change the HTTP connection pooling used by every management client, e.g.
+    configure_transport(pool_maxsize=64) before fanning out 64 workers.
+
+    :param kwargs: TransportConfig settings: pool_connections, pool_maxsize,
+        pool_block, keep_alive, gzip, timeout, rate_limit,
+        adaptive_concurrency, circuit_breaker and hedged_reads.
+    :return: TransportConfig
+    """
+    config = transport.TransportConfig(**kwargs)
+    pool.configure(config)
+
+    return config
+
+
+def get_network_client(context=None):
+    """
+    Return the pooled NetworkManagementClient for context. The
+    Microsoft.Network provider is registered in its subscription when the
+    client is first built.
+
+    :param context: (ClientContext) – subscription/cloud to use; defaults to
+        the configured subscription.
+    :return: NetworkManagementClient
+    """
+    return pool.get('network', resolve_context(context))
+
+
+def get_resource_client(context=None):
+    """
+    Return the pooled ResourceManagementClient for context.
+
+    :param context: (ClientContext) – subscription/cloud to use; defaults to
+        the configured subscription.
+    :return: ResourceManagementClient
+    """
+    return pool.get('resource', resolve_context(context))
+
+
+def get_operations(rtype, context=None):
+    """
+    Return the operations group that serves a resource family, e.g.
+    network_client.subnets.
+
+    :param rtype: (ResourceType) – the resource family.
+    :param context: (ClientContext) – subscription/cloud to use.
+    :return: operations group instance
+    """
+    if rtype.client == 'network':
+        client = get_network_client(context)
+    else:
+        client = get_resource_client(context)
+
+    return getattr(client, rtype.group)
+
+
+def register_providers(context=None):
+    """
+    Register the providers cumulus needs once per subscription, skipping the
+    ARM calls while the locally cached registration state is still fresh.
+
+    :param context: (ClientContext) – subscription/cloud to register in.
+    :return: none
+    """
+    context = resolve_context(context)
+    key = (context.cloud.name, context.subscription_id)
+
+    with _lock:
+        if key in _registered_subscriptions:
+            return
+
+    # not under _lock: it is called from the client pool's factory, which
+    # already holds the pool's lock
+    manager = provider_registration.RegistrationManager(
+        get_resource_client(context),
+        context.subscription_id)
+    manager.ensure_registered(PROVIDER_NAMESPACES)
+    with _lock:
+        _registered_subscriptions.add(key)
+
+
+network_client = LazyClient(get_network_client)
+resource_client = LazyClient(get_resource_client)
@@ -0,0 +1,425 @@
+#!/usr/bin/python3
+#
+# bulk_apply.py
+#
+# Applies many child resources (security rules, routes, subnets) through
+# one PUT of their parent, instead of one long-running operation per child
+# that ARM serializes on the parent anyway.
+#
+#     result = bulk_apply.apply_security_rules(
+#         GROUP_NAME, NSG_NAME, rules, remove=['old-rule'])
+#     print(result.lros_avoided)
+#
+#     result = bulk_apply.apply_routes(
+#         GROUP_NAME, ROUTE_TABLE_NAME, routes, mode=bulk_apply.REPLACE)
+#
+#     result = bulk_apply.apply_subnets(
+#         GROUP_NAME, VNET_NAME, [{'name': 'web', 'address_prefix': PREFIX}])
+
+import ipaddress
+from collections import namedtuple
+
+import operations.authenticate_user as clients
+import operations.circuit_breaker as circuit_breaker
+import operations.dispatch as dispatch
+import operations.json_reads as json_reads
+import operations.lro as lro
+import operations.metrics as metrics
+import operations.write_scheduler as write_scheduler
+from operations.desired_state import covers
+from operations.resource_types import RESOURCE_TYPES
+
+MERGE = 'merge'
+REPLACE = 'replace'
+
+# Times the read-merge-write is redone when the parent changed under it.
+MAX_ETAG_ATTEMPTS = 5
+
+MIN_RULE_PRIORITY = 100
+MAX_RULE_PRIORITY = 4096
+
+
+class BulkResult(namedtuple('BulkResult', [
+        'added', 'replaced', 'removed', 'unchanged', 'operation'])):
+    """
+    What a bulk apply did.
+
+    :param added: (list) – names of children created.
+    :param replaced: (list) – names of children whose definition changed.
+    :param removed: (list) – names of children deleted.
+    :param unchanged: (list) – names of children already as requested.
+    :param operation: the parent PUT's operation handle when no_wait=True,
+        otherwise None.
+    """
+
+    @property
+    def changes(self):
+        """
+        Number of children created, changed or deleted.
+        """
+        return len(self.added) + len(self.replaced) + len(self.removed)
+
+    @property
+    def lros_avoided(self):
+        """
+        Long-running operations one-per-child calls would have started,
+        less the single parent PUT sent instead.
+        """
+        return max(self.changes - 1, 0)
+
+
+def _name(item):
+    return item['name'].lower()
+
+
+def _merge(existing, items, mode, remove, overlay):
+    current = {_name(item): item for item in existing}
+    removals = set(name.lower() for name in remove)
+    added, replaced, unchanged = [], [], []
+
+    merged = [] if mode == REPLACE else [
+        item for item in existing if _name(item) not in removals]
+    positions = {_name(item): index for index, item in enumerate(merged)}
+
+    for item in items:
+        name = _name(item)
+        old = current.get(name)
+        if old is None:
+            added.append(item['name'])
+        elif covers(item, old):
+            unchanged.append(item['name'])
+            item = old
+        else:
+            replaced.append(item['name'])
+            if overlay:
+                item = _overlay(old, item)
+
+        if name in positions:
+            merged[positions[name]] = item
+        else:
+            positions[name] = len(merged)
+            merged.append(item)
+
+    kept = set(positions)
+    removed = [item['name'] for item in existing if _name(item) not in kept]
+    return merged, added, replaced, removed, unchanged
+
+
+def _overlay(old, new):
+    # new's values on top of old, keeping whatever new leaves out
+    if not (isinstance(old, dict) and isinstance(new, dict)):
+        return new
+
+    merged = dict(old)
+    for field, value in new.items():
+        merged[field] = _overlay(old.get(field), value)
+    return merged
+
+
+def _precondition_failed(operation):
+    exception = operation.exception() if operation.done() else None
+    return getattr(exception, 'status_code', None) == 412
+
+
+def _apply(parent_rtype, key, attribute, model, items, mode, remove,
+           validate, overlay, context, no_wait):
+    from msrestazure import azure_exceptions
+
+    if mode not in (MERGE, REPLACE):
+        raise ValueError("mode must be 'merge' or 'replace', not {!r}".format(
+            mode))
+
+    operations = clients.get_operations(parent_rtype, context)
+    items = [operations._serialize.body(item, model) for item in items]
+    names = [_name(item) for item in items]
+    if len(set(names)) != len(names):
+        raise ValueError('{} names must be unique'.format(model))
+
+    # Hold the parent from the read until the PUT has finished, so writes
+    # through cumulus in this process cannot land in between; If-Match
+    # catches everyone else, and the merge is redone on the fresh parent.
+    hold = write_scheduler.hold(parent_rtype, key, context)
+    operation = None
+    try:
+        for _ in range(MAX_ETAG_ATTEMPTS):
+            try:
+                parent = json_reads.get(parent_rtype, key, context=context)
+            except (azure_exceptions.CloudError,
+                    circuit_breaker.CircuitOpenError) as e:
+                print(e)
+                return None
+
+            properties = parent.setdefault('properties', {})
+            merged, added, replaced, removed, unchanged = _merge(
+                properties.get(attribute) or [], items, mode, remove,
+                overlay)
+            validate(merged)
+
+            result = BulkResult(added, replaced, removed, unchanged, None)
+            if not result.changes:
+                return result
+
+            properties[attribute] = merged
+            etag = parent.get('etag')
+            operation = dispatch.call(
+                parent_rtype, 'create_update', key, parent,
+                custom_headers={'If-Match': etag} if etag else None,
+                context=context, no_wait=True)
+            if not _precondition_failed(operation):
+                break
+
+            metrics.increment('bulk_apply_etag_retries')
+        else:
+            print(operation.exception())
+            return None
+
+        if no_wait:
+            return result._replace(operation=operation)
+
+        try:
+            print(lro.provisioning_state(operation.result()))
+        except (azure_exceptions.CloudError,
+                circuit_breaker.CircuitOpenError) as e:
+            print(e)
+            return None
+
+        return result
+
+    finally:
+        hold.release(operation)
+
+
+def check_rule_priorities(rules):
+    """
+    Raise if two rules in the same direction share a priority, or a
+    priority is out of range.
+
+    :param rules: (list) – security rules as REST dicts.
+    :return: none
+    :raises: ValueError listing every conflict
+    """
+    problems = []
+    seen = {}
+    for rule in rules:
+        properties = rule.get('properties', {})
+        priority = properties.get('priority')
+        direction = (properties.get('direction') or '').lower()
+        if priority is None or not (
+                MIN_RULE_PRIORITY <= priority <= MAX_RULE_PRIORITY):
+            problems.append('{}: priority {} is outside {}-{}'.format(
+                rule['name'], priority, MIN_RULE_PRIORITY, MAX_RULE_PRIORITY))
+            continue
+
+        other = seen.setdefault((direction, priority), rule['name'])
+        if other != rule['name']:
+            problems.append('{} and {}: both {} priority {}'.format(
+                other, rule['name'], direction, priority))
+
+    if problems:
+        raise ValueError('Security rule priority conflicts:\n\t'
+                         + '\n\t'.join(problems))
+
+
+def apply_security_rules(
+        resource_group_name,
+        network_security_group_name,
+        rules,
+        mode=MERGE,
+        remove=(),
+        context=None,
+        no_wait=False
+):
+    """
+    Apply a set of security rules to a network security group with a single
+    network_security_groups.create_or_update.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param network_security_group_name: (str) – The name of the network
+        security group.
+    :param rules: (list) – SecurityRule models or dicts; a rule whose name
+        exists already replaces it, any other is added.
+    :param mode: (str) – 'merge' keeps existing rules not in rules;
+        'replace' makes rules the NSG's complete rule set.
+    :param remove: (list) – names of existing rules to delete.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return as soon as the NSG update is accepted;
+        the handle is in the result's operation.
+    :return: BulkResult, or None if the NSG could not be read or updated
+    :raises: ValueError on duplicate names or priority conflicts, before
+        anything is sent
+    """
+    return _apply(
+        RESOURCE_TYPES['network_security_groups'],
+        (resource_group_name, network_security_group_name),
+        'securityRules',
+        'SecurityRule',
+        rules,
+        mode,
+        remove,
+        check_rule_priorities,
+        False,
+        context,
+        no_wait)
+
+
+def check_route_prefixes(routes):
+    """
+    Raise if two routes share an address prefix, which ARM rejects for the
+    whole route table.
+
+    :param routes: (list) – routes as REST dicts.
+    :return: none
+    :raises: ValueError listing every conflict
+    """
+    problems = []
+    seen = {}
+    for route in routes:
+        prefix = route.get('properties', {}).get('addressPrefix')
+        if not prefix:
+            problems.append('{}: no address prefix'.format(route['name']))
+            continue
+
+        other = seen.setdefault(prefix.lower(), route['name'])
+        if other != route['name']:
+            problems.append('{} and {}: both {}'.format(
+                other, route['name'], prefix))
+
+    if problems:
+        raise ValueError('Route prefix conflicts:\n\t'
+                         + '\n\t'.join(problems))
+
+
+def apply_routes(
+        resource_group_name,
+        route_table_name,
+        routes,
+        mode=MERGE,
+        remove=(),
+        context=None,
+        no_wait=False
+):
+    """
+    Apply a set of routes to a route table with a single
+    route_tables.create_or_update.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param route_table_name: (str) – The name of the route table.
+    :param routes: (list) – Route models or dicts; a route whose name exists
+        already replaces it, any other is added.
+    :param mode: (str) – 'merge' keeps existing routes not in routes;
+        'replace' makes routes the table's complete route set.
+    :param remove: (list) – names of existing routes to delete.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return as soon as the route table update is
+        accepted; the handle is in the result's operation.
+    :return: BulkResult, or None if the route table could not be read or
+        updated
+    :raises: ValueError on duplicate names or address prefixes, before
+        anything is sent
+    """
+    return _apply(
+        RESOURCE_TYPES['route_tables'],
+        (resource_group_name, route_table_name),
+        'routes',
+        'Route',
+        routes,
+        mode,
+        remove,
+        check_route_prefixes,
+        False,
+        context,
+        no_wait)
+
+
+def _subnet_prefixes(subnet):
+    properties = subnet.get('properties', {})
+    prefixes = list(properties.get('addressPrefixes') or [])
+    if properties.get('addressPrefix'):
+        prefixes.append(properties['addressPrefix'])
+    return prefixes
+
+
+def check_subnet_prefixes(subnets):
+    """
+    Raise if a subnet has no or an invalid address prefix, or two subnets'
+    prefixes overlap.
+
+    :param subnets: (list) – subnets as REST dicts.
+    :return: none
+    :raises: ValueError listing every conflict
+    """
+    problems = []
+    networks = []
+    for subnet in subnets:
+        prefixes = _subnet_prefixes(subnet)
+        if not prefixes:
+            problems.append('{}: no address prefix'.format(subnet['name']))
+
+        for prefix in prefixes:
+            try:
+                network = ipaddress.ip_network(prefix)
+            except ValueError as e:
+                problems.append('{}: {}'.format(subnet['name'], e))
+                continue
+
+            for other, other_network in networks:
+                if (other != subnet['name']
+                        and network.version == other_network.version
+                        and network.overlaps(other_network)):
+                    problems.append('{} and {}: {} overlaps {}'.format(
+                        other, subnet['name'], other_network, network))
+            networks.append((subnet['name'], network))
+
+    if problems:
+        raise ValueError('Subnet prefix conflicts:\n\t'
+                         + '\n\t'.join(problems))
+
+
+def apply_subnets(
+        resource_group_name,
+        virtual_network_name,
+        subnets,
+        mode=MERGE,
+        remove=(),
+        context=None,
+        no_wait=False
+):
+    """
+    Apply a set of subnets to a virtual network with a single
+    virtual_networks.create_or_update.
+
+    A subnet that exists already keeps everything the new definition leaves
+    out, so its network security group, route table, service endpoints and
+    delegations stay attached.
+
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network.
+    :param subnets: (list) – Subnet models or dicts; a subnet whose name
+        exists already is updated, any other is added.
+    :param mode: (str) – 'merge' keeps existing subnets not in subnets;
+        'replace' makes subnets the VNet's complete subnet set.
+    :param remove: (list) – names of existing subnets to delete.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return as soon as the virtual network update is
+        accepted; the handle is in the result's operation.
+    :return: BulkResult, or None if the virtual network could not be read
+        or updated
+    :raises: ValueError on duplicate names or overlapping prefixes, before
+        anything is sent
+    """
+    return _apply(
+        RESOURCE_TYPES['virtual_networks'],
+        (resource_group_name, virtual_network_name),
+        'subnets',
+        'Subnet',
+        subnets,
+        mode,
+        remove,
+        check_subnet_prefixes,
+        True,
+        context,
+        no_wait)
+
@@ -0,0 +1,226 @@
+#!/usr/bin/python3
+#
+# child_batching.py
+#
+# Serves child-resource reads (subnets, security rules, routes, peerings...)
+# from one GET of their parent, which embeds them.
+#
+#     import operations.child_batching as child_batching
+#     child_batching.enable()
+
+import threading
+import time
+
+import operations.authenticate_user as clients
+import operations.metrics as metrics
+import operations.resource_cache as resource_cache
+from operations.resource_types import resource_id
+
+# Attribute of the parent model that embeds each child family.
+CHILD_ATTRIBUTES = {
+    'subnets': 'subnets',
+    'virtual_network_peerings': 'virtual_network_peerings',
+    'security_rules': 'security_rules',
+    'routes': 'routes',
+    'express_route_circuit_authorizations': 'authorizations',
+    'express_route_circuit_peerings': 'peerings',
+    'route_filter_rules': 'rules',
+}
+
+# Child reads arriving this many seconds after the first one share its
+# parent GET. A read made while no other child read is in flight does not
+# wait.
+DEFAULT_WINDOW = 0.02
+
+# A fetched parent keeps answering child reads for this many seconds, so
+# sequential reads in a workflow are batched as well.
+DEFAULT_REUSE = 2.0
+
+_batcher = None
+
+
+class _Batch(object):
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.parent = None
+        self.fetched_at = None
+
+
+class ChildBatcher(object):
+    """
+    Collects child reads per parent and answers them from one parent GET.
+
+    Any read the parent cannot answer (parent GET failed, child missing from
+    the embedded list) falls back to the child's own GET. Fetched parents
+    are dropped once their reuse period is over.
+
+    :param window: (float) – Seconds to collect reads before fetching, when
+        other child reads are in flight.
+    :param reuse: (float) – Seconds a fetched parent keeps answering reads.
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, reuse=DEFAULT_REUSE):
+        self.window = window
+        self.reuse = reuse
+        self._lock = threading.Lock()
+        self._batches = {}
+        self._reading = 0
+        self._next_prune = time.time() + reuse
+
+    def _expired(self, batch, now):
+        return (batch.fetched_at is not None
+                and batch.fetched_at + self.reuse < now)
+
+    def _prune(self, now):
+        # at most once per reuse period, so no parent outlives two
+        if now < self._next_prune:
+            return
+
+        for parent_key, batch in list(self._batches.items()):
+            if self._expired(batch, now):
+                del self._batches[parent_key]
+        self._next_prune = now + self.reuse
+
+    def _fetch(self, rtype, key, context, batch, alone):
+        from msrestazure import azure_exceptions
+
+        if not alone:
+            time.sleep(self.window)
+        try:
+            operations = clients.get_operations(rtype.parent, context)
+            batch.parent = operations.get(*key[:-1])
+            metrics.increment('batch_parent_fetches')
+
+        except azure_exceptions.CloudError:
+            batch.parent = None
+
+        finally:
+            batch.fetched_at = time.time()
+            batch.event.set()
+
+    def get(self, rtype, key, context, fallback):
+        """
+        Answer one child read.
+
+        :param rtype: (ResourceType) – the child family.
+        :param key: (tuple) – resource group name followed by resource names.
+        :param context: (ClientContext) – subscription/cloud to run against.
+        :param fallback: (callable) – performs the child's own GET.
+        :return: the child resource model
+        """
+        resolved = clients.resolve_context(context)
+        parent_key = (resolved.cloud.name,
+                      resource_id(rtype.parent, resolved.subscription_id,
+                                  key[:-1]).lower())
+
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            batch = self._batches.get(parent_key)
+            if batch is not None and self._expired(batch, now):
+                batch = None
+            leader = batch is None
+            if leader:
+                batch = self._batches[parent_key] = _Batch()
+            alone = self._reading == 0
+            self._reading += 1
+
+        try:
+            if leader:
+                self._fetch(rtype, key, context, batch, alone)
+            else:
+                batch.event.wait()
+        finally:
+            with self._lock:
+                self._reading -= 1
+
+        children = getattr(batch.parent, CHILD_ATTRIBUTES[rtype.name], None) or []
+        for child in children:
+            if child.name.lower() == key[-1].lower():
+                metrics.increment('batch_children_served')
+                return child
+
+        metrics.increment('batch_fallbacks')
+        return fallback()
+
+    def invalidate(self, key):
+        """
+        Forget fetched parents affected by a write.
+
+        :param key: (tuple) – (cloud name, lower-cased resource id) written.
+        :return: none
+        """
+        cloud, rid = key
+        with self._lock:
+            for cached_cloud, parent_id in list(self._batches):
+                if cached_cloud == cloud and (
+                        parent_id == rid
+                        or rid.startswith(parent_id + '/')
+                        or parent_id.startswith(rid + '/')):
+                    del self._batches[(cached_cloud, parent_id)]
+
+
+def enable(window=DEFAULT_WINDOW, reuse=DEFAULT_REUSE):
+    """
+    Turn on batching for every child get_* function.
+
+    :param window: (float) – Seconds to collect reads before fetching.
+    :param reuse: (float) – Seconds a fetched parent keeps answering reads.
+    :return: ChildBatcher
+    """
+    global _batcher
+
+    _batcher = ChildBatcher(window, reuse)
+    resource_cache.on_invalidate(_invalidate)
+    return _batcher
+
+
+def disable():
+    """
+    Turn batching off.
+
+    :return: none
+    """
+    global _batcher
+
+    _batcher = None
+
+
+def _invalidate(key):
+    batcher = _batcher
+    if batcher is not None:
+        batcher.invalidate(key)
+
+
+def stats():
+    """
+    Parent fetches, children served from them, fallbacks and the resulting
+    number of requests saved.
+
+    :return: dict
+    """
+    fetches = metrics.counter('batch_parent_fetches')
+    served = metrics.counter('batch_children_served')
+    return {'parent_fetches': fetches,
+            'children_served': served,
+            'fallbacks': metrics.counter('batch_fallbacks'),
+            'requests_saved': served - fetches}
+
+
+def middleware(call, proceed):
+    """
+    Dispatch middleware: while batching is enabled, plain get calls (no
+    expand, custom_headers or raw) for child families are answered from
+    their parent.
+
+    :param call: (dispatch.Call) – the call being made.
+    :param proceed: (callable) – the rest of the chain.
+    """
+    batcher = _batcher
+    if (batcher is None or call.rtype.name not in CHILD_ATTRIBUTES
+            or not call.plain):
+        return proceed(call)
+
+    return batcher.get(call.rtype, call.key, call.context,
+                       lambda: proceed(call))
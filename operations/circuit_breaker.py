@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+#
+# circuit_breaker.py
+#
+# Per-endpoint circuit breakers for the shared sessions. During an ARM
+# brownout every request to the regional endpoint hangs until the socket
+# timeout and worker threads pile up behind it. A breaker counts
+# consecutive failures (errors, 5xx responses and responses slower than the
+# latency SLO) per host; once open it fails requests at once with
+# CircuitOpenError, and after reset_timeout lets a single probe through
+# (half-open) whose outcome closes or re-opens it.
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import operations.metrics as metrics
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_LATENCY_SLO = 10.0
+DEFAULT_RESET_TIMEOUT = 30.0
+
+_default = None
+_default_lock = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """
+    Raised instead of sending a request to an endpoint whose breaker is
+    open.
+
+    :param endpoint: (str) – the endpoint's host.
+    :param retry_in: (float) – seconds until the breaker lets a probe through.
+    """
+
+    def __init__(self, endpoint, retry_in):
+        super(CircuitOpenError, self).__init__(
+            'Circuit open for {}; retry in {:.0f}s'.format(endpoint, retry_in))
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+def endpoint(url):
+    """
+    :param url: (str) – request URL.
+    :return: (str) the lower-cased host[:port] the breaker is kept for
+    """
+    return urlsplit(url).netloc.lower()
+
+
+class Breaker(object):
+    """
+    Breaker for one endpoint.
+
+    :param name: (str) – the endpoint.
+    :param failure_threshold: (int) – consecutive failures that open it.
+    :param latency_slo: (float) – seconds; a slower response is a failure.
+    :param reset_timeout: (float) – seconds open before a probe is allowed.
+    """
+
+    def __init__(self, name, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 latency_slo=DEFAULT_LATENCY_SLO,
+                 reset_timeout=DEFAULT_RESET_TIMEOUT):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.latency_slo = latency_slo
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened = None
+        self._lock = threading.Lock()
+
+    def before(self):
+        """
+        Ask to send a request.
+
+        :return: none
+        :raises: CircuitOpenError while open, or half-open with the probe
+            already out
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return
+
+            retry_in = self.opened + self.reset_timeout - time.time()
+            if self.state == OPEN and retry_in <= 0:
+                self.state = HALF_OPEN
+                metrics.increment('circuit_probes')
+                return
+
+        metrics.increment('circuit_rejected')
+        raise CircuitOpenError(self.name, max(retry_in, 0))
+
+    def record(self, ok, latency):
+        """
+        Report how a request sent after before() went.
+
+        :param ok: (bool) – False for errors and 5xx responses.
+        :param latency: (float) – seconds the request took.
+        :return: none
+        """
+        ok = ok and latency <= self.latency_slo
+        with self._lock:
+            if ok:
+                self.failures = 0
+                self.state = CLOSED
+                return
+
+            self.failures += 1
+            if self.state == HALF_OPEN or (
+                    self.state == CLOSED
+                    and self.failures >= self.failure_threshold):
+                self.state = OPEN
+                self.opened = time.time()
+                metrics.increment('circuit_opened')
+
+
+class CircuitBreakers(object):
+    """
+    One Breaker per endpoint.
+
+    :param kwargs: Breaker settings applied to every new breaker.
+    """
+
+    def __init__(self, **kwargs):
+        self.settings = kwargs
+        self._lock = threading.Lock()
+        self._breakers = {}
+
+    def breaker(self, url):
+        """
+        :param url: (str) – request URL.
+        :return: Breaker for the URL's endpoint
+        """
+        name = endpoint(url)
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = Breaker(name, **self.settings)
+
+            return breaker
+
+    def stats(self):
+        """
+        State and consecutive failures per endpoint.
+
+        :return: dict
+        """
+        with self._lock:
+            breakers = dict(self._breakers)
+
+        return {name: {'state': breaker.state, 'failures': breaker.failures}
+                for name, breaker in breakers.items()}
+
+
+def ok(status_code):
+    """
+    Whether a response counts as healthy for the endpoint. Throttling is
+    left to the rate limiter.
+
+    :param status_code: (int) – HTTP status.
+    :return: bool
+    """
+    return status_code < 500
+
+
+def default():
+    """
+    The process-wide breakers used by the shared sessions.
+
+    :return: CircuitBreakers
+    """
+    global _default
+
+    with _default_lock:
+        if _default is None:
+            _default = CircuitBreakers()
+
+        return _default
+
+
+def configure(**kwargs):
+    """
+    Replace the process-wide breakers.
+
+    :param kwargs: Breaker settings: failure_threshold, latency_slo and
+        reset_timeout.
+    :return: CircuitBreakers
+    """
+    global _default
+
+    with _default_lock:
+        _default = CircuitBreakers(**kwargs)
+        return _default
+
@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+#
+# client_pool.py
+#
+# Keyed, LRU-bounded pool of management clients so cumulus can work across
+# many subscriptions and clouds without rebuilding clients per call.
+
+import threading
+import time
+from collections import namedtuple, OrderedDict
+
+import operations.transport as transport
+
+DEFAULT_MAX_SIZE = 64
+
+# Clients unused for this many seconds are dropped from the pool.
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+
+
+class ClientContext(namedtuple('ClientContext',
+                               ['subscription_id', 'cloud', 'credentials'])):
+    """
+    Where a cumulus call should run. Any field left as None falls back to the
+    configured default subscription, cloud or Service Principal.
+
+    :param subscription_id: (str) – The subscription to operate on.
+    :param cloud: (Cloud) – e.g. AZURE_US_GOV_CLOUD.
+    :param credentials: (ServicePrincipalCredentials) – credentials to sign
+        requests with.
+    """
+
+    def __new__(cls, subscription_id=None, cloud=None, credentials=None):
+        return super(ClientContext, cls).__new__(
+            cls, subscription_id, cloud, credentials)
+
+
+class ClientPool(object):
+    """
+    Caches clients keyed by kind, cloud, subscription and credentials.
+
+    Clients built for the same cloud and identity share one HTTP session,
+    so their keep-alive connections are reused across subscriptions. A
+    session is closed once the last pooled client using it is dropped.
+
+    :param factory: (callable) – factory(kind, context) builds a client for a
+        fully resolved ClientContext.
+    :param max_size: (int) – Most clients kept; the least recently used one
+        is evicted first.
+    :param idle_timeout: (int) – Seconds an unused client is kept.
+    :param transport_config: (TransportConfig) – connection pool settings for
+        the shared sessions.
+    """
+
+    def __init__(self, factory, max_size=DEFAULT_MAX_SIZE,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT, transport_config=None):
+        self.factory = factory
+        self.transport_config = transport_config or transport.TransportConfig()
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._lock = threading.RLock()
+        self._clients = OrderedDict()
+        # session key -> [session, pooled clients using it]
+        self._sessions = {}
+
+    @staticmethod
+    def key(kind, context):
+        """
+        Pool key for a resolved context.
+
+        :param kind: (str) – 'network' or 'resource'.
+        :param context: (ClientContext) – resolved context.
+        :return: tuple
+        """
+        return (kind, context.cloud.name, context.subscription_id,
+                id(context.credentials))
+
+    @staticmethod
+    def identity(credentials):
+        """
+        Who requests signed with credentials are sent as. Separate credential
+        objects for one service principal share an identity.
+
+        :param credentials: credentials of a ClientContext.
+        :return: (tenant, client id, user name or None), or the object's id
+            for credentials without a tenant and client id
+        """
+        tenant = getattr(credentials, '_tenant', None)
+        client_id = getattr(credentials, 'id', None)
+        if tenant is None or client_id is None:
+            return id(credentials)
+
+        return tenant, client_id, getattr(credentials, 'username', None)
+
+    def _session(self, context):
+        session_key = (context.cloud.name, self.identity(context.credentials))
+        entry = self._sessions.get(session_key)
+        if entry is None:
+            entry = self._sessions[session_key] = [
+                transport.build_session(self.transport_config), 0]
+        entry[1] += 1
+
+        return session_key, entry[0]
+
+    def _release(self, session_key):
+        # a caller may still hold a dropped client; a closed session opens
+        # new connections for it if it is used again
+        entry = self._sessions[session_key]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._sessions[session_key]
+            entry[0].close()
+
+    def _evict(self, now):
+        for key, (client, last_used, session_key) in list(
+                self._clients.items()):
+            if last_used + self.idle_timeout > now:
+                break
+            del self._clients[key]
+            self._release(session_key)
+
+        while len(self._clients) > self.max_size:
+            self._release(self._clients.popitem(last=False)[1][2])
+
+    def get(self, kind, context):
+        """
+        Return the pooled client for context, building it if needed.
+
+        :param kind: (str) – 'network' or 'resource'.
+        :param context: (ClientContext) – resolved context.
+        :return: NetworkManagementClient or ResourceManagementClient
+        """
+        key = self.key(kind, context)
+        now = time.time()
+
+        with self._lock:
+            entry = self._clients.pop(key, None)
+            if entry is None:
+                client = self.factory(kind, context)
+                session_key, session = self._session(context)
+                try:
+                    transport.attach_session(client, session,
+                                             self.transport_config)
+                except BaseException:
+                    self._release(session_key)
+                    raise
+            else:
+                client, _, session_key = entry
+
+            self._clients[key] = (client, now, session_key)
+            self._evict(now)
+
+            return client
+
+    def configure(self, transport_config):
+        """
+        Switch to new connection settings. Pooled clients and sessions are
+        dropped so the next call picks the settings up.
+
+        :param transport_config: (TransportConfig) – connection settings.
+        :return: none
+        """
+        with self._lock:
+            self.clear()
+            self.transport_config = transport_config
+
+    def clear(self):
+        """
+        Drop every pooled client and close the shared sessions.
+
+        :return: none
+        """
+        with self._lock:
+            self._clients.clear()
+            for session, _ in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._clients)
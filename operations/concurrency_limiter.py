@@ -0,0 +1,286 @@
+#!/usr/bin/python3
+#
+# concurrency_limiter.py
+#
+# Adaptive cap on the number of ARM requests in flight per subscription,
+# resource family and verb. The cap grows additively while requests succeed
+# quickly and is cut multiplicatively on throttling, conflicts, errors or
+# rising latency (AIMD), so parallel cumulus fan-out settles at the highest
+# parallelism ARM sustains. Polls of long-running operations are not
+# limited: they are cheap, and their latency says nothing about the
+# family's.
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import operations.metrics as metrics
+from operations.rate_limiter import category, subscription_of
+
+DEFAULT_INITIAL = 8
+DEFAULT_MINIMUM = 1
+DEFAULT_MAXIMUM = 64
+
+# The limit grows by INCREASE per limit's worth of good responses (about one
+# per round trip) and is multiplied by DECREASE on a bad one.
+DEFAULT_INCREASE = 1.0
+DEFAULT_DECREASE = 0.5
+
+# Recent latency above this multiple of the baseline latency counts as
+# congestion.
+DEFAULT_LATENCY_TOLERANCE = 2.0
+
+# Weights of each new sample in the moving averages of latency: the recent
+# latency follows the last ten or so responses, the baseline the last few
+# hundred.
+RECENT_WEIGHT = 0.1
+BASELINE_WEIGHT = 0.005
+
+# Resource types of the status URLs long-running operations are polled at.
+POLL_TYPES = ('operations', 'operationresults', 'operationstatuses')
+
+# Responses that mean "too much parallelism".
+BACKOFF_STATUS_CODES = (409, 429)
+
+HISTORY_LENGTH = 1000
+
+_default = None
+_default_lock = threading.Lock()
+
+
+class AdaptiveLimit(object):
+    """
+    AIMD limit for one subscription, resource family and verb.
+
+    Only requests started after the last decrease can cause another, so one
+    burst of 429s halves the limit once rather than once per response.
+    Latency is judged on moving averages, the recent one against a much
+    slower baseline, so the spread of one family's response times is not
+    mistaken for congestion.
+
+    :param initial: (int) – starting limit.
+    :param minimum: (int) – the limit never drops below this.
+    :param maximum: (int) – the limit never grows above this.
+    :param increase: (float) – added per limit's worth of good responses.
+    :param decrease: (float) – factor applied on a bad response.
+    :param latency_tolerance: (float) – multiple of the baseline latency the
+        recent latency may reach before it is treated as congestion.
+    """
+
+    def __init__(self, initial=DEFAULT_INITIAL, minimum=DEFAULT_MINIMUM,
+                 maximum=DEFAULT_MAXIMUM, increase=DEFAULT_INCREASE,
+                 decrease=DEFAULT_DECREASE,
+                 latency_tolerance=DEFAULT_LATENCY_TOLERANCE):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.baseline = None
+        self.recent = None
+        self.in_flight = 0
+        self.history = deque([(time.time(), int(self.limit))],
+                             maxlen=HISTORY_LENGTH)
+        self._last_decrease = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """
+        Wait for a free slot.
+
+        :return: (float) time the request started
+        """
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+        return time.time()
+
+    def release(self, started, ok):
+        """
+        Free a slot and adjust the limit.
+
+        :param started: (float) – value returned by acquire().
+        :param ok: (bool) – False for throttling, conflicts and errors.
+        :return: none
+        """
+        now = time.time()
+        latency = now - started
+
+        with self._condition:
+            self.in_flight -= 1
+            if ok:
+                if self.baseline is None:
+                    self.baseline = self.recent = latency
+                else:
+                    self.baseline += (latency - self.baseline) * BASELINE_WEIGHT
+                    self.recent += (latency - self.recent) * RECENT_WEIGHT
+                ok = self.recent <= self.baseline * self.latency_tolerance
+
+            previous = int(self.limit)
+            if ok:
+                self.limit = min(self.limit + self.increase / self.limit,
+                                 self.maximum)
+            elif started >= self._last_decrease:
+                self.limit = max(self.limit * self.decrease, self.minimum)
+                self._last_decrease = now
+                metrics.increment('concurrency_decreases')
+
+            if int(self.limit) != previous:
+                self.history.append((now, int(self.limit)))
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold a slot for the duration of the block. The block should set
+        ok=False on the yielded dict to report a bad outcome; an exception
+        does so automatically.
+        """
+        started = self.acquire()
+        outcome = {'ok': True}
+        try:
+            yield outcome
+        except BaseException:
+            outcome['ok'] = False
+            raise
+        finally:
+            self.release(started, outcome['ok'])
+
+
+class ConcurrencyLimiter(object):
+    """
+    One AdaptiveLimit per (subscription, resource family, verb), where the
+    verb is the rate_limiter category: read, write or delete.
+
+    :param kwargs: AdaptiveLimit settings applied to every new limit.
+    """
+
+    def __init__(self, **kwargs):
+        self.settings = kwargs
+        self._lock = threading.Lock()
+        self._limits = {}
+
+    def limit(self, subscription_id, resource_family, kind):
+        """
+        :param subscription_id: (str) – lower-cased subscription id.
+        :param resource_family: (str) – lower-cased family, see family().
+        :param kind: (str) – READ, WRITE or DELETE.
+        :return: AdaptiveLimit
+        """
+        key = (subscription_id, resource_family, kind)
+        with self._lock:
+            limit = self._limits.get(key)
+            if limit is None:
+                limit = self._limits[key] = AdaptiveLimit(**self.settings)
+
+            return limit
+
+    @contextmanager
+    def request(self, method, url):
+        """
+        Hold a slot for one HTTP request; requests outside a subscription and
+        polls of long-running operations are not limited.
+
+        :param method: (str) – HTTP method.
+        :param url: (str) – request URL.
+        """
+        subscription_id = subscription_of(url)
+        resource_family = family(url)
+        if subscription_id is None or polls(resource_family):
+            yield {'ok': True}
+            return
+
+        with self.limit(subscription_id, resource_family,
+                        category(method)).slot() as outcome:
+            yield outcome
+
+    def history(self, subscription_id, resource_family, kind):
+        """
+        Limit over time for one subscription, resource family and verb.
+
+        :return: list of (timestamp, limit)
+        """
+        return list(self.limit(subscription_id.lower(),
+                               resource_family.lower(), kind).history)
+
+    def stats(self):
+        """
+        Current limit and requests in flight per (subscription, family, verb).
+
+        :return: dict
+        """
+        with self._lock:
+            limits = dict(self._limits)
+
+        return {key: {'limit': int(limit.limit), 'in_flight': limit.in_flight}
+                for key, limit in limits.items()}
+
+
+def family(url):
+    """
+    :param url: (str) – request URL.
+    :return: (str) the lower-cased resource types along the URL's path, e.g.
+        'microsoft.network/virtualnetworks/subnets' for a subnet or the
+        subnets of a virtual network, or 'resourcegroups'
+    """
+    parts = urlsplit(url).path.lower().strip('/').split('/')
+    if 'providers' not in parts:
+        # /subscriptions/{id}/{type}/{name}/...
+        return '/'.join(parts[2::2])
+
+    start = len(parts) - parts[::-1].index('providers')
+    return '/'.join(parts[start:start + 1] + parts[start + 1::2])
+
+
+def polls(resource_family):
+    """
+    :param resource_family: (str) – value of family().
+    :return: (bool) whether requests of the family poll a long-running
+        operation's status
+    """
+    return resource_family.rsplit('/', 1)[-1] in POLL_TYPES
+
+
+def ok(status_code):
+    """
+    Whether a response status lets the limit grow.
+
+    :param status_code: (int) – HTTP status.
+    :return: bool
+    """
+    return status_code not in BACKOFF_STATUS_CODES and status_code < 500
+
+
+def default():
+    """
+    The process-wide limiter used by the shared sessions.
+
+    :return: ConcurrencyLimiter
+    """
+    global _default
+
+    with _default_lock:
+        if _default is None:
+            _default = ConcurrencyLimiter()
+
+        return _default
+
+
+def configure(**kwargs):
+    """
+    Replace the process-wide limiter.
+
+    :param kwargs: AdaptiveLimit settings: initial, minimum, maximum,
+        increase, decrease and latency_tolerance.
+    :return: ConcurrencyLimiter
+    """
+    global _default
+
+    with _default_lock:
+        _default = ConcurrencyLimiter(**kwargs)
+        return _default
@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+#
+# conflict_retry.py
+#
+# Retries of writes ARM turned away because another operation held the
+# resource or its parent: 409 AnotherOperationInProgress on the PUT/DELETE
+# itself, or an accepted operation cancelled for a newer one. Waits grow
+# exponentially with full jitter, so writers that collided do not collide
+# again in lockstep, and never undercut a Retry-After header.
+
+import random
+import threading
+
+DEFAULT_ATTEMPTS = 6
+DEFAULT_BASE_DELAY = 2
+DEFAULT_MAX_DELAY = 60
+
+# ARM error codes that mean "try again once the other operation is done".
+RETRYABLE_CODES = frozenset([
+    'AnotherOperationInProgress',
+    'CanceledAndSupersededDueToAnotherOperation',
+    'RetryableError',
+])
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def error_code(exception):
+    """
+    :param exception: (CloudError) – the failure.
+    :return: (str) the ARM error code, or None
+    """
+    return getattr(getattr(exception, 'error', None), 'error', None)
+
+
+def _retry_after(exception):
+    headers = getattr(getattr(exception, 'response', None), 'headers', None)
+    try:
+        return max(float(headers.get('retry-after')), 0)
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class RetryPolicy(object):
+    """
+    When and how long to wait before resending a conflicting write.
+
+    :param attempts: (int) – retries after the first try.
+    :param base_delay: (float) – cap of the first wait in seconds; doubles
+        with each retry.
+    :param max_delay: (float) – the cap never grows above this.
+    :param codes: (frozenset) – ARM error codes worth retrying.
+    """
+
+    def __init__(self, attempts=DEFAULT_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY,
+                 max_delay=DEFAULT_MAX_DELAY, codes=RETRYABLE_CODES):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.codes = codes
+
+    def retries(self, exception, attempt):
+        """
+        :param exception: (CloudError) – why the write failed.
+        :param attempt: (int) – retries already made.
+        :return: (bool) whether to send the write again
+        """
+        return attempt < self.attempts and error_code(exception) in self.codes
+
+    def delay(self, attempt, exception=None):
+        """
+        Seconds to wait before retry number attempt + 1: uniformly random
+        up to base_delay * 2 ** attempt (capped at max_delay), and at least
+        the failure's Retry-After.
+
+        :param attempt: (int) – retries already made.
+        :param exception: (CloudError) – why the write failed.
+        :return: float
+        """
+        ceiling = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return max(random.uniform(0, ceiling), _retry_after(exception) or 0)
+
+
+def default():
+    """
+    The process-wide retry policy.
+
+    :return: RetryPolicy
+    """
+    global _default
+
+    with _default_lock:
+        if _default is None:
+            _default = RetryPolicy()
+
+        return _default
+
+
+def configure(**kwargs):
+    """
+    Replace the process-wide retry policy; attempts=0 turns retries off.
+
+    :param kwargs: RetryPolicy arguments.
+    :return: RetryPolicy
+    """
+    global _default
+
+    with _default_lock:
+        _default = RetryPolicy(**kwargs)
+        return _default
@@ -0,0 +1,188 @@
+#!/usr/bin/python3
+#
+# cumulus_aio.py
+#
+# asyncio variants of every cumulus get/create_update/delete function.
+#
+# Each function wraps its counterpart in cumulus_operations, keeping its
+# name, signature and docstring, and is awaited instead:
+#
+#     import operations.cumulus_aio as cumulus_aio
+#
+#     subnet = await cumulus_aio.get_subnets(GROUP_NAME, VNET_NAME, SUBNET_NAME)
+#     await cumulus_aio.create_update_subnets(
+#         GROUP_NAME, VNET_NAME, SUBNET_NAME, subnet_parameters)
+#
+# Writes are awaited until the operation finishes; with no_wait=True they
+# return the operation handle once ARM has accepted the request.
+#
+# Calls go through the same dispatch middleware as the synchronous functions
+# (caching, write locks, idempotent apply) on a small shared thread pool.
+# Long-running operations are left to the process-wide polling scheduler and
+# awaited on the event loop, so waiting operations hold no thread, and a
+# semaphore bounds the number of requests in flight, so one loop can drive
+# thousands of calls.
+
+import asyncio
+import functools
+import inspect
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import operations.circuit_breaker as circuit_breaker
+import operations.cumulus_operations as cumulus
+import operations.dispatch as dispatch
+import operations.lro as lro
+import operations.lro_scheduler as lro_scheduler
+from operations.resource_types import RESOURCE_TYPES
+
+# Requests allowed in flight at once across the event loop.
+DEFAULT_MAX_CONCURRENCY = 32
+
+_max_concurrency = DEFAULT_MAX_CONCURRENCY
+_executor = None
+_semaphores = weakref.WeakKeyDictionary()
+
+
+def configure(max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """
+    Set how many requests may be in flight at once. Call before the first
+    request.
+
+    :param max_concurrency: (int) – concurrent HTTP requests.
+    :return: none
+    """
+    global _max_concurrency, _executor
+
+    _max_concurrency = max_concurrency
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
+    _semaphores.clear()
+
+
+def _semaphore():
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _semaphores[loop] = asyncio.Semaphore(_max_concurrency)
+
+    return semaphore
+
+
+async def _call(func, *args, **kwargs):
+    global _executor
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=_max_concurrency,
+            thread_name_prefix='cumulus-aio')
+
+    async with _semaphore():
+        return await asyncio.get_running_loop().run_in_executor(
+            _executor, functools.partial(func, *args, **kwargs))
+
+
+def _set_done(future):
+    if not future.done():
+        future.set_result(None)
+
+
+async def _wait(operation):
+    loop = asyncio.get_running_loop()
+    finished = loop.create_future()
+    lro_scheduler.default().submit(
+        operation,
+        callback=lambda operation: loop.call_soon_threadsafe(
+            _set_done, finished))
+    await finished
+
+    return operation.result()
+
+
+async def _create_update(rtype, key, parameters, no_wait, options):
+    from msrestazure import azure_exceptions
+
+    try:
+        operation = await _call(
+            dispatch.call, rtype, 'create_update', key, parameters,
+            no_wait=True, **options)
+        if no_wait:
+            return operation
+
+        resource = await _wait(operation)
+        print(lro.provisioning_state(resource))
+        if options['raw']:
+            return dispatch._raw_response(operation, resource)
+        return resource
+
+    except (azure_exceptions.CloudError,
+            circuit_breaker.CircuitOpenError) as e:
+        print(e)
+
+
+async def _get(rtype, key, options):
+    return await _call(dispatch.call, rtype, 'get', key, **options)
+
+
+async def _delete(rtype, key, no_wait, options):
+    from msrestazure import azure_exceptions
+
+    try:
+        operation = await _call(
+            dispatch.call, rtype, 'delete', key, no_wait=True, **options)
+        if no_wait:
+            return operation
+
+        await _wait(operation)
+        print(operation.status())
+        if options['raw']:
+            return dispatch._raw_response(operation, None)
+
+    except (azure_exceptions.CloudError,
+            circuit_breaker.CircuitOpenError) as e:
+        print(e)
+
+
+def _awaitable(function, rtype, verb):
+    """
+    Coroutine function with the name, signature and docstring of a cumulus
+    function.
+
+    :param function: (callable) – e.g. cumulus_operations.get_subnets.
+    :param rtype: (ResourceType) – its resource family.
+    :param verb: (str) – 'create_update', 'get' or 'delete'.
+    :return: coroutine function
+    """
+    signature = inspect.signature(function)
+    names = rtype.key_length
+
+    @functools.wraps(function)
+    async def awaitable(*args, **kwargs):
+        arguments = signature.bind(*args, **kwargs)
+        arguments.apply_defaults()
+        values = list(arguments.arguments.values())
+        key = tuple(values[:names])
+        options = dict(list(arguments.arguments.items())[names:])
+
+        if verb == 'get':
+            return await _get(rtype, key, options)
+
+        no_wait = options.pop('no_wait')
+        if verb == 'delete':
+            return await _delete(rtype, key, no_wait, options)
+
+        parameters = options.pop(list(signature.parameters)[names])
+        return await _create_update(rtype, key, parameters, no_wait, options)
+
+    awaitable.__doc__ = '\n    Awaitable cumulus_operations.{}().\n{}'.format(
+        function.__name__, function.__doc__ or '')
+    return awaitable
+
+
+__all__ = ['configure']
+for _rtype in RESOURCE_TYPES.values():
+    for _verb in ('create_update', 'get', 'delete'):
+        _name = _rtype.function_name(_verb)
+        globals()[_name] = _awaitable(getattr(cumulus, _name), _rtype, _verb)
+        __all__.append(_name)
@@ -4,8 +4,11 @@
 #
 # by Jennifer Yarboro
 
-from msrestazure import azure_exceptions
 import operations.authenticate_user as clients
+import operations.dispatch as dispatch
+from operations.client_pool import ClientContext
+from operations.lro import wait_all, as_completed
+from operations.resource_types import RESOURCE_TYPES
 
 # Cloud definitions:
 # AZURE_PUBLIC_CLOUD
@@ -18,6 +21,13 @@ Create create_update, delete, and get functions for each networknclass at
 https://azure-sdk-for-python.readthedocs.io/en/latest/ref/azure.mgmt.network.v2017_03_01.operations.html
 '''
 
+# Every function takes an optional context=ClientContext(subscription_id,
+# cloud, credentials); clients are pooled per context by authenticate_user.
+# Each one only describes its call; operations.dispatch runs it through the
+# registered middleware (caching, coalescing, batching, per-parent write
+# locks) and performs it. Errors are printed and None returned; pass any
+# of them to operations.results.capture() for a Result carrying the status,
+# error code and request id instead.
 network_client = clients.network_client
 resource_client = clients.resource_client
 
@@ -27,7 +37,9 @@ def create_update_resource_group(
         resource_group_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a resource group.
@@ -39,26 +51,30 @@ def create_update_resource_group(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: ResourceGroup or ClientRawResponse if raw=true
     """
-
-    try:
-        rg_info = resource_client.resource_groups.create_or_update(
-            resource_group_name,
-            parameters,
-            custom_headers=None,
-            raw=False
-        )
-        print(rg_info.properties.provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['resource_group'],
+        'create_update',
+        (resource_group_name,),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_resource_group(
         resource_group_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets a resource group.
@@ -68,25 +84,33 @@ def get_resource_group(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: ResourceGroup or ClientRawResponse if raw=true
     """
-
-    try:
-        rg_info = resource_client.resource_groups.get(
-            resource_group_name,
-            custom_headers=None,
-            raw=False
-        )
-        return (rg_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['resource_group'],
+        'get',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_resource_group(
         resource_group_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes a resource group.
@@ -96,21 +120,56 @@ def delete_resource_group(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
+    return dispatch.call(
+        RESOURCE_TYPES['resource_group'],
+        'delete',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    try:
-        rg_info = resource_client.resource_groups.delete(
-            resource_group_name,
-            custom_headers=None,
-            raw=False)
-        rg_info.wait()
 
-        print(rg_info.status())
+def list_resource_groups(
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all resource groups in the subscription, one page at a time.
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of ResourceGroup
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['resource_group'],
+        'list',
+        (),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Virtual Networks Operations:
@@ -119,7 +178,9 @@ def create_update_virtual_networks(
         virtual_network_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a virtual network in the specified resource group.
@@ -133,23 +194,23 @@ def create_update_virtual_networks(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns Subnet or
         ClientRawResponse if raw=true
     :raises: CloudError
     """
-
-    try:
-        vnet_info = network_client.virtual_networks.create_or_update(
-            resource_group_name,
-            virtual_network_name,
-            parameters,
-            custom_headers=None,
-            raw=False)
-        vnet_info.wait()
-        print(vnet_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_networks'],
+        'create_update',
+        (resource_group_name, virtual_network_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_virtual_networks(
@@ -157,7 +218,10 @@ def get_virtual_networks(
         virtual_network_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified virtual network by resource group.
@@ -170,28 +234,36 @@ def get_virtual_networks(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: VirtualNetwork or ClientRawResponse if raw=true
     :raises: CloudError
     """
-    try:
-        vnet_info = network_client.virtual_networks.get(
-            resource_group_name,
-            virtual_network_name,
-            expand=None,
-            custom_headers=None,
-            raw=False)
-
-        return (vnet_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_networks'],
+        'get',
+        (resource_group_name, virtual_network_name),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_virtual_networks(
         resource_group_name,
         virtual_network_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified virtual network.
@@ -203,24 +275,61 @@ def delete_virtual_networks(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     :raises: CloudError
     """
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_networks'],
+        'delete',
+        (resource_group_name, virtual_network_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    try:
-        vnet_info = network_client.virtual_networks.delete(
-            resource_group_name,
-            virtual_network_name,
-            custom_headers=None,
-            raw=False)
 
-        #do we need the wait?
-        vnet_info.wait()
-        print(vnet_info.status())
+def list_virtual_networks(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all virtual networks in a resource group, one page at a time.
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of VirtualNetwork
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_networks'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Subnets Operations:
@@ -230,8 +339,10 @@ def create_update_subnets(
         subnet_name,
         subnet_parameters,
         custom_headers=None,
-        raw=False
-): 
+        raw=False,
+        context=None,
+        no_wait=False
+):
     """
     Creates or updates a subnet in the specified virtual network.
 
@@ -245,23 +356,23 @@ def create_update_subnets(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns Subnet or
         ClientRawResponse if raw=true
     :raises: CloudError
     """
-    try:
-        subnet_creation = network_client.subnets.create_or_update(
-            resource_group_name,
-            virtual_network_name,
-            subnet_name,
-            subnet_parameters,
-            custom_headers=None,
-            raw=False
-        )
-        print(subnet_creation.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['subnets'],
+        'create_update',
+        (resource_group_name, virtual_network_name, subnet_name),
+        subnet_parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_subnets(
@@ -270,7 +381,10 @@ def get_subnets(
         subnet_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified subnet by virtual network and resource group.
@@ -284,22 +398,27 @@ def get_subnets(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: Subnet or ClientRawResponse if raw=true
     :raises: CloudError
     """
-    try:
-        subnet_info = network_client.subnets.get(
-            resource_group_name,
-            virtual_network_name,
-            subnet_name,
-            expand=None,
-            custom_headers=None,
-            raw=False
-        )
-        return (subnet_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['subnets'],
+        'get',
+        (resource_group_name, virtual_network_name, subnet_name),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_subnets(
@@ -307,7 +426,9 @@ def delete_subnets(
         virtual_network_name,
         subnet_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified subnet.
@@ -320,24 +441,63 @@ def delete_subnets(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns Subnet or
         ClientRawResponse if raw=true.
     :raises: CloudError
     """
+    return dispatch.call(
+        RESOURCE_TYPES['subnets'],
+        'delete',
+        (resource_group_name, virtual_network_name, subnet_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    try:
-        subnet_info = network_client.subnets.delete(
-            resource_group_name,
-            virtual_network_name,
-            subnet_name,
-            custom_headers=None,
-            raw=False
-        )
-        subnet_info.wait()
-        print(subnet_info.status())
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+def list_subnets(
+        resource_group_name,
+        virtual_network_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all subnets in a virtual network, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of Subnet
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['subnets'],
+        'list',
+        (resource_group_name, virtual_network_name),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Route Tables Operations
@@ -346,7 +506,9 @@ def create_update_route_tables(
         route_table_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Create or updates a route table in a specified resource group.
@@ -360,22 +522,22 @@ def create_update_route_tables(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns RouteTable or
         ClientRawResponse if raw=true
     """
-
-    try:
-        route_table_creation = network_client.route_tables.create_or_update(
-            resource_group_name,
-            route_table_name,
-            parameters,
-            custom_headers=None,
-            raw=False
-        )
-        print(route_table_creation.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['route_tables'],
+        'create_update',
+        (resource_group_name, route_table_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_route_tables(
@@ -383,7 +545,10 @@ def get_route_tables(
         route_table_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified route table.
@@ -396,28 +561,35 @@ def get_route_tables(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: RouteTable or ClientRawResponse if raw=true
     """
-
-    try:
-        route_table_info = network_client.route_tables.get(
-            resource_group_name,
-            route_table_name,
-            expand=None,
-            custom_headers=None,
-            raw=False
-        )
-        return (route_table_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['route_tables'],
+        'get',
+        (resource_group_name, route_table_name),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_route_tables(
         resource_group_name,
         route_table_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified route table.
@@ -429,22 +601,22 @@ def delete_route_tables(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
+    return dispatch.call(
+        RESOURCE_TYPES['route_tables'],
+        'delete',
+        (resource_group_name, route_table_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    try:
-        route_table_info = network_client.route_tables.delete(
-            resource_group_name,
-            route_table_name,
-            custom_headers=None,
-            raw=False
-        )
-        route_table_info.wait()
-        print(route_table_info.status())
-
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 # Routes Operations
 def create_update_routes(
@@ -453,7 +625,9 @@ def create_update_routes(
         route_name,
         route_parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a route in the specified route table.
@@ -468,23 +642,61 @@ def create_update_routes(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns Route or
         ClientRawResponse if raw=true
     """
+    return dispatch.call(
+        RESOURCE_TYPES['routes'],
+        'create_update',
+        (resource_group_name, route_table_name, route_name),
+        route_parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    try:
-        route_creation = network_client.routes.create_or_update(
-            resource_group_name,
-            route_table_name,
-            route_name,
-            route_parameters,
-            custom_headers=None,
-            raw=False
-        )
-        print(route_creation.result().provisioning_state)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+def list_route_tables(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all route tables in a resource group, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name:  (str) – The name of the resource group
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of RouteTable
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['route_tables'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 def get_routes(
@@ -492,7 +704,10 @@ def get_routes(
         route_table_name,
         route_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified route from a route table.
@@ -505,28 +720,35 @@ def get_routes(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: Route or ClientRawResponse if raw=true
     """
+    return dispatch.call(
+        RESOURCE_TYPES['routes'],
+        'get',
+        (resource_group_name, route_table_name, route_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
-    try:
-        route_info = network_client.routes.get(
-            resource_group_name,
-            route_table_name,
-            route_name,
-            custom_headers=None,
-            raw=False
-        )
-        return (route_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 def delete_routes(
         resource_group_name,
         route_table_name,
         route_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified route from a route table.
@@ -539,23 +761,62 @@ def delete_routes(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
+    return dispatch.call(
+        RESOURCE_TYPES['routes'],
+        'delete',
+        (resource_group_name, route_table_name, route_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
+
 
-    try:
-        route_info = network_client.routes.delete(
-            resource_group_name,
-            route_table_name,
-            route_name,
-            custom_headers=None,
-            raw=False
-        )
-        route_info.wait()
-        print(route_info.status())
+def list_routes(
+        resource_group_name,
+        route_table_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all routes in a route table, one page at a time.
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name:  (str) – The name of the resource group
+    :param route_table_name: (str) – The name of the route table.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of Route
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['routes'],
+        'list',
+        (resource_group_name, route_table_name),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Virtual Network Peerings Operations
@@ -565,7 +826,9 @@ def create_update_virtual_network_peerings(
         virtual_network_peering_name,
         virtual_network_peering_parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a peering in the specified virtual network.
@@ -580,22 +843,24 @@ def create_update_virtual_network_peerings(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        peering_creation = network_client.virtual_network_peerings.create_or_update(
-            resource_group_name,
-            virtual_network_name,
-            virtual_network_peering_name,
-            virtual_network_peering_parameters,
-            custom_headers=None,
-            raw=False
-        )
-        print(peering_creation.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_peerings'],
+        'create_update',
+        (resource_group_name,
+         virtual_network_name,
+         virtual_network_peering_name),
+        virtual_network_peering_parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_virtual_network_peerings(
@@ -603,7 +868,10 @@ def get_virtual_network_peerings(
         virtual_network_name,
         virtual_network_peering_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified virtual network peering.
@@ -617,20 +885,27 @@ def get_virtual_network_peerings(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: VirtualNetworkPeering or ClientRawResponse if raw=true
     """
-    try:
-        route_info = network_client.virtual_network_peerings.get(
-            resource_group_name,
-            virtual_network_name,
-            virtual_network_peering_name,
-            custom_headers=None,
-            raw=False
-        )
-        return (route_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_peerings'],
+        'get',
+        (resource_group_name,
+         virtual_network_name,
+         virtual_network_peering_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_virtual_network_peerings(
@@ -638,7 +913,9 @@ def delete_virtual_network_peerings(
         virtual_network_name,
         virtual_network_peering_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified virtual network peering.
@@ -652,22 +929,65 @@ def delete_virtual_network_peerings(
     :param custom_headers: (dict) – headers that will be added to the request.
     :param raw: (bool) – returns the direct response alongside the deserialized
         response.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        route_info = network_client.virtual_network_peerings.delete(
-            resource_group_name,
-            virtual_network_name,
-            virtual_network_peering_name,
-            custom_headers=None,
-            raw=False
-        )
-        route_info.wait()
-        print(route_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_peerings'],
+        'delete',
+        (resource_group_name,
+         virtual_network_name,
+         virtual_network_peering_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_virtual_network_peerings(
+        resource_group_name,
+        virtual_network_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all virtual network peerings in a virtual network, one page at a
+    time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param virtual_network_name: (str) – The name of the virtual network.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of VirtualNetworkPeering
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_peerings'],
+        'list',
+        (resource_group_name, virtual_network_name),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Local Network Gateway Operations
@@ -676,7 +996,9 @@ def create_update_local_network_gateways(
         local_network_gateway_name,
         parameters,
         custom_headers=None,
-        raw=None
+        raw=None,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a local network gateway in the specified resource group.
@@ -689,29 +1011,32 @@ def create_update_local_network_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns LocalNetworkGateway or
         ClientRawResponse if raw=true
     """
-    try:
-        lng_info = network_client.local_network_gateways.create_or_update(
-            resource_group_name,
-            local_network_gateway_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        lng_info.wait()
-        print(lng_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['local_network_gateways'],
+        'create_update',
+        (resource_group_name, local_network_gateway_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_local_network_gateways(
         resource_group_name,
         local_network_gateway_name,
         custom_headers=None,
-        raw=None
+        raw=None,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified local network gateway in a resource group.
@@ -722,26 +1047,34 @@ def get_local_network_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: LocalNetworkGateway or ClientRawResponse if raw=true
     """
-    try:
-        lng_info = network_client.local_network_gateways.get(
-            resource_group_name,
-            local_network_gateway_name,
-            custom_headers=None,
-            raw=None
-        )
-        return (lng_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['local_network_gateways'],
+        'get',
+        (resource_group_name, local_network_gateway_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_local_network_gateways(
         resource_group_name,
         local_network_gateway_name,
         custom_headers=None,
-        raw=None
+        raw=None,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified local network gateway.
@@ -752,21 +1085,22 @@ def delete_local_network_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        lng_info = network_client.local_network_gateways.delete(
-            resource_group_name,
-            local_network_gateway_name,
-            custom_headers=None,
-            raw=None
-        )
-        lng_info.wait()
-        print(lng_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['local_network_gateways'],
+        'delete',
+        (resource_group_name, local_network_gateway_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 # Public IP Addresses Operations
 def create_update_public_ip_addresses(
@@ -774,7 +1108,9 @@ def create_update_public_ip_addresses(
         public_ip_address_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a static or dynamic public IP address.
@@ -786,22 +1122,61 @@ def create_update_public_ip_addresses(
     :param custom_headers:  (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns PublicIPAddress or
         ClientRawResponse if raw=true
     """
-    try:
-        pip_info = network_client.public_ip_addresses.create_or_update(
-            resource_group_name,
-            public_ip_address_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        pip_info.wait()
-        print(pip_info.result().provisioning_state)
+    return dispatch.call(
+        RESOURCE_TYPES['public_ip_addresses'],
+        'create_update',
+        (resource_group_name, public_ip_address_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
+
+
+def list_local_network_gateways(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all local network gateways in a resource group, one page at a time.
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of LocalNetworkGateway
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['local_network_gateways'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 def get_public_ip_addresses(
@@ -809,7 +1184,10 @@ def get_public_ip_addresses(
         public_ip_address_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified public IP address in a specified resource group.
@@ -820,27 +1198,35 @@ def get_public_ip_addresses(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: PublicIPAddress or ClientRawResponse if raw=true
     """
-    try:
-        pip_info = network_client.public_ip_addresses.get(
-            resource_group_name,
-            public_ip_address_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (pip_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['public_ip_addresses'],
+        'get',
+        (resource_group_name, public_ip_address_name),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_public_ip_addresses(
         resource_group_name,
         public_ip_address_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified public IP address.
@@ -850,21 +1236,22 @@ def delete_public_ip_addresses(
     :param custom_headers:  (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns PublicIPAddress or
         ClientRawResponse if raw=true
     """
-    try:
-        pip_info = network_client.public_ip_addresses.delete(
-            resource_group_name,
-            public_ip_address_name,
-            custom_headers=None,
-            raw=None
-        )
-        pip_info.wait()
-        print(pip_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['public_ip_addresses'],
+        'delete',
+        (resource_group_name, public_ip_address_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 # Virtual Network Gateway Operations
 def create_update_virtual_network_gateways(
@@ -872,7 +1259,9 @@ def create_update_virtual_network_gateways(
         virtual_network_gateway_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a virtual network gateway in the specified resource
@@ -886,29 +1275,71 @@ def create_update_virtual_network_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns VirtualNetworkGateway or
         ClientRawResponse if raw=true
     """
-    try:
-        vng_info = network_client.virtual_network_gateways.create_or_update(
-            resource_group_name,
-            virtual_network_gateway_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        # vng_info.wait()
-        print(vng_info.result().provisioning_state)
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_gateways'],
+        'create_update',
+        (resource_group_name, virtual_network_gateway_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_public_ip_addresses(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all public IP addresses in a resource group, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of PublicIPAddress
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['public_ip_addresses'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 def get_virtual_network_gateways(
         resource_group_name,
         virtual_network_gateway_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified virtual network gateway by resource group.
@@ -919,27 +1350,34 @@ def get_virtual_network_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: VirtualNetworkGateway or ClientRawResponse if raw=true
     """
-    try:
-        vng_info = network_client.virtual_network_gateways.get(
-            resource_group_name,
-            virtual_network_gateway_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (vng_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_gateways'],
+        'get',
+        (resource_group_name, virtual_network_gateway_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_virtual_network_gateways(
         resource_group_name,
         virtual_network_gateway_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified virtual network gateway.
@@ -950,21 +1388,60 @@ def delete_virtual_network_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        vng_info = network_client.virtual_network_gateways.delete(
-            resource_group_name,
-            virtual_network_gateway_name,
-            custom_headers=None,
-            raw=None
-        )
-        vng_info.wait()
-        print(vng_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_gateways'],
+        'delete',
+        (resource_group_name, virtual_network_gateway_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_virtual_network_gateways(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all virtual network gateways in a resource group, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of VirtualNetworkGateway
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_gateways'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Virtual Network Gateway Connections Operations
@@ -973,7 +1450,9 @@ def create_update_virtual_network_gateway_connections(
         virtual_network_gateway_connection_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a virtual network gateway connection in the specified
@@ -988,29 +1467,32 @@ def create_update_virtual_network_gateway_connections(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns
         VirtualNetworkGatewayConnection or ClientRawResponse if raw=true
     """
-    try:
-        vngc_info = network_client.virtual_network_gateway_connections.create_or_update(
-            resource_group_name,
-            virtual_network_gateway_connection_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        vngc_info.wait()
-        print(vngc_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_gateway_connections'],
+        'create_update',
+        (resource_group_name, virtual_network_gateway_connection_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_virtual_network_gateway_connections(
         resource_group_name,
         virtual_network_gateway_connection_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified virtual network gateway connection by resource group.
@@ -1021,27 +1503,34 @@ def get_virtual_network_gateway_connections(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: VirtualNetworkGatewayConnection or ClientRawResponse if raw=true
     """
-    try:
-        vngc_info = network_client.virtual_network_gateway_connections.get(
-            resource_group_name,
-            virtual_network_gateway_connection_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (vngc_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_gateway_connections'],
+        'get',
+        (resource_group_name, virtual_network_gateway_connection_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_virtual_network_gateway_connections(
         resource_group_name,
         virtual_network_gateway_connection_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified virtual network Gateway connection.
@@ -1052,21 +1541,61 @@ def delete_virtual_network_gateway_connections(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        vngc_info = network_client.virtual_network_gateway_connections.delete(
-            resource_group_name,
-            virtual_network_gateway_connection_name,
-            custom_headers=None,
-            raw=None
-        )
-        vngc_info.wait()
-        print(vngc_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_gateway_connections'],
+        'delete',
+        (resource_group_name, virtual_network_gateway_connection_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_virtual_network_gateway_connections(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all virtual network gateway connections in a resource group, one page
+    at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of VirtualNetworkGatewayConnection
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['virtual_network_gateway_connections'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Network Interfaces Operations
@@ -1075,7 +1604,9 @@ def create_update_network_interfaces(
         network_interface_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a network interface.
@@ -1087,22 +1618,22 @@ def create_update_network_interfaces(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns NetworkInterface or
         ClientRawResponse if raw=true
     """
-    try:
-        nic_info = network_client.network_interfaces.create_or_update(
-            resource_group_name,
-            network_interface_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        nic_info.wait()
-        print(nic_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['network_interfaces'],
+        'create_update',
+        (resource_group_name, network_interface_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_network_interfaces(
@@ -1110,7 +1641,10 @@ def get_network_interfaces(
         network_interface_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets information about the specified network interface.
@@ -1121,26 +1655,35 @@ def get_network_interfaces(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: NetworkInterface or ClientRawResponse if raw=true
     """
-    try:
-        nic_info = network_client.network_interfaces.get(
-            resource_group_name,
-            network_interface_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (nic_info)
+    return dispatch.call(
+        RESOURCE_TYPES['network_interfaces'],
+        'get',
+        (resource_group_name, network_interface_name),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 def delete_network_interfaces(
         resource_group_name,
         network_interface_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified network interface.
@@ -1150,21 +1693,60 @@ def delete_network_interfaces(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        nic_info = network_client.network_interfaces.delete(
-            resource_group_name,
-            network_interface_name,
-            custom_headers=None,
-            raw=None
-        )
-        nic_info.wait()
-        print(nic_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['network_interfaces'],
+        'delete',
+        (resource_group_name, network_interface_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
+
+
+def list_network_interfaces(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all network interfaces in a resource group, one page at a time.
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of NetworkInterface
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['network_interfaces'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Network Security Groups Operations
@@ -1173,7 +1755,9 @@ def create_update_network_security_groups(
         network_security_group_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a network interface.
@@ -1186,29 +1770,33 @@ def create_update_network_security_groups(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns NetworkInterface or
         ClientRawResponse if raw=true
     """
-    try:
-        nsg_info = network_client.network_security_groups.create_or_update(
-            resource_group_name,
-            network_security_group_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        nsg_info.wait()
-        print(nsg_info.result().provisioning_state)
+    return dispatch.call(
+        RESOURCE_TYPES['network_security_groups'],
+        'create_update',
+        (resource_group_name, network_security_group_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 def get_network_security_groups(
         resource_group_name,
         network_security_group_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets information about the specified network interface.
@@ -1220,26 +1808,35 @@ def get_network_security_groups(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: NetworkInterface or ClientRawResponse if raw=true
     """
-    try:
-        nsg_info = network_client.network_security_groups.get(
-            resource_group_name,
-            network_security_group_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (nsg_info)
+    return dispatch.call(
+        RESOURCE_TYPES['network_security_groups'],
+        'get',
+        (resource_group_name, network_security_group_name),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 def delete_network_security_groups(
         resource_group_name,
         network_security_group_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified network interface.
@@ -1250,21 +1847,22 @@ def delete_network_security_groups(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        nsg_info = network_client.network_security_groups.delete(
-            resource_group_name,
-            network_security_group_name,
-            custom_headers=None,
-            raw=None
-        )
-        nsg_info.wait()
-        print(nsg_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['network_security_groups'],
+        'delete',
+        (resource_group_name, network_security_group_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 # Security Rules Operations
 def create_update_security_rules(
@@ -1273,7 +1871,9 @@ def create_update_security_rules(
         security_rule_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a security rule in the specified network security group.
@@ -1287,23 +1887,61 @@ def create_update_security_rules(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns SecurityRule or
         ClientRawResponse if raw=true
     """
-    try:
-        nsgr_info = network_client.security_rules.create_or_update(
-            resource_group_name,
-            network_security_group_name,
-            security_rule_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        nsgr_info.wait()
-        print(nsgr_info.result().provisioning_state)
+    return dispatch.call(
+        RESOURCE_TYPES['security_rules'],
+        'create_update',
+        (resource_group_name, network_security_group_name, security_rule_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_network_security_groups(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all network security groups in a resource group, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of NetworkSecurityGroup
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['network_security_groups'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 def get_security_rules(
@@ -1311,7 +1949,10 @@ def get_security_rules(
         network_security_group_name,
         security_rule_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Get the specified network security rule.
@@ -1323,21 +1964,25 @@ def get_security_rules(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: SecurityRule or ClientRawResponse if raw=true
     """
-    try:
-        nsgr_info = network_client.security_rules.get(
-            resource_group_name,
-            network_security_group_name,
-            security_rule_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (nsgr_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['security_rules'],
+        'get',
+        (resource_group_name, network_security_group_name, security_rule_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_security_rules(
@@ -1345,7 +1990,9 @@ def delete_security_rules(
         network_security_group_name,
         security_rule_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified network security rule.
@@ -1357,22 +2004,63 @@ def delete_security_rules(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        nsgr_info = network_client.security_rules.delete(
-            resource_group_name,
-            network_security_group_name,
-            security_rule_name,
-            custom_headers=None,
-            raw=None
-        )
-        nsgr_info.wait()
-        print(nsgr_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['security_rules'],
+        'delete',
+        (resource_group_name, network_security_group_name, security_rule_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
+
+
+def list_security_rules(
+        resource_group_name,
+        network_security_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all security rules in a network security group, one page at a time.
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param network_security_group_name: (str) – The name of the network
+        security group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of SecurityRule
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['security_rules'],
+        'list',
+        (resource_group_name, network_security_group_name),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Express Route Circuits Operations
@@ -1381,7 +2069,9 @@ def create_update_express_route_circuits(
         circuit_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates an express route circuit.
@@ -1393,29 +2083,32 @@ def create_update_express_route_circuits(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns ExpressRouteCircuit or
         ClientRawResponse if raw=true
     """
-    try:
-        erc_info = network_client.express_route_circuits.create_or_update(
-            resource_group_name,
-            circuit_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        erc_info.wait()
-        print(erc_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuits'],
+        'create_update',
+        (resource_group_name, circuit_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_express_route_circuits(
         resource_group_name,
         circuit_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets information about the specified express route circuit.
@@ -1425,27 +2118,34 @@ def get_express_route_circuits(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: ExpressRouteCircuit or ClientRawResponse if raw=true
     """
-    try:
-        erc_info = network_client.express_route_circuits.get(
-            resource_group_name,
-            circuit_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (erc_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuits'],
+        'get',
+        (resource_group_name, circuit_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_express_route_circuits(
         resource_group_name,
         circuit_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified express route circuit.
@@ -1455,21 +2155,60 @@ def delete_express_route_circuits(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        erc_info = network_client.express_route_circuits.delete(
-            resource_group_name,
-            circuit_name,
-            custom_headers=None,
-            raw=None
-        )
-        erc_info.wait()
-        print(erc_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuits'],
+        'delete',
+        (resource_group_name, circuit_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_express_route_circuits(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all express route circuits in a resource group, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of ExpressRouteCircuit
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuits'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Express Route Circuit Authorizations Operations
@@ -1479,7 +2218,9 @@ def create_update_express_route_circuit_authorizations(
         authorization_name,
         authorization_parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates an authorization in the specified express route circuit.
@@ -1493,23 +2234,22 @@ def create_update_express_route_circuit_authorizations(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns
         ExpressRouteCircuitAuthorization or ClientRawResponse if raw=true
     """
-    try:
-        erca_info = network_client.express_route_circuit_authorizations.create_or_update(
-            resource_group_name,
-            circuit_name,
-            authorization_name,
-            authorization_parameters,
-            custom_headers=None,
-            raw=None
-        )
-        erca_info.wait()
-        print(erca_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuit_authorizations'],
+        'create_update',
+        (resource_group_name, circuit_name, authorization_name),
+        authorization_parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_express_route_circuit_authorizations(
@@ -1517,7 +2257,10 @@ def get_express_route_circuit_authorizations(
         circuit_name,
         authorization_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified authorization from the specified express route circuit.
@@ -1528,21 +2271,25 @@ def get_express_route_circuit_authorizations(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: ExpressRouteCircuitAuthorization or ClientRawResponse if raw=true
     """
-    try:
-        erca_info = network_client.express_route_circuit_authorizations.get(
-            resource_group_name,
-            circuit_name,
-            authorization_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (erca_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuit_authorizations'],
+        'get',
+        (resource_group_name, circuit_name, authorization_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_express_route_circuits_authorizations(
@@ -1550,7 +2297,9 @@ def delete_express_route_circuits_authorizations(
         circuit_name,
         authorization_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified authorization from the specified express route circuit.
@@ -1561,22 +2310,63 @@ def delete_express_route_circuits_authorizations(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        erca_info = network_client.express_route_circuit_authorizations.delete(
-            resource_group_name,
-            circuit_name,
-            authorization_name,
-            custom_headers=None,
-            raw=None
-        )
-        erca_info.wait()
-        print(erca_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuit_authorizations'],
+        'delete',
+        (resource_group_name, circuit_name, authorization_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_express_route_circuit_authorizations(
+        resource_group_name,
+        circuit_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all express route circuit authorizations in an ExpressRoute circuit,
+    one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of the express route circuit.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of ExpressRouteCircuitAuthorization
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuit_authorizations'],
+        'list',
+        (resource_group_name, circuit_name),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 def create_update_express_route_circuit_peerings(
@@ -1585,7 +2375,9 @@ def create_update_express_route_circuit_peerings(
         peering_name,
         peering_parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a peering in the specified express route circuits.
@@ -1599,23 +2391,22 @@ def create_update_express_route_circuit_peerings(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns
         ExpressRouteCircuitPeering or ClientRawResponse if raw=true
     """
-    try:
-        ercp_info = network_client.express_route_circuit_peerings.create_or_update(
-            resource_group_name,
-            circuit_name,
-            peering_name,
-            peering_parameters,
-            custom_headers=None,
-            raw=None
-        )
-        ercp_info.wait()
-        print(ercp_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuit_peerings'],
+        'create_update',
+        (resource_group_name, circuit_name, peering_name),
+        peering_parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_express_route_circuit_peerings(
@@ -1623,7 +2414,10 @@ def get_express_route_circuit_peerings(
         circuit_name,
         peering_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified authorization from the specified express route circuit.
@@ -1634,28 +2428,35 @@ def get_express_route_circuit_peerings(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: ExpressRouteCircuitPeering or ClientRawResponse if raw=true
     """
-    try:
-        ercp_info = network_client.express_route_circuit_peerings.get(
-            resource_group_name,
-            circuit_name,
-            peering_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (ercp_info)
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuit_peerings'],
+        'get',
+        (resource_group_name, circuit_name, peering_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 def delete_express_route_circuit_peerings(
         resource_group_name,
         circuit_name,
         peering_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified peering from the specified express route circuit.
@@ -1666,22 +2467,63 @@ def delete_express_route_circuit_peerings(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        ercp_info = network_client.express_route_circuit_peerings.delete(
-            resource_group_name,
-            circuit_name,
-            peering_name,
-            custom_headers=None,
-            raw=None
-        )
-        ercp_info.wait()
-        print(ercp_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuit_peerings'],
+        'delete',
+        (resource_group_name, circuit_name, peering_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_express_route_circuit_peerings(
+        resource_group_name,
+        circuit_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all express route circuit peerings in an ExpressRoute circuit, one
+    page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param circuit_name: (str) – The name of the express route circuit.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of ExpressRouteCircuitPeering
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['express_route_circuit_peerings'],
+        'list',
+        (resource_group_name, circuit_name),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Load Balancer Operations
@@ -1690,7 +2532,9 @@ def create_update_load_balancers(
         load_balancer_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a load balancer.
@@ -1702,29 +2546,32 @@ def create_update_load_balancers(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns LoadBalancer or
         ClientRawResponse if raw=true
     """
-    try:
-        lb_info = network_client.load_balancers.create_or_update(
-            resource_group_name,
-            load_balancer_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        lb_info.wait()
-        print(lb_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['load_balancers'],
+        'create_update',
+        (resource_group_name, load_balancer_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_load_balancers(
         resource_group_name,
         load_balancer_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified load balancer.
@@ -1734,26 +2581,34 @@ def get_load_balancers(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: LoadBalancer or ClientRawResponse if raw=true
     """
-    try:
-        lb_info = network_client.load_balancers.get(
-            resource_group_name,
-            load_balancer_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (lb_info)
+    return dispatch.call(
+        RESOURCE_TYPES['load_balancers'],
+        'get',
+        (resource_group_name, load_balancer_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 def delete_load_balancers(
         resource_group_name,
         load_balancer_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified load balancer.
@@ -1763,21 +2618,60 @@ def delete_load_balancers(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        lb_info = network_client.load_balancers.delete(
-            resource_group_name,
-            load_balancer_name,
-            custom_headers=None,
-            raw=None
-        )
-        lb_info.wait()
-        print(lb_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['load_balancers'],
+        'delete',
+        (resource_group_name, load_balancer_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
+
+
+def list_load_balancers(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all load balancers in a resource group, one page at a time.
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of LoadBalancer
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['load_balancers'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Application Gateways Operations
@@ -1786,7 +2680,9 @@ def create_update_application_gateways(
         application_gateway_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates the specified application gateway.
@@ -1799,29 +2695,32 @@ def create_update_application_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns ApplicationGateway or
         ClientRawResponse if raw=true
     """
-    try:
-        ag_info = network_client.application_gateways.create_or_update(
-            resource_group_name,
-            application_gateway_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        ag_info.wait()
-        print(ag_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['application_gateways'],
+        'create_update',
+        (resource_group_name, application_gateway_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_application_gateways(
         resource_group_name,
         application_gateway_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified application gateway.
@@ -1832,26 +2731,34 @@ def get_application_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: ApplicationGateway or ClientRawResponse if raw=true
     """
-    try:
-        ag_info = network_client.application_gateways.get(
-            resource_group_name,
-            application_gateway_name,
-            custom_headers=None,
-            raw=None
-        )
-        return (ag_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['application_gateways'],
+        'get',
+        (resource_group_name, application_gateway_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_application_gateways(
         resource_group_name,
         application_gateway_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified application gateway.
@@ -1862,21 +2769,60 @@ def delete_application_gateways(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        ag_info = network_client.application_gateways.delete(
-            resource_group_name,
-            application_gateway_name,
-            custom_headers=None,
-            raw=None
-        )
-        ag_info.wait()
-        print(ag_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['application_gateways'],
+        'delete',
+        (resource_group_name, application_gateway_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_application_gateways(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all application gateways in a resource group, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of ApplicationGateway
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['application_gateways'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Network Watchers Operations
@@ -1885,7 +2831,9 @@ def create_update_network_watchers(
         network_watcher_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a network watcher in the specified resource group.
@@ -1897,27 +2845,31 @@ def create_update_network_watchers(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: NetworkWatcher or ClientRawResponse if raw=true
     """
-    try:
-        nw_info = network_client.network_watchers.create_or_update(
-            resource_group_name,
-            network_watcher_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        nw_info.wait()
-        print(nw_info.result().provisioning_state)
+    return dispatch.call(
+        RESOURCE_TYPES['network_watchers'],
+        'create_update',
+        (resource_group_name, network_watcher_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 def get_network_watchers(
         resource_group_name,
         network_watcher_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified network watcher by resource group.
@@ -1927,25 +2879,34 @@ def get_network_watchers(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: NetworkWatcher or ClientRawResponse if raw=true
     """
-    try:
-        nw_info = network_client.network_watchers.get(
-            resource_group_name,
-            network_watcher_name,
-            custom_headers=None,
-            raw=None
-        )
-        return (nw_info)
+    return dispatch.call(
+        RESOURCE_TYPES['network_watchers'],
+        'get',
+        (resource_group_name, network_watcher_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 def delete_network_watchers(
         resource_group_name,
         network_watcher_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified network watcher resource.
@@ -1955,21 +2916,60 @@ def delete_network_watchers(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        nw_info = network_client.network_watchers.delete(
-            resource_group_name,
-            network_watcher_name,
-            custom_headers=None,
-            raw=None
-        )
-        nw_info.wait()
-        print(nw_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['network_watchers'],
+        'delete',
+        (resource_group_name, network_watcher_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_network_watchers(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all network watchers in a resource group, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of NetworkWatcher
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['network_watchers'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 def create_update_packet_captures(
@@ -1978,7 +2978,9 @@ def create_update_packet_captures(
         packet_capture_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Create and start a packet capture on the specified VM.
@@ -1991,23 +2993,22 @@ def create_update_packet_captures(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns PacketCaptureResult or
         ClientRawResponse if raw=true
     """
-    try:
-        pc_info = network_client.packet_captures.create(
-            resource_group_name,
-            network_watcher_name,
-            packet_capture_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        pc_info.wait()
-        print(pc_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['packet_captures'],
+        'create_update',
+        (resource_group_name, network_watcher_name, packet_capture_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_packet_captures(
@@ -2015,7 +3016,10 @@ def get_packet_captures(
         network_watcher_name,
         packet_capture_name,
         custom_headers=None,
-        raw=None
+        raw=None,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets a packet capture session by name.
@@ -2026,20 +3030,25 @@ def get_packet_captures(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: PacketCaptureResult or ClientRawResponse if raw=true
     """
-    try:
-        pc_info = network_client.packet_captures.get(
-            resource_group_name,
-            network_watcher_name,
-            packet_capture_name,
-            custom_headers=None,
-            raw=None
-        )
-        return (pc_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['packet_captures'],
+        'get',
+        (resource_group_name, network_watcher_name, packet_capture_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_packet_captures(
@@ -2047,7 +3056,9 @@ def delete_packet_captures(
         network_watcher_name,
         packet_capture_name,
         custom_headers=None,
-        raw=None
+        raw=None,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified packet capture session.
@@ -2058,22 +3069,62 @@ def delete_packet_captures(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        pc_info = network_client.packet_captures.delete(
-            resource_group_name,
-            network_watcher_name,
-            packet_capture_name,
-            custom_headers=None,
-            raw=None
-        )
-        pc_info.wait()
-        print(pc_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['packet_captures'],
+        'delete',
+        (resource_group_name, network_watcher_name, packet_capture_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_packet_captures(
+        resource_group_name,
+        network_watcher_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all packet captures in a network watcher, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param network_watcher_name: (str) – The name of the network watcher.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of PacketCaptureResult
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['packet_captures'],
+        'list',
+        (resource_group_name, network_watcher_name),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Route Filters Operations
@@ -2082,7 +3133,9 @@ def create_update_route_filters(
         route_filter_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a route filter in a specified resource group.
@@ -2094,29 +3147,33 @@ def create_update_route_filters(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns RouteFilter or
         ClientRawResponse if raw=true
     """
-    try:
-        rf_info = network_client.route_filters.create_or_update(
-            resource_group_name,
-            route_filter_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        rf_info.wait()
-        print(rf_info.result().provisioning_state)
+    return dispatch.call(
+        RESOURCE_TYPES['route_filters'],
+        'create_update',
+        (resource_group_name, route_filter_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
 
 def get_route_filters(
         resource_group_name,
         route_filter_name,
         expand=None,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified route filter.
@@ -2128,27 +3185,35 @@ def get_route_filters(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the
         deserialized response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: RouteFilter or ClientRawResponse if raw=true
     """
-    try:
-        rf_info = network_client.route_filters.get(
-            resource_group_name,
-            route_filter_name,
-            expand=None,
-            custom_headers=None,
-            raw=None
-        )
-        return (rf_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['route_filters'],
+        'get',
+        (resource_group_name, route_filter_name),
+        expand=expand,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_route_filters(
         resource_group_name,
         route_filter_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified route filter.
@@ -2158,21 +3223,60 @@ def delete_route_filters(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the
         deserialized response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        rf_info = network_client.route_filters.delete(
-            resource_group_name,
-            route_filter_name,
-            custom_headers=None,
-            raw=None
-        )
-        rf_info.wait()
-        print(rf_info.status())
+    return dispatch.call(
+        RESOURCE_TYPES['route_filters'],
+        'delete',
+        (resource_group_name, route_filter_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
-    except azure_exceptions.CloudError as e:
-        print(e)
+
+def list_route_filters(
+        resource_group_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all route filters in a resource group, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of RouteFilter
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['route_filters'],
+        'list',
+        (resource_group_name,),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 # Route Filter Rules Operations
@@ -2182,7 +3286,9 @@ def create_update_route_filter_rules(
         rule_name,
         parameters,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Creates or updates a rule in the specified route filter.
@@ -2195,23 +3301,22 @@ def create_update_route_filter_rules(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns RouteFilterRule or
         ClientRawResponse if raw=true
     """
-    try:
-        rfr_info = network_client.route_filter_rules.create_or_update(
-            resource_group_name,
-            route_filter_name,
-            rule_name,
-            parameters,
-            custom_headers=None,
-            raw=None
-        )
-        rfr_info.wait()
-        print(rfr_info.result().provisioning_state)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['route_filter_rules'],
+        'create_update',
+        (resource_group_name, route_filter_name, rule_name),
+        parameters,
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
 
 
 def get_route_filter_rules(
@@ -2219,7 +3324,10 @@ def get_route_filter_rules(
         route_filter_name,
         rule_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        output='model',
+        fields=None
 ):
     """
     Gets the specified rule from a route filter.
@@ -2230,20 +3338,25 @@ def get_route_filter_rules(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
     :return: RouteFilterRule or ClientRawResponse if raw=true
     """
-    try:
-        rfr_info = network_client.route_filter_rules.get(
-            resource_group_name,
-            route_filter_name,
-            rule_name,
-            custom_headers=None,
-            raw=False
-        )
-        return (rfr_info)
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['route_filter_rules'],
+        'get',
+        (resource_group_name, route_filter_name, rule_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        output=output,
+        fields=fields)
 
 
 def delete_route_filter_rules(
@@ -2251,7 +3364,9 @@ def delete_route_filter_rules(
         route_filter_name,
         rule_name,
         custom_headers=None,
-        raw=False
+        raw=False,
+        context=None,
+        no_wait=False
 ):
     """
     Deletes the specified rule from a route filter.
@@ -2262,22 +3377,62 @@ def delete_route_filter_rules(
     :param custom_headers: (dict) – headers that will be added to the request
     :param raw: (bool) – returns the direct response alongside the deserialized
         response
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param no_wait: (bool) – return a handle to the operation as soon as it
+        is accepted instead of waiting for it to finish.
     :return: AzureOperationPoller instance that returns None or
         ClientRawResponse if raw=true
     """
-    try:
-        rfr_info = network_client.route_filter_rules.delete(
-            resource_group_name,
-            route_filter_name,
-            rule_name,
-            custom_headers=None,
-            raw=None
-        )
-        rfr_info.wait()
-        print(rfr_info.status())
-
-    except azure_exceptions.CloudError as e:
-        print(e)
+    return dispatch.call(
+        RESOURCE_TYPES['route_filter_rules'],
+        'delete',
+        (resource_group_name, route_filter_name, rule_name),
+        custom_headers=custom_headers,
+        raw=raw,
+        context=context,
+        no_wait=no_wait)
+
+
+def list_route_filter_rules(
+        resource_group_name,
+        route_filter_name,
+        custom_headers=None,
+        prefetch=True,
+        context=None,
+        output='model',
+        fields=None
+):
+    """
+    Lists all route filter rules in a route filter, one page at a time.
+
+    :param network_client: (NetworkManagementClient) - object created using
+        Service Principal
+    :param resource_group_name: (str) – The name of the resource group.
+    :param route_filter_name: (str) – The name of the route filter.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param prefetch: (bool) – fetch the next page in the background while
+        the current one is consumed.
+    :param context: (ClientContext) – subscription/cloud to run against;
+        defaults to the configured subscription.
+    :param output: (str) – 'model' for SDK models, 'json' for parsed JSON
+        dicts or 'bytes' for the raw response body; 'json' and 'bytes'
+        skip model deserialization.
+    :param fields: (list) – return records holding only these fields, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'], instead
+        of full models; see operations.projection.
+    :return: generator of RouteFilterRule
+    :raises: CloudError
+    """
+    return dispatch.call(
+        RESOURCE_TYPES['route_filter_rules'],
+        'list',
+        (resource_group_name, route_filter_name),
+        custom_headers=custom_headers,
+        context=context,
+        prefetch=prefetch,
+        output=output,
+        fields=fields)
 
 
 
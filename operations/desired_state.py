@@ -0,0 +1,289 @@
+#!/usr/bin/python3
+#
+# desired_state.py
+#
+# Idempotent apply mode. While enabled, every create_update_* call first
+# reads the resource and compares it with the desired parameters; when
+# nothing differs the PUT, and the long-running operation behind it, is
+# skipped. Each run keeps a report of what was skipped, changed and
+# created.
+#
+#     import operations.desired_state as desired_state
+#     desired_state.enable()
+#     ...run a workflow...
+#     print(desired_state.report().summary())
+
+import threading
+import time
+
+import operations.authenticate_user as clients
+import operations.lro as lro
+import operations.lro_scheduler as lro_scheduler
+import operations.metrics as metrics
+from operations.resource_types import resource_id
+
+SKIPPED = 'skipped'
+CHANGED = 'changed'
+CREATED = 'created'
+
+# Server-maintained fields that never count as a difference.
+IGNORED_FIELDS = frozenset([
+    'etag', 'provisioningState', 'resourceGuid', 'type',
+])
+
+# Fields ARM fills in when a PUT leaves them out. Any other field the
+# resource has and the parameters leave out would be cleared by the PUT, so
+# it counts as a difference unless its value is empty.
+SERVER_DEFAULTED_FIELDS = frozenset([
+    # child resources
+    'id', 'name',
+    # subnets and IP configurations
+    'privateEndpointNetworkPolicies', 'privateLinkServiceNetworkPolicies',
+    'privateIPAddress', 'privateIPAllocationMethod', 'privateIPAddressVersion',
+    'primary',
+    # public IP addresses
+    'publicIPAllocationMethod', 'publicIPAddressVersion',
+    'idleTimeoutInMinutes', 'sku',
+    # network interfaces
+    'macAddress', 'appliedDnsServers', 'internalDomainNameSuffix',
+    # network security groups
+    'defaultSecurityRules',
+    # virtual network gateways and connections
+    'vpnType', 'vpnGatewayGeneration', 'bgpSettings', 'connectionProtocol',
+    # peerings
+    'allowVirtualNetworkAccess',
+    # load balancers
+    'loadDistribution', 'intervalInSeconds', 'numberOfProbes',
+    # express route circuits and peerings
+    'serviceKey', 'serviceProviderProvisioningState', 'gatewayManagerEtag',
+    'authorizationKey', 'azureASN', 'primaryAzurePort', 'secondaryAzurePort',
+    'stag', 'state',
+    # packet captures
+    'totalBytesPerSession', 'timeLimitInSeconds',
+])
+
+# Free-form maps, compared exactly: a key the parameters leave out is one
+# the PUT removes.
+EXACT_FIELDS = frozenset(['tags'])
+
+# Fields whose values ARM returns in another case or spelling.
+CASE_INSENSITIVE_FIELDS = frozenset(['id', 'location'])
+
+_report = None
+
+
+class ApplyReport(object):
+    """
+    What one apply run did with each create_update_* call.
+
+    Time saved by a skipped PUT is estimated from the mean duration of the
+    PUTs this run sent for the same family, or from the family's initial
+    polling interval when it sent none.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self._durations = {}
+        self._lock = threading.Lock()
+
+    def add(self, action, rtype, rid, seconds=None):
+        """
+        :param action: (str) – SKIPPED, CHANGED or CREATED.
+        :param rtype: (ResourceType) – the resource family.
+        :param rid: (str) – resource id.
+        :param seconds: (float) – how long the PUT took, if it was sent and
+            waited for.
+        :return: none
+        """
+        with self._lock:
+            self.entries.append((action, rtype.name, rid))
+            if seconds is not None:
+                self._durations.setdefault(rtype.name, []).append(seconds)
+        metrics.increment('apply_{}'.format(action))
+
+    def _estimate(self, family):
+        durations = self._durations.get(family)
+        if durations:
+            return sum(durations) / len(durations)
+
+        return lro_scheduler.POLLING_PROFILES.get(
+            family, lro_scheduler.DEFAULT_PROFILE).initial
+
+    def resources(self, action):
+        """
+        :param action: (str) – SKIPPED, CHANGED or CREATED.
+        :return: list of resource ids
+        """
+        with self._lock:
+            return [rid for entry_action, _, rid in self.entries
+                    if entry_action == action]
+
+    def time_saved(self):
+        """
+        :return: (float) estimated seconds of PUTs not sent
+        """
+        with self._lock:
+            return sum(self._estimate(family)
+                       for action, family, _ in self.entries
+                       if action == SKIPPED)
+
+    def summary(self):
+        """
+        :return: (str) counts, resources per action and time saved
+        """
+        lines = []
+        for action in (SKIPPED, CHANGED, CREATED):
+            resources = self.resources(action)
+            lines.append('{}: {}'.format(action.capitalize(), len(resources)))
+            lines.extend('\t{}'.format(rid) for rid in resources)
+        lines.append('Estimated time saved: {:.0f}s'.format(self.time_saved()))
+        return '\n'.join(lines)
+
+
+def enable():
+    """
+    Turn on idempotent apply and start a new report.
+
+    :return: ApplyReport
+    """
+    global _report
+
+    _report = ApplyReport()
+    return _report
+
+
+def disable():
+    """
+    Turn idempotent apply off.
+
+    :return: none
+    """
+    global _report
+
+    _report = None
+
+
+def report():
+    """
+    :return: (ApplyReport) the current run's report, or None when disabled
+    """
+    return _report
+
+
+def _empty(value):
+    # what a PUT that leaves the field out ends up with
+    if isinstance(value, dict):
+        return all(_empty(item) for item in value.values())
+
+    return not value
+
+
+def _equal(field, desired, current):
+    if field in EXACT_FIELDS:
+        return (desired or {}) == (current or {})
+
+    if field in CASE_INSENSITIVE_FIELDS and isinstance(desired, str):
+        return (isinstance(current, str) and
+                desired.replace(' ', '').lower()
+                == current.replace(' ', '').lower())
+
+    if _empty(desired) and _empty(current):
+        return True
+
+    return covers(desired, current)
+
+
+def covers(desired, current):
+    """
+    Whether a PUT of desired would leave current as it is: every value
+    desired sets matches, and every field it leaves out is one ARM defaults
+    (SERVER_DEFAULTED_FIELDS) or is empty. Free-form maps such as tags must
+    match exactly.
+    """
+    if isinstance(desired, dict):
+        if not isinstance(current, dict):
+            return False
+        omitted = [field for field in current if field not in desired]
+        return (all(_equal(field, value, current.get(field))
+                    for field, value in desired.items()
+                    if field not in IGNORED_FIELDS)
+                and all(field in IGNORED_FIELDS
+                        or field in SERVER_DEFAULTED_FIELDS
+                        or _empty(current[field])
+                        for field in omitted))
+
+    if isinstance(desired, list):
+        if not isinstance(current, list) or len(desired) != len(current):
+            return False
+        if all(isinstance(item, dict) and 'name' in item for item in desired):
+            by_name = {item.get('name'): item for item in current
+                       if isinstance(item, dict)}
+            return all(covers(item, by_name.get(item['name']))
+                       for item in desired)
+        return all(covers(a, b) for a, b in zip(desired, current))
+
+    return desired == current
+
+
+def unchanged(operations, rtype, parameters, current):
+    """
+    Compare desired parameters with the current resource after both are
+    serialized to the REST body ARM accepts, which drops read-only fields.
+
+    :param operations: operations group of the resource family.
+    :param rtype: (ResourceType) – the resource family.
+    :param parameters: (dict or Model) – the desired state.
+    :param current: (Model) – the resource as it is now.
+    :return: bool
+    """
+    desired = operations._serialize.body(parameters, rtype.model)
+    existing = operations._serialize.body(current, rtype.model)
+    return covers(desired, existing)
+
+
+def middleware(call, proceed):
+    """
+    Dispatch middleware: while enabled, skip create_update calls whose
+    resource already matches the parameters, and record every call in the
+    run's report.
+
+    :param call: (dispatch.Call) – the call being made.
+    :param proceed: (callable) – the rest of the chain.
+    """
+    from msrestazure import azure_exceptions
+
+    run = _report
+    if run is None or call.raw:
+        return proceed(call)
+
+    context = clients.resolve_context(call.context)
+    rid = resource_id(call.rtype, context.subscription_id, call.key)
+    operations = clients.get_operations(call.rtype, call.context)
+    try:
+        current = operations.get(*call.key)
+    except azure_exceptions.CloudError as e:
+        if e.status_code != 404:
+            # cannot tell; let the PUT go ahead and report its own errors
+            return proceed(call)
+        current = None
+
+    if current is not None:
+        try:
+            skip = unchanged(operations, call.rtype, call.parameters, current)
+        except Exception:
+            # parameters the serializer rejects are left for ARM to judge
+            skip = False
+
+        if skip:
+            run.add(SKIPPED, call.rtype, rid)
+            operation = lro.CompletedOperation(current)
+            if call.no_wait:
+                return operation
+            print(lro.provisioning_state(current))
+            return None
+
+    started = time.time()
+    result = proceed(call)
+    run.add(CHANGED if current is not None else CREATED, call.rtype, rid,
+            None if call.no_wait else time.time() - started)
+    return result
@@ -0,0 +1,340 @@
+#!/usr/bin/python3
+#
+# dispatch.py
+#
+# The one code path behind every cumulus create_update/get/delete/list
+# function. Each function describes its call (resource family from
+# RESOURCE_TYPES, verb, resource names, options) and hands it to call(),
+# which runs it through the registered middleware and then the verb's
+# handler:
+#
+#     dispatch.call(RESOURCE_TYPES['subnets'], 'get',
+#                   (GROUP_NAME, VNET_NAME, SUBNET_NAME))
+#
+# Middleware is any callable middleware(call, proceed) that returns
+# proceed(call), or a result of its own. Chains are composed once per verb
+# when middleware is registered, so a call costs one Call object and one
+# function call per middleware.
+
+import threading
+import time
+
+import operations.authenticate_user as clients
+import operations.child_batching as child_batching
+import operations.circuit_breaker as circuit_breaker
+import operations.desired_state as desired_state
+import operations.json_reads as json_reads
+import operations.lro as lro
+import operations.paging as paging
+import operations.projection as projection
+import operations.resource_cache as resource_cache
+import operations.single_flight as single_flight
+import operations.write_scheduler as write_scheduler
+
+VERBS = ('create_update', 'get', 'delete', 'list')
+
+_lock = threading.Lock()
+_middleware = []
+_chains = {}
+
+
+class Call(object):
+    """
+    One cumulus call as seen by middleware and handlers.
+
+    :param rtype: (ResourceType) – the resource family.
+    :param verb: (str) – 'create_update', 'get', 'delete' or 'list'.
+    :param key: (tuple) – resource group name followed by resource names;
+        for 'list', the names of the parent only.
+    :param parameters: resource parameters for 'create_update'.
+    :param expand: (str) – Expands referenced resources ('get').
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param raw: (bool) – returns the direct response alongside the
+        deserialized response
+    :param context: (ClientContext) – subscription/cloud to run against.
+    :param no_wait: (bool) – return the operation handle instead of waiting
+        ('create_update' and 'delete').
+    :param prefetch: (bool) – fetch the next page in the background ('list').
+    :param output: (str) – 'model', or 'json'/'bytes' to skip model
+        deserialization ('get' and 'list').
+    :param fields: (tuple) – field paths to project into records instead of
+        building models ('get' and 'list'); takes precedence over output.
+    :param strict: (bool) – raise CloudError, or CircuitOpenError while the
+        endpoint's circuit breaker is open, instead of printing it and
+        returning None.
+    """
+
+    __slots__ = ('rtype', 'verb', 'key', 'parameters', 'expand',
+                 'custom_headers', 'raw', 'context', 'no_wait', 'prefetch',
+                 'output', 'fields', 'strict')
+
+    def __init__(self, rtype, verb, key, parameters=None, expand=None,
+                 custom_headers=None, raw=False, context=None, no_wait=False,
+                 prefetch=True, output=json_reads.MODEL, fields=None,
+                 strict=False):
+        self.rtype = rtype
+        self.verb = verb
+        self.key = key
+        self.parameters = parameters
+        self.expand = expand
+        self.custom_headers = custom_headers
+        self.raw = raw
+        self.context = context
+        self.no_wait = no_wait
+        self.prefetch = prefetch
+        self.output = output
+        self.fields = tuple(fields) if fields else None
+        self.strict = strict
+
+    @property
+    def plain(self):
+        """
+        Whether the call asks for nothing beyond the resource model itself
+        (no expand, custom_headers, raw, fields or other output), so shared
+        or cached models may answer it.
+        """
+        return not (self.expand or self.custom_headers or self.raw
+                    or self.fields or self.output != json_reads.MODEL)
+
+
+def _failed(call, error):
+    if call.strict:
+        raise error
+    print(error)
+
+
+def _raw_response(operation, resource):
+    from msrest.pipeline import ClientRawResponse
+
+    return ClientRawResponse(resource, getattr(operation, 'response', None))
+
+
+def _create_update(call):
+    from msrestazure import azure_exceptions
+
+    operation = lro.begin(
+        call.rtype,
+        'create_update',
+        call.key,
+        call.parameters,
+        custom_headers=call.custom_headers,
+        context=call.context)
+    if call.no_wait:
+        return operation
+
+    try:
+        resource = operation.result()
+        print(lro.provisioning_state(resource))
+        if call.raw:
+            return _raw_response(operation, resource)
+
+    except (azure_exceptions.CloudError,
+            circuit_breaker.CircuitOpenError) as e:
+        _failed(call, e)
+
+
+def _get(call):
+    from msrestazure import azure_exceptions
+
+    try:
+        if call.fields:
+            return projection.compiled(call.fields)(json_reads.get(
+                call.rtype,
+                call.key,
+                json_reads.JSON,
+                expand=call.expand,
+                custom_headers=call.custom_headers,
+                context=call.context))
+
+        if call.output != json_reads.MODEL:
+            return json_reads.get(
+                call.rtype,
+                call.key,
+                call.output,
+                expand=call.expand,
+                custom_headers=call.custom_headers,
+                context=call.context)
+
+        kwargs = {'custom_headers': call.custom_headers, 'raw': call.raw}
+        if call.rtype.get_expand:
+            kwargs['expand'] = call.expand
+
+        operations = clients.get_operations(call.rtype, call.context)
+        return operations.get(*call.key, **kwargs)
+
+    except (azure_exceptions.CloudError,
+            circuit_breaker.CircuitOpenError) as e:
+        _failed(call, e)
+
+
+def _delete(call):
+    from msrestazure import azure_exceptions
+
+    operation = lro.begin(
+        call.rtype,
+        'delete',
+        call.key,
+        custom_headers=call.custom_headers,
+        context=call.context)
+    if call.no_wait:
+        return operation
+
+    try:
+        operation.result()
+        print(operation.status())
+        if call.raw:
+            return _raw_response(operation, None)
+
+    except (azure_exceptions.CloudError,
+            circuit_breaker.CircuitOpenError) as e:
+        _failed(call, e)
+
+
+def _list(call):
+    from msrestazure import azure_exceptions
+
+    output = json_reads.JSON if call.fields else call.output
+    try:
+        if output != json_reads.MODEL:
+            pages = json_reads.pages(
+                call.rtype,
+                call.key,
+                output,
+                custom_headers=call.custom_headers,
+                context=call.context)
+        else:
+            operations = clients.get_operations(call.rtype, call.context)
+            pages = getattr(operations, call.rtype.list_method)(
+                *call.key, custom_headers=call.custom_headers)
+
+        resources = paging.iter_pages(pages, prefetch=call.prefetch)
+        if call.fields:
+            resources = map(projection.compiled(call.fields), resources)
+
+        for resource in resources:
+            yield resource
+
+    except (azure_exceptions.CloudError,
+            circuit_breaker.CircuitOpenError) as e:
+        _failed(call, e)
+
+
+HANDLERS = {
+    'create_update': _create_update,
+    'get': _get,
+    'delete': _delete,
+    'list': _list,
+}
+
+
+def _compose(handler, middleware):
+    def step(call):
+        return middleware(call, handler)
+
+    return step
+
+
+def _build(verb, handler):
+    chain = handler
+    for middleware, verbs in reversed(_middleware):
+        if verbs is None or verb in verbs:
+            chain = _compose(chain, middleware)
+
+    return chain
+
+
+def _rebuild():
+    _chains.clear()
+    for verb in VERBS:
+        _chains[verb] = _build(verb, HANDLERS[verb])
+
+
+def use(middleware, verbs=None):
+    """
+    Register middleware after (inside) the middleware already registered.
+
+    :param middleware: (callable) – middleware(call, proceed).
+    :param verbs: (tuple) – verbs it applies to, or None for all of them.
+    :return: middleware
+    """
+    with _lock:
+        _middleware.append((middleware, verbs))
+        _rebuild()
+
+    return middleware
+
+
+def remove(middleware):
+    """
+    Unregister middleware.
+
+    :param middleware: (callable) – as passed to use().
+    :return: none
+    """
+    with _lock:
+        _middleware[:] = [(m, verbs) for m, verbs in _middleware
+                          if m is not middleware]
+        _rebuild()
+
+
+def middleware():
+    """
+    :return: list of (middleware, verbs), outermost first
+    """
+    with _lock:
+        return list(_middleware)
+
+
+def call(rtype, verb, key, parameters=None, **options):
+    """
+    Run one cumulus call through the middleware and its verb's handler.
+
+    :param rtype: (ResourceType) – the resource family.
+    :param verb: (str) – 'create_update', 'get', 'delete' or 'list'.
+    :param key: (tuple) – resource group name followed by resource names.
+    :param parameters: resource parameters for 'create_update'.
+    :param options: Call options: expand, custom_headers, raw, context,
+        no_wait, prefetch, output, fields and strict.
+    :return: whatever the handler returns: the resource for 'get', a
+        generator for 'list', the operation handle for no_wait writes
+    """
+    return _chains[verb](Call(rtype, verb, key, parameters, **options))
+
+
+def benchmark(iterations=100000, verb='get'):
+    """
+    Measure what dispatch adds to a call, using a handler that does
+    nothing so no request is sent.
+
+    :param iterations: (int) – calls to time.
+    :param verb: (str) – the verb whose middleware chain is measured.
+    :return: dict of nanoseconds per call: 'direct' (handler alone),
+        'dispatched' (Call + middleware + handler) and 'overhead'
+    """
+    from operations.resource_types import RESOURCE_TYPES
+
+    rtype = RESOURCE_TYPES['subnets']
+    key = ('group', 'vnet', 'subnet')
+    handler = lambda call: None
+    chain = _build(verb, handler)
+    prepared = Call(rtype, verb, key)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        handler(prepared)
+    direct = (time.perf_counter() - started) / iterations * 1e9
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        chain(Call(rtype, verb, key))
+    dispatched = (time.perf_counter() - started) / iterations * 1e9
+
+    return {'direct': direct, 'dispatched': dispatched,
+            'overhead': dispatched - direct}
+
+
+use(resource_cache.middleware, ('create_update', 'get', 'delete'))
+use(write_scheduler.middleware, write_scheduler.WRITE_VERBS)
+use(single_flight.middleware, ('get',))
+use(child_batching.middleware, ('get',))
+use(desired_state.middleware, ('create_update',))
@@ -0,0 +1,213 @@
+#!/usr/bin/python3
+#
+# execution_group.py
+#
+# Runs a batch of cumulus calls in parallel, each as soon as the calls it
+# depends on have succeeded, and stops early when a required call fails:
+# work that depends on the failure is skipped, and with fail_fast every
+# call that has not started yet is cancelled, instead of spending minutes
+# on long-running operations that can no longer lead anywhere.
+#
+#     group = ExecutionGroup()
+#     vnet = group.add(cumulus.create_update_virtual_networks,
+#                      GROUP_NAME, VNET_NAME, vnet_parameters)
+#     subnet = group.add(cumulus.create_update_subnets,
+#                        GROUP_NAME, VNET_NAME, SUBNET_NAME,
+#                        subnet_parameters, after=[vnet])
+#     group.run()
+#     print(group.summary())
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import operations.results as results
+
+DEFAULT_WORKERS = 8
+
+
+class Task(object):
+    """
+    One call in an ExecutionGroup.
+
+    :param name: (str) – label used in the summary.
+    :param call: (tuple) – rtype, verb, key, parameters for results.call().
+    :param options: (dict) – dispatch options.
+    :param after: (list) – Tasks that must succeed first.
+    :param required: (bool) – whether a failure stops the group.
+    """
+
+    def __init__(self, name, call, options, after, required):
+        self.name = name
+        self.call = call
+        self.options = options
+        self.after = list(after)
+        self.required = required
+        self.dependents = []
+        self.waiting = len(self.after)
+        self.started = False
+        self.result = None
+
+    @property
+    def done(self):
+        return self.result is not None
+
+
+class ExecutionGroup(object):
+    """
+    A dependency graph of cumulus calls.
+
+    :param workers: (int) – calls run at once.
+    :param fail_fast: (bool) – cancel everything not yet started once a
+        required call fails; otherwise only its dependents are skipped.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, fail_fast=True):
+        self.workers = workers
+        self.fail_fast = fail_fast
+        self.tasks = []
+        self.failure = None
+        self._condition = threading.Condition()
+        self._executor = None
+
+    def add(self, function, *args, after=(), required=True, name=None,
+            **kwargs):
+        """
+        Add a cumulus function call.
+
+        :param function: (callable) – a cumulus function, e.g.
+            cumulus.create_update_subnets.
+        :param args: its positional arguments.
+        :param after: (list) – Tasks of this group that must succeed first.
+        :param required: (bool) – whether its failure stops the group.
+        :param name: (str) – label; defaults to the function and names.
+        :param kwargs: its keyword arguments other than raw and no_wait.
+        :return: Task
+        """
+        call = results.describe(function, args)
+        if name is None:
+            name = '{} {}'.format(
+                function if isinstance(function, str) else function.__name__,
+                '/'.join(call[2]))
+        return self._add(Task(name, call, kwargs, after, required))
+
+    def call(self, rtype, verb, key, parameters=None, after=(), required=True,
+             name=None, **options):
+        """
+        Add a dispatch call.
+
+        :param rtype: (ResourceType) – the resource family.
+        :param verb: (str) – 'create_update', 'get', 'delete' or 'list'.
+        :param key: (tuple) – resource group name followed by resource names.
+        :param parameters: resource parameters for 'create_update'.
+        :param after: (list) – Tasks of this group that must succeed first.
+        :param required: (bool) – whether its failure stops the group.
+        :param name: (str) – label; defaults to the function and names.
+        :param options: other dispatch options, e.g. context.
+        :return: Task
+        """
+        if name is None:
+            name = '{} {}'.format(rtype.function_name(verb), '/'.join(key))
+        return self._add(Task(name, (rtype, verb, tuple(key), parameters),
+                              options, after, required))
+
+    def _add(self, task):
+        with self._condition:
+            if self._executor is not None:
+                raise RuntimeError('ExecutionGroup has already run')
+            for other in task.after:
+                if other not in self.tasks:
+                    raise ValueError('{} depends on {}, which is not in this '
+                                     'group'.format(task.name, other.name))
+                other.dependents.append(task)
+
+            self.tasks.append(task)
+        return task
+
+    def run(self):
+        """
+        Run every call, in parallel where dependencies allow, and wait for
+        the calls that were started to finish. Operations already running in
+        ARM when a failure stops the group are waited for, not aborted.
+
+        :return: list of Results in the order the calls were added
+        """
+        with self._condition:
+            if self._executor is not None:
+                raise RuntimeError('ExecutionGroup has already run')
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix='cumulus-group')
+
+            for task in self.tasks:
+                if not task.after:
+                    self._executor.submit(self._run, task)
+
+            while not all(task.done for task in self.tasks):
+                self._condition.wait()
+
+        self._executor.shutdown()
+        return [task.result for task in self.tasks]
+
+    def _run(self, task):
+        with self._condition:
+            # cancelled or skipped while queued
+            if task.done:
+                return
+            task.started = True
+
+        result = results.call(*task.call, **task.options)
+
+        with self._condition:
+            self._finish(task, result)
+            self._condition.notify_all()
+
+    def _finish(self, task, result):
+        task.result = result
+        if result.ok:
+            for dependent in task.dependents:
+                dependent.waiting -= 1
+                if dependent.waiting == 0 and not dependent.done:
+                    self._executor.submit(self._run, dependent)
+            return
+
+        self._skip(task)
+        if result.status == results.FAILED and task.required:
+            if self.failure is None:
+                self.failure = task
+            if self.fail_fast:
+                self._cancel(task)
+
+    def _skip(self, task):
+        for dependent in task.dependents:
+            if not dependent.done:
+                dependent.result = results.not_run(
+                    results.SKIPPED, '{} did not succeed'.format(task.name))
+                self._skip(dependent)
+
+    def _cancel(self, failed):
+        message = 'cancelled after {} failed'.format(failed.name)
+        for task in self.tasks:
+            if not task.done and not task.started:
+                task.result = results.not_run(results.CANCELLED, message)
+
+    def summary(self):
+        """
+        :return: (str) one line per call: status, duration, and error code
+            and request id of failures
+        """
+        lines = []
+        for task in self.tasks:
+            result = task.result
+            if result is None:
+                lines.append('{}: pending'.format(task.name))
+                continue
+
+            line = '{}: {} ({:.1f}s)'.format(task.name, result.status,
+                                              result.duration)
+            if result.status == results.FAILED:
+                line += ' {} request {}'.format(result.error_code,
+                                                 result.request_id)
+            elif not result.ok:
+                line += ' {}'.format(result.message)
+            lines.append(line)
+
+        return '\n'.join(lines)
@@ -0,0 +1,233 @@
+#!/usr/bin/python3
+#
+# hedging.py
+#
+# Hedged reads for the shared sessions. A GET that has not answered within
+# the endpoint's recent 95th-percentile latency is sent a second time, and
+# the first response that is not a 5xx or 429 is used; the other is
+# discarded. Only the slowest few percent of reads pay for a second
+# request, and a read stuck on a bad connection or backend no longer holds
+# its caller for the full socket timeout.
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import operations.metrics as metrics
+from operations.circuit_breaker import endpoint
+
+DEFAULT_PERCENTILE = 0.95
+# Latencies needed before an endpoint's percentile is trusted.
+DEFAULT_MIN_SAMPLES = 20
+DEFAULT_WINDOW = 256
+# Never hedge sooner than this, however fast the endpoint usually is.
+DEFAULT_MIN_DELAY = 0.05
+DEFAULT_WORKERS = 32
+
+HEDGED_METHODS = ('GET', 'HEAD')
+
+_default = None
+_default_lock = threading.Lock()
+
+
+class LatencyWindow(object):
+    """
+    The most recent latencies of one endpoint.
+
+    :param size: (int) – latencies kept.
+    """
+
+    def __init__(self, size=DEFAULT_WINDOW):
+        self._latencies = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, fraction, min_samples=DEFAULT_MIN_SAMPLES):
+        """
+        :param fraction: (float) – e.g. 0.95.
+        :param min_samples: (int) – fewer latencies than this give None.
+        :return: (float) seconds, or None
+        """
+        with self._lock:
+            if len(self._latencies) < min_samples:
+                return None
+            latencies = sorted(self._latencies)
+
+        return latencies[min(int(len(latencies) * fraction),
+                             len(latencies) - 1)]
+
+
+class Hedger(object):
+    """
+    Sends reads, and a second copy of any read slower than the endpoint's
+    percentile latency.
+
+    :param percentile: (float) – latency percentile that triggers a hedge.
+    :param min_samples: (int) – reads per endpoint before hedging starts.
+    :param min_delay: (float) – seconds; the earliest a hedge is sent.
+    :param workers: (int) – threads sending hedged reads; each read in
+        flight uses one, two once hedged.
+    """
+
+    def __init__(self, percentile=DEFAULT_PERCENTILE,
+                 min_samples=DEFAULT_MIN_SAMPLES, min_delay=DEFAULT_MIN_DELAY,
+                 workers=DEFAULT_WORKERS):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._lock = threading.Lock()
+        self._windows = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='cumulus-hedge')
+
+    def _window(self, url):
+        name = endpoint(url)
+        with self._lock:
+            window = self._windows.get(name)
+            if window is None:
+                window = self._windows[name] = LatencyWindow()
+            return window
+
+    def delay(self, url):
+        """
+        :param url: (str) – request URL.
+        :return: (float) seconds to wait before hedging a read, or None while
+            the endpoint has too few samples
+        """
+        latency = self._window(url).percentile(self.percentile,
+                                               self.min_samples)
+        return None if latency is None else max(latency, self.min_delay)
+
+    def _timed(self, window, send):
+        started = time.time()
+        response = send()
+        window.add(time.time() - started)
+        return response
+
+    def send(self, send, url):
+        """
+        Send a read, hedging it once it has taken longer than delay(url).
+
+        :param send: (callable) – sends the read and returns the response;
+            may be called twice, concurrently.
+        :param url: (str) – request URL.
+        :return: the first response whose status settles() the race; once
+            hedged, a 5xx or 429 is returned only when the other copy did no
+            better
+        :raises: the last exception when every copy failed
+        """
+        window = self._window(url)
+        delay = self.delay(url)
+        if delay is None:
+            return self._timed(window, send)
+
+        first = self._executor.submit(self._timed, window, send)
+        done, _ = wait([first], timeout=delay)
+        if done:
+            return first.result()
+
+        metrics.increment('hedged_requests')
+        pending = [first, self._executor.submit(self._timed, window, send)]
+        error = None
+        unsettled = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                error = future.exception()
+                if error is not None:
+                    continue
+
+                response = future.result()
+                if not settles(response.status_code):
+                    # wait for the other copy; keep one answer to fall back on
+                    if unsettled is None:
+                        unsettled = response
+                    else:
+                        response.close()
+                    continue
+
+                if future is not first:
+                    metrics.increment('hedged_wins')
+                if unsettled is not None:
+                    unsettled.close()
+                for loser in pending:
+                    loser.add_done_callback(_close)
+                return response
+
+        if unsettled is not None:
+            return unsettled
+        raise error
+
+    def stats(self):
+        """
+        Current hedge delay per endpoint, and hedges sent and won.
+
+        :return: dict
+        """
+        with self._lock:
+            windows = dict(self._windows)
+
+        return {'delays': {name: window.percentile(self.percentile,
+                                                   self.min_samples)
+                           for name, window in windows.items()},
+                'hedged': metrics.counter('hedged_requests'),
+                'won': metrics.counter('hedged_wins')}
+
+
+def _close(future):
+    if future.exception() is None:
+        future.result().close()
+
+
+def settles(status_code):
+    """
+    Whether a response ends a hedged race. Server errors and throttling may
+    be one backend's trouble, so the other copy is waited for.
+
+    :param status_code: (int) – HTTP status.
+    :return: bool
+    """
+    return status_code < 500 and status_code != 429
+
+
+def hedges(method):
+    """
+    :param method: (str) – HTTP method.
+    :return: (bool) whether requests of this method may be sent twice
+    """
+    return method.upper() in HEDGED_METHODS
+
+
+def default():
+    """
+    The process-wide hedger used by the shared sessions.
+
+    :return: Hedger
+    """
+    global _default
+
+    with _default_lock:
+        if _default is None:
+            _default = Hedger()
+
+        return _default
+
+
+def configure(**kwargs):
+    """
+    Replace the process-wide hedger.
+
+    :param kwargs: Hedger settings: percentile, min_samples, min_delay and
+        workers.
+    :return: Hedger
+    """
+    global _default
+
+    with _default_lock:
+        _default = Hedger(**kwargs)
+        return _default
+
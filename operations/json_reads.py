@@ -0,0 +1,234 @@
+#!/usr/bin/python3
+#
+# json_reads.py
+#
+# Reads that skip msrest model deserialization. get_*/list_* called with
+# output='json' return the ARM response as parsed JSON dicts, and with
+# output='bytes' as the undecoded response body. The request still goes
+# through the pooled client's pipeline, so authentication, retries, rate
+# limiting and connection reuse all apply.
+#
+#     subnet = cumulus.get_subnets(GROUP_NAME, VNET_NAME, SUBNET_NAME,
+#                                  output='json')
+#     subnet['properties']['addressPrefix']
+
+import json
+import time
+import tracemalloc
+import uuid
+
+import operations.authenticate_user as clients
+from operations.resource_types import NETWORK_PROVIDER, resource_id
+
+MODEL = 'model'
+JSON = 'json'
+BYTES = 'bytes'
+
+OUTPUTS = (MODEL, JSON, BYTES)
+
+
+def _check_output(output):
+    if output not in OUTPUTS:
+        raise ValueError('output must be one of {}, not {!r}'.format(
+            ', '.join(OUTPUTS), output))
+
+
+def _list_path(rtype, subscription_id, key):
+    # key holds the parent's names: () for resource groups, (group,) for
+    # top-level resources, (group, parent) for children
+    if not rtype.path:
+        return '/subscriptions/{}/resourcegroups'.format(subscription_id)
+    if len(rtype.path) == 1:
+        return '/subscriptions/{}/resourceGroups/{}/providers/{}/{}'.format(
+            subscription_id, key[0], NETWORK_PROVIDER, rtype.path[0])
+
+    return '{}/{}'.format(
+        resource_id(rtype.parent, subscription_id, key), rtype.path[-1])
+
+
+def _send(operations, url, query, custom_headers):
+    from msrestazure import azure_exceptions
+
+    client = operations._client
+    headers = {'Accept': 'application/json',
+               'x-ms-client-request-id': str(uuid.uuid1())}
+    if operations.config.accept_language is not None:
+        headers['accept-language'] = operations.config.accept_language
+    headers.update(custom_headers or {})
+
+    request = client.get(url, query)
+    response = client.send(request, headers, stream=False)
+    if response.status_code != 200:
+        raise azure_exceptions.CloudError(response)
+
+    return response
+
+
+def get(rtype, key, output=JSON, expand=None, custom_headers=None,
+        context=None):
+    """
+    GET one resource without building its model.
+
+    :param rtype: (ResourceType) – the resource family.
+    :param key: (tuple) – resource group name followed by resource names.
+    :param output: (str) – 'json' for a dict, 'bytes' for the raw body.
+    :param expand: (str) – Expands referenced resources.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param context: (ClientContext) – subscription/cloud to run against.
+    :return: dict or bytes
+    :raises: CloudError
+    """
+    _check_output(output)
+    operations = clients.get_operations(rtype, context)
+    resolved = clients.resolve_context(context)
+
+    url = operations._client.format_url(
+        resource_id(rtype, resolved.subscription_id, key)
+        .replace('{', '{{').replace('}', '}}'))
+    query = {'api-version': operations.api_version}
+    if expand is not None and rtype.get_expand:
+        query['$expand'] = expand
+
+    content = _send(operations, url, query, custom_headers).content
+    return content if output == BYTES else json.loads(content.decode('utf-8'))
+
+
+class JsonPages(object):
+    """
+    A list collection fetched page by page as JSON, following nextLink.
+    Exposes advance_page() like msrest's Paged, so paging.iter_pages can
+    stream and prefetch it.
+
+    In 'json' mode each page is the list of resource dicts; in 'bytes' mode
+    each page is a one-item list holding the page's raw body.
+
+    :param operations: operations group of the resource family.
+    :param url: (str) – URL of the first page.
+    :param output: (str) – 'json' or 'bytes'.
+    :param custom_headers: (dict) – headers that will be added to the request
+    """
+
+    def __init__(self, operations, url, output=JSON, custom_headers=None):
+        self.operations = operations
+        self.next_link = url
+        self.output = output
+        self.custom_headers = custom_headers
+        self._first = True
+
+    def advance_page(self):
+        if self.next_link is None:
+            raise StopIteration('End of paging')
+
+        query = {}
+        if self._first:
+            query['api-version'] = self.operations.api_version
+            self._first = False
+        content = _send(self.operations, self.next_link, query,
+                        self.custom_headers).content
+
+        # nextLink is needed even in bytes mode to find the next page
+        page = json.loads(content.decode('utf-8'))
+        self.next_link = page.get('nextLink')
+        return [content] if self.output == BYTES else page.get('value', [])
+
+
+def pages(rtype, key, output=JSON, custom_headers=None, context=None):
+    """
+    The list collection of a resource family as JsonPages.
+
+    :param rtype: (ResourceType) – the resource family.
+    :param key: (tuple) – the names of the parent: () for resource groups,
+        (group,) for top-level resources, (group, parent) for children.
+    :param output: (str) – 'json' or 'bytes'.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param context: (ClientContext) – subscription/cloud to run against.
+    :return: JsonPages
+    """
+    _check_output(output)
+    operations = clients.get_operations(rtype, context)
+    resolved = clients.resolve_context(context)
+
+    url = operations._client.format_url(
+        _list_path(rtype, resolved.subscription_id, key)
+        .replace('{', '{{').replace('}', '}}'))
+    return JsonPages(operations, url, output, custom_headers)
+
+
+def _sample_page(count):
+    # a list page shaped like ARM's network interfaces response
+    prefix = ('/subscriptions/00000000-0000-0000-0000-000000000000'
+              '/resourceGroups/group/providers/Microsoft.Network')
+    return json.dumps({'value': [{
+        'id': '{}/networkInterfaces/nic{}'.format(prefix, i),
+        'name': 'nic{}'.format(i),
+        'etag': 'W/"{}"'.format(uuid.uuid4()),
+        'location': 'usgovvirginia',
+        'tags': {'team': 'network'},
+        'properties': {
+            'provisioningState': 'Succeeded',
+            'resourceGuid': str(uuid.uuid4()),
+            'enableIPForwarding': False,
+            'enableAcceleratedNetworking': False,
+            'ipConfigurations': [{
+                'id': '{}/networkInterfaces/nic{}/ipConfigurations/ipconfig1'
+                      .format(prefix, i),
+                'name': 'ipconfig1',
+                'properties': {
+                    'provisioningState': 'Succeeded',
+                    'privateIPAddress': '10.0.{}.{}'.format(i // 250, i % 250),
+                    'privateIPAllocationMethod': 'Dynamic',
+                    'privateIPAddressVersion': 'IPv4',
+                    'primary': True,
+                    'subnet': {'id': '{}/virtualNetworks/vnet/subnets/default'
+                                     .format(prefix)},
+                },
+            }],
+            'dnsSettings': {'dnsServers': [], 'appliedDnsServers': []},
+        },
+    } for i in range(count)]}).encode('utf-8')
+
+
+def _measure(function):
+    # timed and traced in separate runs, since tracing slows allocation
+    started = time.process_time()
+    function()
+    cpu = time.process_time() - started
+
+    tracemalloc.start()
+    result = function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, cpu, peak
+
+
+def benchmark(resources=10000):
+    """
+    Compare turning one list response of network interfaces into models
+    against parsing it as JSON or leaving it as bytes. No request is sent.
+
+    :param resources: (int) – resources in the sample response.
+    :return: dict of {'model'|'json'|'bytes': {'cpu_seconds', 'peak_bytes'}}
+    """
+    from azure.mgmt.network import models
+    from msrest import Deserializer
+
+    content = _sample_page(resources)
+    deserializer = Deserializer(
+        {name: value for name, value in vars(models).items()
+         if isinstance(value, type)})
+
+    def as_models():
+        page = json.loads(content.decode('utf-8'))
+        return [deserializer('NetworkInterface', value)
+                for value in page['value']]
+
+    def as_json():
+        return json.loads(content.decode('utf-8'))['value']
+
+    results = {}
+    for output, function in ((MODEL, as_models), (JSON, as_json),
+                             (BYTES, lambda: content)):
+        _, cpu, peak = _measure(function)
+        results[output] = {'cpu_seconds': cpu, 'peak_bytes': peak}
+
+    return results
@@ -0,0 +1,460 @@
+#!/usr/bin/python3
+#
+# lro.py
+#
+# Long-running ARM operations that are polled one step at a time by the
+# caller instead of by a dedicated thread per operation.
+#
+# This reaches into the SDK: the operations groups' _*_initial methods,
+# _client and _deserialize, and ARMPolling's _operation and _response. They
+# exist from azure-mgmt-network 2.0 and msrestazure 0.4.20 to before
+# azure-mgmt-network 16; see requirements.txt.
+
+import queue
+import threading
+import time
+
+import operations.authenticate_user as clients
+import operations.circuit_breaker as circuit_breaker
+import operations.conflict_retry as conflict_retry
+import operations.lro_scheduler as lro_scheduler
+import operations.metrics as metrics
+
+# Seconds between status checks when ARM does not send Retry-After; matches
+# the SDK's long_running_operation_timeout default.
+DEFAULT_POLL_INTERVAL = 30
+
+# Seconds polls may keep failing without reaching ARM (connection errors,
+# timeouts, open circuits) before the operation is failed with the last
+# error, so waiters and the write locks held for it are released.
+DEFAULT_ERROR_TIMEOUT = 300
+
+
+class ArmOperation(object):
+    """
+    Handle on one long-running operation.
+
+    Each poll() sends at most one status request, so any scheduler (a thread,
+    an event loop) can drive many operations without a thread apiece.
+
+    :param client: (ServiceClient) – the operations group's _client.
+    :param initial_response: (requests.Response) – response to the PUT,
+        POST or DELETE that started the operation.
+    :param deserialization_callback: (callable) – turns the final response
+        into the resource model.
+    :param interval: (int) – Seconds between polls when ARM sends no
+        Retry-After header.
+    :param kind: (str) – resource family name, e.g. 'subnets'.
+    :param error_timeout: (float) – Seconds of consecutive failed polls
+        after which the operation fails.
+    """
+
+    def __init__(self, client, initial_response, deserialization_callback,
+                 interval=DEFAULT_POLL_INTERVAL, kind=None,
+                 error_timeout=DEFAULT_ERROR_TIMEOUT):
+        from msrestazure.polling.arm_polling import ARMPolling
+
+        self.interval = interval
+        self.kind = kind
+        self.error_timeout = error_timeout
+        self.polls = 0
+        # Set by a PollingScheduler that has taken over polling
+        self.scheduled = False
+        self.finished_event = threading.Event()
+        self._finished = False
+        self._exception = None
+        self._failing_since = None
+        self._polling = ARMPolling(interval)
+        self._run(self._polling.initialize, client, initial_response,
+                  deserialization_callback)
+
+    def _run(self, step, *args):
+        from msrestazure import azure_exceptions
+        from msrestazure.polling import arm_polling
+
+        polling = self._polling
+        try:
+            step(*args)
+            self._failing_since = None
+            if polling.finished():
+                self._finish()
+
+        except arm_polling.BadStatus:
+            polling._operation.status = 'Failed'
+            self._fail(azure_exceptions.CloudError(polling._response))
+        except arm_polling.BadResponse as err:
+            polling._operation.status = 'Failed'
+            self._fail(azure_exceptions.CloudError(polling._response, str(err)))
+        except arm_polling.OperationFailed:
+            self._fail(azure_exceptions.CloudError(polling._response))
+        except azure_exceptions.CloudError as e:
+            self._fail(e)
+        except Exception as e:
+            # the request never got an answer from ARM; poll again until
+            # that has gone on for error_timeout seconds
+            now = time.time()
+            if self._failing_since is None:
+                self._failing_since = now
+            if now - self._failing_since < self.error_timeout:
+                raise
+            metrics.increment('lro_poll_failures')
+            self._fail(e)
+
+    def _fail(self, exception):
+        self._exception = exception
+        self._finished = True
+        self.finished_event.set()
+
+    def _finish(self):
+        from msrestazure.polling import arm_polling
+
+        polling = self._polling
+        operation = polling._operation
+        if arm_polling.failed(operation.status):
+            raise arm_polling.OperationFailed('Operation failed or cancelled')
+
+        if operation.should_do_final_get():
+            if operation.method == 'POST' and operation.location_url:
+                final_get_url = operation.location_url
+            else:
+                final_get_url = operation.initial_response.request.url
+            polling._response = polling.request_status(final_get_url)
+            operation.get_status_from_resource(polling._response)
+
+        self._finished = True
+        self.finished_event.set()
+
+    def poll(self):
+        """
+        Send one status request unless the operation has already finished.
+
+        :return: (bool) whether the operation has finished
+        :raises: the transport error of a poll that did not reach ARM, until
+            they have gone on for error_timeout seconds
+        """
+        if not self._finished:
+            self.polls += 1
+            self._run(self._polling.update_status)
+
+        return self._finished
+
+    def retry_after(self):
+        """
+        The Retry-After header of the last response, in seconds.
+
+        :return: float or None
+        """
+        response = self._polling._response
+        retry_after = getattr(response, 'headers', {}).get('retry-after')
+        try:
+            return max(float(retry_after), 0)
+        except (TypeError, ValueError):
+            return None
+
+    def delay(self):
+        """
+        Seconds to wait before the next poll: the Retry-After header of the
+        last response, or the default interval.
+
+        :return: float
+        """
+        retry_after = self.retry_after()
+        return self.interval if retry_after is None else retry_after
+
+    def done(self):
+        """
+        :return: (bool) whether the operation has finished
+        """
+        return self._finished
+
+    def status(self):
+        """
+        :return: (str) the last provisioning status reported by ARM
+        """
+        return self._polling.status()
+
+    def wait(self, timeout=None):
+        """
+        Wait for the operation to finish, polling on the calling thread
+        unless a scheduler is already polling it.
+
+        :param timeout: (float) – Seconds to wait, or None to wait forever.
+        :return: (bool) whether the operation has finished
+        """
+        if self.scheduled:
+            return self.finished_event.wait(timeout)
+
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            try:
+                if self.poll():
+                    break
+            except Exception as e:
+                print(e)
+
+            delay = self.delay()
+            if deadline is not None:
+                delay = min(delay, deadline - time.time())
+                if delay <= 0:
+                    return False
+            time.sleep(delay)
+
+        return True
+
+    def result(self, timeout=None):
+        """
+        Wait for the operation and return the final resource.
+
+        :param timeout: (float) – Seconds to wait, or None to wait forever.
+        :return: resource model, or None for deletes
+        :raises: CloudError
+        """
+        self.wait(timeout)
+        if self._exception is not None:
+            raise self._exception
+
+        return self._polling.resource()
+
+    def exception(self):
+        """
+        :return: (CloudError) the failure, or None
+        """
+        return self._exception
+
+    @property
+    def response(self):
+        """
+        The last HTTP response: the final GET or status check once finished.
+        """
+        return self._polling._response
+
+
+class CompletedOperation(object):
+    """
+    Handle for an operation that finished, or failed, when it was started:
+    creates that are not long-running, and requests rejected up front.
+
+    :param resource: the resulting resource model, if any.
+    :param exception: (CloudError or CircuitOpenError) – the failure, if
+        any.
+    """
+
+    polls = 0
+
+    def __init__(self, resource=None, exception=None):
+        self._resource = resource
+        self._exception = exception
+
+    def poll(self):
+        return True
+
+    def delay(self):
+        return 0
+
+    def done(self):
+        return True
+
+    def status(self):
+        return 'Failed' if self._exception is not None else 'Succeeded'
+
+    def wait(self, timeout=None):
+        return True
+
+    def result(self, timeout=None):
+        if self._exception is not None:
+            raise self._exception
+
+        return self._resource
+
+    def exception(self):
+        return self._exception
+
+
+class _PollerOperation(object):
+    # Adapts an SDK poller (AzureOperationPoller/LROPoller), which polls on
+    # its own thread, to the ArmOperation interface.
+
+    polls = 0
+
+    def __init__(self, poller, interval=1):
+        self._poller = poller
+        self.interval = interval
+
+    def poll(self):
+        return self._poller.done()
+
+    def delay(self):
+        return self.interval
+
+    def done(self):
+        return self._poller.done()
+
+    def status(self):
+        return self._poller.status()
+
+    def wait(self, timeout=None):
+        self._poller.wait(timeout)
+        return self._poller.done()
+
+    def result(self, timeout=None):
+        return self._poller.result(timeout)
+
+    def exception(self):
+        from msrestazure import azure_exceptions
+
+        try:
+            self._poller.result(0)
+        except azure_exceptions.CloudError as e:
+            return e
+
+
+def provisioning_state(resource):
+    """
+    Provisioning state of a resource model; resource groups keep theirs
+    under properties.
+
+    :param resource: resource model.
+    :return: str
+    """
+    state = getattr(resource, 'provisioning_state', None)
+    if state is None:
+        state = resource.properties.provisioning_state
+    return state
+
+
+def _as_operation(handle):
+    if hasattr(handle, 'poll'):
+        return handle
+
+    return _PollerOperation(handle)
+
+
+def begin(rtype, verb, key, parameters=None, custom_headers=None,
+          context=None, interval=DEFAULT_POLL_INTERVAL, schedule=True):
+    """
+    Send the request that starts a create/update or delete and return a
+    handle to poll it, without waiting.
+
+    :param rtype: (ResourceType) – the resource family.
+    :param verb: (str) – 'create_update' or 'delete'.
+    :param key: (tuple) – resource group name followed by resource names.
+    :param parameters: resource parameters for 'create_update'.
+    :param custom_headers: (dict) – headers that will be added to the request
+    :param context: (ClientContext) – subscription/cloud to run against.
+    :param interval: (int) – default seconds between polls.
+    :param schedule: (bool) – hand polling to the process-wide
+        PollingScheduler; pass False to poll the handle yourself.
+    :return: ArmOperation, or CompletedOperation when the create is not
+        long-running, the request was rejected or the endpoint's circuit
+        breaker is open
+
+    A request rejected because another operation holds the resource or its
+    parent is resent after a jittered backoff, as conflict_retry.default()
+    allows.
+    """
+    from msrestazure import azure_exceptions
+
+    policy = conflict_retry.default()
+    attempt = 0
+    while True:
+        try:
+            operation = _begin(rtype, verb, key, parameters, custom_headers,
+                               context, interval)
+            break
+
+        except azure_exceptions.CloudError as e:
+            if not policy.retries(e, attempt):
+                return CompletedOperation(exception=e)
+
+            metrics.increment('write_conflict_retries')
+            time.sleep(policy.delay(attempt, e))
+            attempt += 1
+
+        except circuit_breaker.CircuitOpenError as e:
+            return CompletedOperation(exception=e)
+
+    if schedule:
+        lro_scheduler.default().submit(operation, rtype.name)
+
+    return operation
+
+
+def _begin(rtype, verb, key, parameters, custom_headers, context, interval):
+    operations = clients.get_operations(rtype, context)
+
+    if verb != 'delete' and not rtype.lro_create:
+        return CompletedOperation(getattr(operations, rtype.create_method)(
+            *(tuple(key) + (parameters,)), custom_headers=custom_headers))
+
+    if verb == 'delete':
+        initial = operations._delete_initial(
+            *key, custom_headers=custom_headers, raw=True)
+        deserialize = lambda response: None
+    else:
+        start = getattr(operations, '_{}_initial'.format(rtype.create_method))
+        initial = start(*(tuple(key) + (parameters,)),
+                        custom_headers=custom_headers, raw=True)
+        deserialize = lambda response: operations._deserialize(
+            rtype.model, response)
+
+    return ArmOperation(operations._client, initial.response, deserialize,
+                        interval, rtype.name)
+
+
+def as_completed(handles, timeout=None):
+    """
+    Wait for many operations and yield each one as it finishes, fastest
+    first.
+
+    Polling is left to the process-wide PollingScheduler, which multiplexes
+    every outstanding operation on one timer queue.
+
+    :param handles: (list) – ArmOperation handles from no_wait=True calls, or
+        SDK pollers.
+    :param timeout: (float) – Seconds to wait overall, or None to wait
+        forever.
+    :return: generator of finished handles
+    :raises: TimeoutError when the timeout expires first
+    """
+    handles = list(handles)
+    deadline = None if timeout is None else time.time() + timeout
+    finished = queue.Queue()
+    scheduler = lro_scheduler.default()
+
+    for handle in handles:
+        scheduler.submit(_as_operation(handle),
+                         callback=lambda operation, handle=handle:
+                         finished.put(handle))
+
+    for remaining in range(len(handles), 0, -1):
+        try:
+            wait = None if deadline is None else max(deadline - time.time(), 0)
+            yield finished.get(timeout=wait)
+        except queue.Empty:
+            raise TimeoutError('{} operations still running'.format(remaining))
+
+
+def wait_all(handles, timeout=None):
+    """
+    Wait for many operations at once; total wall time is roughly that of the
+    slowest one.
+
+    :param handles: (list) – ArmOperation handles from no_wait=True calls, or
+        SDK pollers.
+    :param timeout: (float) – Seconds to wait overall, or None to wait
+        forever.
+    :return: list of (result, exception) pairs in the order of handles
+    :raises: TimeoutError when the timeout expires first
+    """
+    handles = list(handles)
+    for _ in as_completed(handles, timeout):
+        pass
+
+    outcomes = []
+    for handle in handles:
+        operation = _as_operation(handle)
+        exception = operation.exception()
+        outcomes.append(
+            (None if exception is not None else operation.result(), exception))
+
+    return outcomes
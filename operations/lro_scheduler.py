@@ -0,0 +1,230 @@
+#!/usr/bin/python3
+#
+# lro_scheduler.py
+#
+# One process-wide scheduler that polls every outstanding long-running
+# operation, instead of one polling thread per operation.
+
+import heapq
+import itertools
+import math
+import threading
+import time
+import traceback
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+import operations.metrics as metrics
+
+PollingProfile = namedtuple('PollingProfile', ['initial', 'maximum', 'factor'])
+
+# Gateways and circuits take tens of minutes; child resources seconds.
+SLOW = PollingProfile(30, 120, 1.5)
+FAST = PollingProfile(2, 15, 1.5)
+DEFAULT_PROFILE = PollingProfile(5, 60, 1.5)
+
+POLLING_PROFILES = {
+    'virtual_network_gateways': SLOW,
+    'virtual_network_gateway_connections': SLOW,
+    'express_route_circuits': SLOW,
+    'application_gateways': SLOW,
+    'subnets': FAST,
+    'routes': FAST,
+    'security_rules': FAST,
+    'route_filter_rules': FAST,
+    'virtual_network_peerings': FAST,
+    'express_route_circuit_authorizations': FAST,
+}
+
+# Interval a per-operation poller would use, for the "polls saved" count.
+BASELINE_INTERVAL = 10
+
+DEFAULT_WORKERS = 4
+
+_default = None
+_default_lock = threading.Lock()
+
+
+class _Entry(object):
+
+    def __init__(self, operation, profile):
+        self.operation = operation
+        self.profile = profile
+        self.interval = profile.initial
+        self.started = time.time()
+        self.status = _status(operation)
+        self.callbacks = []
+
+
+def _status(operation):
+    status = getattr(operation, 'status', None)
+    return status() if status is not None else None
+
+
+class PollingScheduler(object):
+    """
+    Polls many operations from one timer queue.
+
+    Each operation is due at most once per interval. The interval starts
+    from the family's PollingProfile and grows by its factor after every
+    unfinished poll up to the maximum, and starts over whenever the
+    operation's status changes. A Retry-After header, when ARM sends one,
+    is used as the wait instead. Status requests are sent from a small
+    worker pool, so one slow response does not hold up the rest. A
+    callback that raises is reported and counted in lro_callback_errors.
+
+    :param workers: (int) – threads used to send status requests.
+    :param baseline_interval: (int) – interval of the per-operation pollers
+        this replaces, used to report how many polls were saved.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS,
+                 baseline_interval=BASELINE_INTERVAL):
+        self.workers = workers
+        self.baseline_interval = baseline_interval
+        self._condition = threading.Condition()
+        self._queue = []
+        self._entries = {}
+        self._sequence = itertools.count()
+        self._thread = None
+        self._executor = None
+
+    def _start(self):
+        if self._thread is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix='cumulus-lro-poll')
+            self._thread = threading.Thread(
+                target=self._run, name='cumulus-lro-scheduler')
+            self._thread.daemon = True
+            self._thread.start()
+
+    def _push(self, entry, delay):
+        heapq.heappush(self._queue,
+                       (time.time() + delay, next(self._sequence), entry))
+        self._condition.notify()
+
+    def _next_delay(self, entry):
+        retry_after = getattr(entry.operation, 'retry_after', lambda: None)()
+        return entry.interval if retry_after is None else retry_after
+
+    def submit(self, operation, kind=None, callback=None):
+        """
+        Take over polling of an operation.
+
+        :param operation: (ArmOperation) – handle from lro.begin(), or any
+            object with poll() and done().
+        :param kind: (str) – resource family name, e.g. 'subnets', used to
+            pick the polling profile.
+        :param callback: (callable) – called with the operation once it has
+            finished.
+        :return: the operation
+        """
+        with self._condition:
+            entry = self._entries.get(id(operation))
+            if entry is None:
+                if operation.done():
+                    if callback is not None:
+                        callback(operation)
+                    return operation
+
+                kind = kind or getattr(operation, 'kind', None)
+                entry = _Entry(operation,
+                               POLLING_PROFILES.get(kind, DEFAULT_PROFILE))
+                self._entries[id(operation)] = entry
+                operation.scheduled = True
+                self._start()
+                self._push(entry, self._next_delay(entry))
+
+            if callback is not None:
+                entry.callbacks.append(callback)
+
+        return operation
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue or self._queue[0][0] > time.time():
+                    timeout = self._queue[0][0] - time.time() if self._queue else None
+                    self._condition.wait(timeout)
+
+                due = []
+                while self._queue and self._queue[0][0] <= time.time():
+                    due.append(heapq.heappop(self._queue)[2])
+
+            for entry in due:
+                self._executor.submit(self._poll, entry)
+
+    def _poll(self, entry):
+        try:
+            finished = entry.operation.poll()
+        except Exception as e:
+            # ArmOperation fails itself once errors outlast its error_timeout
+            print(e)
+            finished = entry.operation.done()
+        metrics.increment('lro_polls')
+
+        with self._condition:
+            if not finished:
+                status = _status(entry.operation)
+                if status != entry.status:
+                    entry.status = status
+                    entry.interval = entry.profile.initial
+                else:
+                    entry.interval = min(entry.interval * entry.profile.factor,
+                                         entry.profile.maximum)
+                self._push(entry, self._next_delay(entry))
+                return
+
+            del self._entries[id(entry.operation)]
+            callbacks = entry.callbacks
+
+        elapsed = time.time() - entry.started
+        baseline = int(math.ceil(elapsed / self.baseline_interval))
+        metrics.increment('lro_completed')
+        metrics.increment('lro_polls_saved',
+                          max(baseline - getattr(entry.operation, 'polls', 0), 0))
+
+        for callback in callbacks:
+            try:
+                callback(entry.operation)
+            except Exception:
+                # nothing waits on the worker's result, so say so here
+                metrics.increment('lro_callback_errors')
+                traceback.print_exc()
+
+    def pending(self):
+        """
+        :return: (int) number of operations still being polled
+        """
+        with self._condition:
+            return len(self._entries)
+
+    def stats(self):
+        """
+        Polling totals: requests sent, operations completed, the status
+        requests saved against per-operation polling and the callbacks that
+        raised.
+
+        :return: dict
+        """
+        return {'pending': self.pending(),
+                'polls': metrics.counter('lro_polls'),
+                'completed': metrics.counter('lro_completed'),
+                'polls_saved': metrics.counter('lro_polls_saved'),
+                'callback_errors': metrics.counter('lro_callback_errors')}
+
+
+def default():
+    """
+    The process-wide scheduler.
+
+    :return: PollingScheduler
+    """
+    global _default
+
+    with _default_lock:
+        if _default is None:
+            _default = PollingScheduler()
+
+        return _default
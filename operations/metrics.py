@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+#
+# metrics.py
+#
+# Process-wide counters and timings recorded by the cumulus helpers.
+
+import threading
+
+_lock = threading.Lock()
+_counters = {}
+_timings = {}
+
+
+def increment(name, value=1):
+    """
+    Add value to the named counter.
+
+    :param name: (str) – counter name.
+    :param value: (int) – amount to add.
+    :return: none
+    """
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def record(name, value):
+    """
+    Record one sample of the named timing, in seconds.
+
+    :param name: (str) – timing name.
+    :param value: (float) – sample value.
+    :return: none
+    """
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            _timings[name] = {'count': 1, 'total': value, 'min': value,
+                              'max': value, 'last': value}
+        else:
+            timing['count'] += 1
+            timing['total'] += value
+            timing['min'] = min(timing['min'], value)
+            timing['max'] = max(timing['max'], value)
+            timing['last'] = value
+
+
+def counter(name):
+    """
+    Current value of the named counter.
+
+    :param name: (str) – counter name.
+    :return: int
+    """
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot():
+    """
+    Copy of every counter and timing recorded so far.
+
+    :return: dict with 'counters' and 'timings' entries
+    """
+    with _lock:
+        return {'counters': dict(_counters),
+                'timings': dict((k, dict(v)) for k, v in _timings.items())}
+
+
+def reset():
+    """
+    Clear every counter and timing.
+
+    :return: none
+    """
+    with _lock:
+        _counters.clear()
+        _timings.clear()
@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+#
+# paging.py
+#
+# Streams the resources of an msrest Paged collection one page at a time,
+# fetching the next page in the background while the caller works through
+# the current one.
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Threads used to prefetch pages, shared by every list_* generator.
+DEFAULT_WORKERS = 4
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _prefetcher():
+    global _executor
+
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=DEFAULT_WORKERS,
+                thread_name_prefix='cumulus-page')
+
+        return _executor
+
+
+def _next_page(paged):
+    try:
+        return paged.advance_page()
+    except StopIteration:
+        return None
+
+
+def iter_pages(paged, prefetch=True):
+    """
+    Yield every resource of a Paged collection.
+
+    At most the current page and the one being prefetched are held, so
+    memory stays constant however many resources the collection has. No
+    request is sent until the first resource is asked for.
+
+    :param paged: (msrest.paging.Paged) – collection returned by an SDK
+        list() call.
+    :param prefetch: (bool) – fetch the next page while the current one is
+        consumed.
+    :return: generator of the collection's models
+    :raises: CloudError
+    """
+    page = _next_page(paged)
+    while page is not None:
+        upcoming = _prefetcher().submit(_next_page, paged) if prefetch else None
+
+        for resource in page:
+            yield resource
+
+        page = upcoming.result() if prefetch else _next_page(paged)
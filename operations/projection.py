@@ -0,0 +1,112 @@
+#!/usr/bin/python3
+#
+# projection.py
+#
+# Field-projected reads: get_*/list_* called with fields=[...] pull only
+# those values out of the JSON response into small namedtuple records,
+# instead of building the full msrest model tree.
+#
+#     nics = cumulus.list_network_interfaces(
+#         GROUP_NAME, fields=['id', 'name', 'provisioning_state'])
+#     for nic in nics:
+#         print(nic.name, nic.provisioning_state)
+#
+# A field is a dotted path into the ARM resource. Segments may be written
+# as in the REST API (addressPrefix) or as in the SDK models
+# (address_prefix), and a path that is not found at the top level is looked
+# up under 'properties', so 'provisioning_state' and
+# 'properties.provisioningState' name the same value. Record attributes are
+# the snake_case path without the 'properties' prefix: 'subnet.id' becomes
+# record.subnet_id.
+
+import re
+import threading
+from collections import namedtuple
+
+_MISSING = object()
+_SNAKE = re.compile(r'(?<=[a-z0-9])([A-Z])')
+
+_lock = threading.Lock()
+_projections = {}
+
+
+def _camel(segment):
+    head, _, tail = segment.partition('_')
+    if not tail:
+        return segment
+    return head + ''.join(word[:1].upper() + word[1:]
+                          for word in tail.split('_'))
+
+
+def _snake(segment):
+    return _SNAKE.sub(r'_\1', segment).lower()
+
+
+def _lookup(document, path):
+    value = document
+    for segment in path:
+        if not isinstance(value, dict):
+            return _MISSING
+        value = value.get(segment, _MISSING)
+        if value is _MISSING:
+            return _MISSING
+
+    return value
+
+
+class Projection(object):
+    """
+    A compiled field selector.
+
+    :param fields: (list) – dotted field paths, e.g.
+        ['id', 'provisioning_state', 'properties.addressPrefix'].
+    """
+
+    def __init__(self, fields):
+        self.fields = tuple(fields)
+        self._paths = []
+        names = []
+        for field in self.fields:
+            segments = tuple(_camel(segment) for segment in field.split('.'))
+            if segments[0] == 'properties':
+                self._paths.append((segments,))
+                segments = segments[1:]
+            else:
+                self._paths.append((segments, ('properties',) + segments))
+            names.append('_'.join(_snake(segment) for segment in segments))
+
+        self.record = namedtuple('Record', names, rename=True)
+
+    def __call__(self, document):
+        """
+        Extract the fields of one resource.
+
+        :param document: (dict) – the resource as returned by ARM.
+        :return: Record, with None for fields the resource does not have
+        """
+        values = []
+        for candidates in self._paths:
+            value = _MISSING
+            for path in candidates:
+                value = _lookup(document, path)
+                if value is not _MISSING:
+                    break
+            values.append(None if value is _MISSING else value)
+
+        return self.record._make(values)
+
+
+def compiled(fields):
+    """
+    The Projection for fields, compiled once per distinct selector.
+
+    :param fields: (list) – dotted field paths.
+    :return: Projection
+    """
+    key = tuple(fields)
+    with _lock:
+        projection = _projections.get(key)
+        if projection is None:
+            projection = _projections[key] = Projection(key)
+
+        return projection
@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+#
+# provider_registration.py
+#
+# Resource provider registration with a locally persisted, TTL-bound view of
+# each subscription's registration state.
+
+import json
+import os
+import time
+
+from operations.token_cache import file_lock, write_json
+
+DEFAULT_STATE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cumulus', 'provider_state.json')
+
+# Registration state rarely changes; re-check once a day.
+DEFAULT_TTL = 24 * 60 * 60
+
+REGISTERED = 'Registered'
+
+
+class RegistrationManager(object):
+    """
+    Registers resource provider namespaces for a subscription, skipping the
+    ARM calls entirely while the cached state says they are registered.
+
+    :param resource_client: (ResourceManagementClient) – client bound to the
+        subscription.
+    :param subscription_id: (str) – The subscription the state belongs to.
+    :param ttl: (int) – Seconds a cached registration state stays valid.
+    :param path: (str) – Location of the state file.
+    """
+
+    def __init__(self, resource_client, subscription_id, ttl=DEFAULT_TTL,
+                 path=DEFAULT_STATE_PATH):
+        self.resource_client = resource_client
+        self.subscription_id = subscription_id
+        self.ttl = ttl
+        self.path = path
+
+    def _read(self):
+        try:
+            with open(self.path) as state_file:
+                return json.load(state_file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        write_json(self.path, entries)
+
+    def cached_states(self):
+        """
+        Registration states for this subscription that are still within the
+        TTL.
+
+        :return: dict of namespace to registration state
+        """
+        now = time.time()
+        entries = self._read().get(self.subscription_id, {})
+        return dict((namespace, entry['state'])
+                    for namespace, entry in entries.items()
+                    if entry.get('checked_at', 0) + self.ttl > now)
+
+    def _store(self, states):
+        with file_lock(self.path):
+            entries = self._read()
+            subscription = entries.setdefault(self.subscription_id, {})
+            now = time.time()
+            for namespace, state in states.items():
+                subscription[namespace] = {'state': state, 'checked_at': now}
+            self._write(entries)
+
+    def ensure_registered(self, namespaces):
+        """
+        Make sure every namespace is registered.
+
+        Namespaces with a fresh 'Registered' entry cost nothing. The rest are
+        checked with a single providers.list() call, and only those that are
+        not yet registered are sent a register request.
+
+        :param namespaces: (list) – provider namespaces, e.g.
+            ['Microsoft.Network'].
+        :return: dict of namespace to registration state
+        """
+        cached = self.cached_states()
+        pending = [namespace for namespace in namespaces
+                   if cached.get(namespace) != REGISTERED]
+        if not pending:
+            return dict((namespace, REGISTERED) for namespace in namespaces)
+
+        current = dict((provider.namespace, provider.registration_state)
+                       for provider in self.resource_client.providers.list())
+
+        states = {}
+        for namespace in pending:
+            state = current.get(namespace)
+            if state != REGISTERED:
+                provider = self.resource_client.providers.register(namespace)
+                state = provider.registration_state
+            states[namespace] = state
+
+        self._store(states)
+
+        cached.update(states)
+        return dict((namespace, cached[namespace]) for namespace in namespaces)
+
+    def invalidate(self):
+        """
+        Forget the cached state for this subscription.
+
+        :return: none
+        """
+        with file_lock(self.path):
+            entries = self._read()
+            entries.pop(self.subscription_id, None)
+            self._write(entries)
@@ -0,0 +1,297 @@
+#!/usr/bin/python3
+#
+# rate_limiter.py
+#
+# Process-wide client-side throttling of ARM requests. Every request made
+# through the shared sessions takes a token from its subscription's read,
+# write or delete bucket first, so parallel cumulus calls slow down before
+# ARM starts answering 429.
+
+import re
+import threading
+import time
+from collections import namedtuple
+
+import operations.metrics as metrics
+
+READ = 'read'
+WRITE = 'write'
+DELETE = 'delete'
+
+Budget = namedtuple('Budget', ['capacity', 'rate'])
+
+# ARM's per-subscription buckets: burst size and tokens refilled per second.
+DEFAULT_BUDGETS = {
+    READ: Budget(250, 25),
+    WRITE: Budget(200, 10),
+    DELETE: Budget(200, 10),
+}
+
+REMAINING_HEADERS = {
+    READ: 'x-ms-ratelimit-remaining-subscription-reads',
+    WRITE: 'x-ms-ratelimit-remaining-subscription-writes',
+    DELETE: 'x-ms-ratelimit-remaining-subscription-deletes',
+}
+
+# Tokens left unspent for other clients sharing the subscription.
+DEFAULT_RESERVE = 5
+
+# Pause after a 429 that carries no Retry-After.
+DEFAULT_BACKOFF = 5
+
+# Refill-rate estimates are taken over at least this many seconds, weighted
+# by SMOOTHING against the previous rate, and never drop below MIN_RATE.
+CALIBRATION_INTERVAL = 1.0
+SMOOTHING = 0.3
+MIN_RATE = 0.5
+
+_SUBSCRIPTION = re.compile(r'/subscriptions/([^/?#]+)', re.IGNORECASE)
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def category(method):
+    """
+    Budget an HTTP method draws from.
+
+    :param method: (str) – e.g. 'GET'.
+    :return: READ, WRITE or DELETE
+    """
+    method = method.upper()
+    if method in ('GET', 'HEAD', 'OPTIONS'):
+        return READ
+    if method == 'DELETE':
+        return DELETE
+    return WRITE
+
+
+def subscription_of(url):
+    """
+    :param url: (str) – request URL.
+    :return: (str) lower-cased subscription id, or None for requests outside
+        a subscription (e.g. AAD token requests)
+    """
+    match = _SUBSCRIPTION.search(url)
+    return match.group(1).lower() if match else None
+
+
+class TokenBucket(object):
+    """
+    Holds up to capacity tokens, refilled at rate per second.
+
+    The server's view always wins when it is lower: reported remaining
+    requests cap the local tokens, and a Retry-After empties the bucket until
+    it has passed. While the server's budget is being drained, the refill
+    rate is re-estimated from how fast its remaining count recovers.
+
+    :param capacity: (int) – burst size.
+    :param rate: (float) – tokens added per second.
+    :param reserve: (int) – reported remaining requests not spent locally.
+    """
+
+    def __init__(self, capacity, rate, reserve=DEFAULT_RESERVE):
+        self.capacity = capacity
+        self.rate = rate
+        self.reserve = reserve
+        self.tokens = float(capacity)
+        self.blocked_until = 0
+        self.taken = 0
+        self._updated = time.time()
+        self._sample = None
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """
+        Take one token, sleeping until one is available.
+
+        :return: (float) seconds spent waiting
+        """
+        waited = 0
+        while True:
+            with self._lock:
+                now = time.time()
+                self._refill(now)
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    self.taken += 1
+                    return waited
+
+                delay = max(self.blocked_until - now,
+                            (1 - self.tokens) / self.rate)
+
+            time.sleep(delay)
+            waited += delay
+
+    def observe_remaining(self, remaining):
+        """
+        Calibrate from an x-ms-ratelimit-remaining-* header.
+
+        :param remaining: (int) – requests the server still allows.
+        :return: none
+        """
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            self.capacity = max(self.capacity, remaining)
+            self.tokens = min(self.tokens, max(remaining - self.reserve, 0))
+            self._calibrate(now, remaining)
+
+    def _calibrate(self, now, remaining):
+        if self._sample is None or remaining >= self.capacity / 2:
+            self._sample = (now, remaining, self.taken)
+            return
+
+        then, previous, taken = self._sample
+        elapsed = now - then
+        if elapsed < CALIBRATION_INTERVAL:
+            return
+
+        # what the server refilled = change in remaining + what we spent
+        refilled = remaining - previous + (self.taken - taken)
+        estimate = max(refilled / elapsed, MIN_RATE)
+        self.rate = (1 - SMOOTHING) * self.rate + SMOOTHING * estimate
+        self._sample = (now, remaining, self.taken)
+
+    def pause(self, seconds):
+        """
+        Stop handing out tokens for seconds, e.g. after a 429.
+
+        :param seconds: (float) – the server's Retry-After.
+        :return: none
+        """
+        with self._lock:
+            now = time.time()
+            self._refill(now)
+            self.tokens = 0
+            self.blocked_until = max(self.blocked_until, now + seconds)
+
+
+class RateLimiter(object):
+    """
+    One TokenBucket per subscription and budget (read, write, delete).
+
+    :param budgets: (dict) – Budget per category; defaults to ARM's
+        subscription limits.
+    :param reserve: (int) – reported remaining requests not spent locally.
+    """
+
+    def __init__(self, budgets=None, reserve=DEFAULT_RESERVE):
+        self.budgets = dict(DEFAULT_BUDGETS)
+        self.budgets.update(budgets or {})
+        self.reserve = reserve
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def bucket(self, subscription_id, kind):
+        """
+        :param subscription_id: (str) – lower-cased subscription id.
+        :param kind: (str) – READ, WRITE or DELETE.
+        :return: TokenBucket
+        """
+        with self._lock:
+            bucket = self._buckets.get((subscription_id, kind))
+            if bucket is None:
+                budget = self.budgets[kind]
+                bucket = self._buckets[(subscription_id, kind)] = TokenBucket(
+                    budget.capacity, budget.rate, self.reserve)
+
+            return bucket
+
+    def acquire(self, method, url):
+        """
+        Wait for permission to send a request.
+
+        :param method: (str) – HTTP method.
+        :param url: (str) – request URL.
+        :return: none
+        """
+        subscription_id = subscription_of(url)
+        if subscription_id is None:
+            return
+
+        waited = self.bucket(subscription_id, category(method)).acquire()
+        if waited:
+            metrics.increment('rate_limit_waits')
+            metrics.record('rate_limit_wait_seconds', waited)
+
+    def observe(self, method, url, status_code, headers):
+        """
+        Calibrate from a response's rate-limit headers and Retry-After.
+
+        :param method: (str) – HTTP method of the request.
+        :param url: (str) – request URL.
+        :param status_code: (int) – response status.
+        :param headers: (Mapping) – case-insensitive response headers.
+        :return: none
+        """
+        subscription_id = subscription_of(url)
+        if subscription_id is None:
+            return
+
+        kind = category(method)
+        bucket = self.bucket(subscription_id, kind)
+        remaining = headers.get(REMAINING_HEADERS[kind])
+        if remaining is not None:
+            try:
+                bucket.observe_remaining(int(remaining))
+            except ValueError:
+                pass
+
+        if status_code == 429:
+            metrics.increment('rate_limit_throttled')
+            try:
+                retry_after = float(headers.get('Retry-After'))
+            except (TypeError, ValueError):
+                retry_after = DEFAULT_BACKOFF
+            bucket.pause(retry_after)
+
+    def stats(self):
+        """
+        Tokens left per (subscription, budget), plus wait and 429 counters.
+
+        :return: dict
+        """
+        with self._lock:
+            buckets = dict(self._buckets)
+
+        return {'tokens': {key: int(bucket.tokens)
+                           for key, bucket in buckets.items()},
+                'waits': metrics.counter('rate_limit_waits'),
+                'throttled': metrics.counter('rate_limit_throttled')}
+
+
+def default():
+    """
+    The process-wide limiter used by the shared sessions.
+
+    :return: RateLimiter
+    """
+    global _default
+
+    with _default_lock:
+        if _default is None:
+            _default = RateLimiter()
+
+        return _default
+
+
+def configure(budgets=None, reserve=DEFAULT_RESERVE):
+    """
+    Replace the process-wide limiter.
+
+    :param budgets: (dict) – Budget per category, e.g.
+        {rate_limiter.WRITE: Budget(100, 5)}.
+    :param reserve: (int) – reported remaining requests not spent locally.
+    :return: RateLimiter
+    """
+    global _default
+
+    with _default_lock:
+        _default = RateLimiter(budgets, reserve)
+        return _default
@@ -0,0 +1,257 @@
+#!/usr/bin/python3
+#
+# resource_cache.py
+#
+# Opt-in read-through cache under the cumulus get_* functions, keyed by
+# resource id, with ETag revalidation and invalidation on writes.
+#
+#     import operations.resource_cache as resource_cache
+#     resource_cache.enable(ttl=60)
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+import operations.authenticate_user as clients
+import operations.lro_scheduler as lro_scheduler
+import operations.metrics as metrics
+from operations.resource_types import resource_id
+
+DEFAULT_TTL = 60
+DEFAULT_MAX_ENTRIES = 1024
+
+_cache = None
+_listeners = []
+
+
+class _Entry(object):
+
+    def __init__(self, resource, etag):
+        self.resource = resource
+        self.etag = etag
+        self.stored_at = time.time()
+
+
+class ResourceCache(object):
+    """
+    LRU cache of resources keyed by (cloud, resource id).
+
+    Entries younger than ttl are served directly. Older entries that carry
+    an etag are revalidated with If-None-Match rather than refetched.
+
+    :param ttl: (int) – Seconds an entry is served without revalidation.
+    :param max_entries: (int) – Most entries kept; least recently used
+        entries are evicted first.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+
+    def lookup(self, key):
+        """
+        :param key: (tuple) – (cloud name, lower-cased resource id).
+        :return: (_Entry, fresh) or (None, False)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            self._entries.move_to_end(key)
+
+        return entry, entry.stored_at + self.ttl > time.time()
+
+    def store(self, key, resource):
+        """
+        :param key: (tuple) – (cloud name, lower-cased resource id).
+        :param resource: the resource model returned by get().
+        :return: none
+        """
+        with self._lock:
+            self._entries[key] = _Entry(resource, getattr(resource, 'etag', None))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def touch(self, key):
+        """
+        Mark an entry fresh again after a successful revalidation.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.stored_at = time.time()
+
+    def invalidate(self, key):
+        """
+        Drop a resource, every resource beneath it and every resource above
+        it, since parents embed their children (a VNet lists its subnets).
+
+        :param key: (tuple) – (cloud name, lower-cased resource id).
+        :return: none
+        """
+        cloud, rid = key
+        with self._lock:
+            for cached_cloud, cached_id in list(self._entries):
+                if cached_cloud != cloud:
+                    continue
+                if (cached_id == rid
+                        or cached_id.startswith(rid + '/')
+                        or (rid.startswith(cached_id + '/')
+                            and '/providers/' in cached_id)):
+                    del self._entries[(cached_cloud, cached_id)]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+
+def enable(ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+    """
+    Turn the cache on for every cumulus get_* function. Each read gets its
+    own copy of the cached resource, so callers may change what they get.
+
+    :param ttl: (int) – Seconds an entry is served without revalidation.
+    :param max_entries: (int) – Most entries kept.
+    :return: ResourceCache
+    """
+    global _cache
+
+    _cache = ResourceCache(ttl, max_entries)
+    return _cache
+
+
+def disable():
+    """
+    Turn the cache off and drop its contents.
+
+    :return: none
+    """
+    global _cache
+
+    _cache = None
+
+
+def on_invalidate(callback):
+    """
+    Register callback(key) to run whenever a write invalidates a resource,
+    whether or not the cache itself is enabled.
+
+    :param callback: (callable) – receives the (cloud name, resource id) key.
+    :return: none
+    """
+    if callback not in _listeners:
+        _listeners.append(callback)
+
+
+def _invalidate(key):
+    cache = _cache
+    if cache is not None:
+        cache.invalidate(key)
+    for callback in _listeners:
+        callback(key)
+
+
+def stats():
+    """
+    Hit, miss and revalidation counters.
+
+    :return: dict
+    """
+    return {'entries': len(_cache) if _cache is not None else 0,
+            'hits': metrics.counter('cache_hits'),
+            'misses': metrics.counter('cache_misses'),
+            'revalidations': metrics.counter('cache_revalidations'),
+            'revalidated_unchanged': metrics.counter('cache_not_modified')}
+
+
+def _cache_key(rtype, key, context):
+    context = clients.resolve_context(context)
+    return (context.cloud.name,
+            resource_id(rtype, context.subscription_id, key).lower())
+
+
+def _revalidate(call, entry):
+    from msrestazure import azure_exceptions
+
+    operations = clients.get_operations(call.rtype, call.context)
+    metrics.increment('cache_revalidations')
+    try:
+        return operations.get(
+            *call.key, custom_headers={'If-None-Match': entry.etag})
+
+    except azure_exceptions.CloudError as e:
+        if e.status_code == 304:
+            metrics.increment('cache_not_modified')
+            return entry.resource
+        raise
+
+
+def _read(cache, call, proceed):
+    from msrestazure import azure_exceptions
+
+    key = _cache_key(call.rtype, call.key, call.context)
+    entry, fresh = cache.lookup(key)
+    if entry is not None and fresh:
+        metrics.increment('cache_hits')
+        return copy.deepcopy(entry.resource)
+
+    metrics.increment('cache_misses')
+    resource = None
+    if entry is not None and entry.etag:
+        try:
+            resource = _revalidate(call, entry)
+        except azure_exceptions.CloudError:
+            resource = None
+
+        if resource is entry.resource:
+            cache.touch(key)
+            return copy.deepcopy(resource)
+
+    if resource is None:
+        resource = proceed(call)
+    if resource is not None:
+        cache.store(key, copy.deepcopy(resource))
+
+    return resource
+
+
+def _write(call, proceed):
+    key = _cache_key(call.rtype, call.key, call.context)
+    _invalidate(key)
+    result = proceed(call)
+    _invalidate(key)
+
+    if hasattr(result, 'poll'):
+        lro_scheduler.default().submit(
+            result, callback=lambda operation: _invalidate(key))
+
+    return result
+
+
+def middleware(call, proceed):
+    """
+    Dispatch middleware. While the cache is enabled, plain get calls (no
+    expand, custom_headers or raw) are served from it. Writes drop the
+    resource and its relatives, and again when a no_wait operation
+    finishes, whenever the cache or an on_invalidate listener is active.
+
+    :param call: (dispatch.Call) – the call being made.
+    :param proceed: (callable) – the rest of the chain.
+    """
+    cache = _cache
+    if call.verb == 'get':
+        if cache is None or not call.plain:
+            return proceed(call)
+        return _read(cache, call, proceed)
+
+    if cache is None and not _listeners:
+        return proceed(call)
+    return _write(call, proceed)
@@ -0,0 +1,159 @@
+#!/usr/bin/python3
+#
+# resource_types.py
+#
+# Table of the resource families cumulus manages: which client and
+# operations group serves them, the msrest model they deserialize to, and
+# the ARM path segments that make up their resource ids.
+
+from collections import namedtuple, OrderedDict
+
+NETWORK_PROVIDER = 'Microsoft.Network'
+
+
+class ResourceType(namedtuple('ResourceType', [
+        'name', 'client', 'group', 'model', 'path', 'create_method',
+        'lro_create', 'get_expand'])):
+    """
+    One resource family.
+
+    :param name: (str) – suffix of the cumulus function names, e.g. 'subnets'.
+    :param client: (str) – 'network' or 'resource'.
+    :param group: (str) – operations group on the client, e.g. 'subnets'.
+    :param model: (str) – msrest model name, e.g. 'Subnet'.
+    :param path: (tuple) – ARM type segments below the resource group, e.g.
+        ('virtualNetworks', 'subnets').
+    :param create_method: (str) – 'create_or_update', or 'create' for packet
+        captures.
+    :param lro_create: (bool) – whether the create call is a long-running
+        operation.
+    :param get_expand: (bool) – whether get() accepts expand.
+    """
+
+    @property
+    def key_length(self):
+        """
+        Number of positional name arguments: the resource group plus one per
+        path segment.
+        """
+        return 1 + len(self.path)
+
+    @property
+    def parent(self):
+        """
+        The ResourceType of the parent resource, or None for top-level
+        resources.
+        """
+        if len(self.path) < 2:
+            return None
+
+        for rtype in RESOURCE_TYPES.values():
+            if rtype.path == self.path[:-1]:
+                return rtype
+
+    def function_name(self, verb):
+        """
+        Name of the cumulus function for verb ('create_update', 'get',
+        'delete' or 'list').
+        """
+        return _FUNCTION_NAMES.get((self.name, verb),
+                                   '{}_{}'.format(verb, self.name))
+
+    @property
+    def list_method(self):
+        """
+        Name of the SDK operations method that lists this family within its
+        resource group or parent.
+        """
+        return _LIST_METHODS.get(self.name, 'list')
+
+
+def _network(name, model, path, create_method='create_or_update',
+             lro_create=True, get_expand=False):
+    return ResourceType(name, 'network', name, model, path, create_method,
+                        lro_create, get_expand)
+
+
+RESOURCE_TYPES = OrderedDict((rtype.name, rtype) for rtype in [
+    ResourceType('resource_group', 'resource', 'resource_groups',
+                 'ResourceGroup', (), 'create_or_update', False, False),
+    _network('virtual_networks', 'VirtualNetwork',
+             ('virtualNetworks',), get_expand=True),
+    _network('subnets', 'Subnet',
+             ('virtualNetworks', 'subnets'), get_expand=True),
+    _network('route_tables', 'RouteTable',
+             ('routeTables',), get_expand=True),
+    _network('routes', 'Route',
+             ('routeTables', 'routes')),
+    _network('virtual_network_peerings', 'VirtualNetworkPeering',
+             ('virtualNetworks', 'virtualNetworkPeerings')),
+    _network('local_network_gateways', 'LocalNetworkGateway',
+             ('localNetworkGateways',)),
+    _network('public_ip_addresses', 'PublicIPAddress',
+             ('publicIPAddresses',), get_expand=True),
+    _network('virtual_network_gateways', 'VirtualNetworkGateway',
+             ('virtualNetworkGateways',)),
+    _network('virtual_network_gateway_connections',
+             'VirtualNetworkGatewayConnection',
+             ('connections',)),
+    _network('network_interfaces', 'NetworkInterface',
+             ('networkInterfaces',), get_expand=True),
+    _network('network_security_groups', 'NetworkSecurityGroup',
+             ('networkSecurityGroups',), get_expand=True),
+    _network('security_rules', 'SecurityRule',
+             ('networkSecurityGroups', 'securityRules')),
+    _network('express_route_circuits', 'ExpressRouteCircuit',
+             ('expressRouteCircuits',)),
+    _network('express_route_circuit_authorizations',
+             'ExpressRouteCircuitAuthorization',
+             ('expressRouteCircuits', 'authorizations')),
+    _network('express_route_circuit_peerings', 'ExpressRouteCircuitPeering',
+             ('expressRouteCircuits', 'peerings')),
+    _network('load_balancers', 'LoadBalancer',
+             ('loadBalancers',), get_expand=True),
+    _network('application_gateways', 'ApplicationGateway',
+             ('applicationGateways',)),
+    _network('network_watchers', 'NetworkWatcher',
+             ('networkWatchers',), lro_create=False),
+    _network('packet_captures', 'PacketCaptureResult',
+             ('networkWatchers', 'packetCaptures'), create_method='create'),
+    _network('route_filters', 'RouteFilter',
+             ('routeFilters',), get_expand=True),
+    _network('route_filter_rules', 'RouteFilterRule',
+             ('routeFilters', 'routeFilterRules')),
+])
+
+# Historical cumulus function names that do not follow <verb>_<name>.
+_FUNCTION_NAMES = {
+    ('express_route_circuit_authorizations', 'delete'):
+        'delete_express_route_circuits_authorizations',
+    ('resource_group', 'list'): 'list_resource_groups',
+}
+
+# SDK list methods not called list().
+_LIST_METHODS = {
+    'route_filters': 'list_by_resource_group',
+    'route_filter_rules': 'list_by_route_filter',
+}
+
+
+def resource_id(rtype, subscription_id, key):
+    """
+    Build the ARM resource id for a resource.
+
+    :param rtype: (ResourceType) – the resource family.
+    :param subscription_id: (str) – The subscription id.
+    :param key: (tuple) – resource group name followed by the resource names,
+        as passed to the cumulus functions.
+    :return: str
+    """
+    resource_group_id = '/subscriptions/{}/resourceGroups/{}'.format(
+        subscription_id, key[0])
+    if not rtype.path:
+        return resource_group_id
+
+    return '{}/providers/{}{}'.format(
+        resource_group_id,
+        NETWORK_PROVIDER,
+        ''.join('/{}/{}'.format(segment, name)
+                for segment, name in zip(rtype.path, key[1:])))
@@ -0,0 +1,165 @@
+#!/usr/bin/python3
+#
+# results.py
+#
+# Structured outcomes for cumulus calls. The cumulus functions print a
+# CloudError and return None, which is easy to miss when many calls run at
+# once; capture() runs the same call and returns a Result saying how it
+# went instead:
+#
+#     result = results.capture(cumulus.create_update_subnets,
+#                              GROUP_NAME, VNET_NAME, SUBNET_NAME, parameters)
+#     if not result.ok:
+#         print(result.error_code, result.request_id)
+
+import time
+from collections import namedtuple
+
+import operations.conflict_retry as conflict_retry
+import operations.dispatch as dispatch
+from operations.resource_types import RESOURCE_TYPES
+
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+CANCELLED = 'cancelled'
+
+WRITE_VERBS = ('create_update', 'delete')
+
+_functions = None
+
+
+class Result(namedtuple('Result', [
+        'status', 'value', 'error_code', 'message', 'request_id', 'duration',
+        'exception'])):
+    """
+    How one call went.
+
+    :param status: (str) – SUCCEEDED, FAILED, or, in an ExecutionGroup,
+        SKIPPED (a call it depends on failed) or CANCELLED (stopped by
+        another failure before it started).
+    :param value: the resource (None for deletes, a list for list_*).
+    :param error_code: (str) – ARM error code, e.g.
+        'AnotherOperationInProgress'.
+    :param message: (str) – why it failed or was not run.
+    :param request_id: (str) – x-ms-request-id of the failing or final
+        response, to quote to Azure support.
+    :param duration: (float) – seconds from start to finish.
+    :param exception: (Exception) – the failure, if any.
+    """
+
+    @property
+    def ok(self):
+        """
+        Whether the call succeeded.
+        """
+        return self.status == SUCCEEDED
+
+    def unwrap(self):
+        """
+        :return: the value of a successful call
+        :raises: the failure, or RuntimeError for a call that was not run
+        """
+        if self.exception is not None:
+            raise self.exception
+        if not self.ok:
+            raise RuntimeError('{}: {}'.format(self.status, self.message))
+
+        return self.value
+
+
+def not_run(status, message):
+    """
+    :param status: (str) – SKIPPED or CANCELLED.
+    :param message: (str) – why the call was not run.
+    :return: Result
+    """
+    return Result(status, None, None, message, None, 0, None)
+
+
+def _request_id(response):
+    headers = getattr(response, 'headers', None) or {}
+    return headers.get('x-ms-request-id')
+
+
+def _function_calls():
+    global _functions
+
+    if _functions is None:
+        _functions = {rtype.function_name(verb): (rtype, verb)
+                      for rtype in RESOURCE_TYPES.values()
+                      for verb in dispatch.VERBS}
+    return _functions
+
+
+def describe(function, args):
+    """
+    The dispatch call behind a cumulus function and its positional
+    arguments.
+
+    :param function: (callable or str) – a cumulus function, e.g.
+        cumulus.get_subnets, or its name.
+    :param args: (tuple) – the names, then the parameters for
+        create_update_*.
+    :return: (rtype, verb, key, parameters)
+    :raises: ValueError for anything but a cumulus function
+    """
+    name = function if isinstance(function, str) else function.__name__
+    try:
+        rtype, verb = _function_calls()[name]
+    except KeyError:
+        raise ValueError('{} is not a cumulus function'.format(name))
+
+    length = rtype.key_length - (verb == 'list')
+    parameters = args[length] if verb == 'create_update' else None
+    return rtype, verb, tuple(args[:length]), parameters
+
+
+def call(rtype, verb, key, parameters=None, **options):
+    """
+    Run one dispatch call and report how it went. Writes are always waited
+    for, so no_wait is not accepted.
+
+    :param rtype: (ResourceType) – the resource family.
+    :param verb: (str) – 'create_update', 'get', 'delete' or 'list'.
+    :param key: (tuple) – resource group name followed by resource names.
+    :param parameters: resource parameters for 'create_update'.
+    :param options: other dispatch options, e.g. context or custom_headers.
+    :return: Result
+    """
+    started = time.time()
+    response = None
+    try:
+        if verb in WRITE_VERBS:
+            operation = dispatch.call(rtype, verb, key, parameters,
+                                      no_wait=True, **options)
+            value = operation.result()
+            response = getattr(operation, 'response', None)
+        else:
+            value = dispatch.call(rtype, verb, key, parameters, strict=True,
+                                  **options)
+            if verb == 'list':
+                value = list(value)
+
+    except Exception as e:
+        return Result(FAILED, None, conflict_retry.error_code(e),
+                      getattr(e, 'message', None) or str(e),
+                      _request_id(getattr(e, 'response', None)),
+                      time.time() - started, e)
+
+    return Result(SUCCEEDED, value, None, None, _request_id(response),
+                  time.time() - started, None)
+
+
+def capture(function, *args, **kwargs):
+    """
+    Run a cumulus function and return a Result instead of printing errors.
+
+    :param function: (callable) – a cumulus function, e.g.
+        cumulus.create_update_subnets.
+    :param args: its positional arguments.
+    :param kwargs: its keyword arguments other than raw and no_wait.
+    :return: Result
+    """
+    rtype, verb, key, parameters = describe(function, args)
+    return call(rtype, verb, key, parameters, **kwargs)
@@ -0,0 +1,114 @@
+#!/usr/bin/python3
+#
+# single_flight.py
+#
+# Coalesces concurrent identical reads: while one thread is fetching a
+# resource, other threads asking for the same resource wait for that
+# request instead of sending their own.
+
+import threading
+
+import operations.metrics as metrics
+
+
+class _Call(object):
+
+    def __init__(self):
+        # held by the leader until the result is in; a Lock is far cheaper
+        # to create than an Event, and most calls are never waited on
+        self.running = threading.Lock()
+        self.running.acquire()
+        self.result = None
+        self.exception = None
+
+
+class SingleFlight(object):
+    """
+    Runs at most one call per key at a time; callers arriving while it is in
+    flight share its result or exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, function, *args, **kwargs):
+        """
+        Call function(*args, **kwargs), or wait for the identical call
+        already in flight.
+
+        :param key: (hashable) – identifies identical calls.
+        :param function: (callable) – the read to run.
+        :return: the call's result
+        :raises: the call's exception
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            metrics.increment('single_flight_deduplicated')
+            with call.running:
+                pass
+            if call.exception is not None:
+                raise call.exception
+            return call.result
+
+        metrics.increment('single_flight_requests')
+        try:
+            call.result = function(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.exception = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.running.release()
+
+    def in_flight(self):
+        """
+        :return: (int) number of calls currently running
+        """
+        with self._lock:
+            return len(self._calls)
+
+
+_flights = SingleFlight()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def stats():
+    """
+    Requests sent and requests saved by coalescing.
+
+    :return: dict
+    """
+    return {'requests': metrics.counter('single_flight_requests'),
+            'deduplicated': metrics.counter('single_flight_deduplicated')}
+
+
+def middleware(call, proceed):
+    """
+    Dispatch middleware: concurrent get calls with identical arguments share
+    one request. Callers receive the same resource object, so treat it as
+    read-only.
+
+    :param call: (dispatch.Call) – the call being made.
+    :param proceed: (callable) – the rest of the chain.
+    """
+    key = (call.rtype.name, call.key, call.expand, _freeze(call.custom_headers),
+           call.raw, call.output, call.fields, call.strict,
+           _freeze(call.context))
+    return _flights.do(key, proceed, call)
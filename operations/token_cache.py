@@ -0,0 +1,297 @@
+#!/usr/bin/python3
+#
+# token_cache.py
+#
+# File-backed AAD token cache shared by every cumulus process on the host.
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser('~'), '.cumulus', 'token_cache.json')
+
+# Tokens are refreshed once they are this many seconds from expiry.
+DEFAULT_REFRESH_MARGIN = 300
+
+_credentials_class = None
+
+
+@contextmanager
+def file_lock(path, shared=False):
+    """
+    Hold a lock on path + '.lock' for the duration of the block, creating
+    the parent directory if needed.
+
+    :param path: (str) – The file being protected.
+    :param shared: (bool) – Take a shared (read) lock, which other readers
+        may hold at the same time; Windows only has exclusive locks.
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory, 0o700)
+
+    with open(path + '.lock', 'a+') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(),
+                        fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def write_json(path, entries):
+    """
+    Replace path with entries as JSON, readable only by the current user.
+    Call it while holding file_lock(path).
+
+    :param path: (str) – The file to replace.
+    :param entries: (dict) – What to write.
+    :return: none
+    """
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w') as json_file:
+        json.dump(entries, json_file)
+    os.chmod(temp_path, 0o600)
+    os.replace(temp_path, path)
+
+
+def cache_key(tenant, client_id, cloud_name):
+    """
+    Build the cache key for one service principal in one cloud.
+
+    :param tenant: (str) – The AAD tenant id.
+    :param client_id: (str) – The service principal client id.
+    :param cloud_name: (str) – The cloud name, e.g. AzureUSGovernment.
+    :return: str
+    """
+    return '{}|{}|{}'.format(tenant, client_id, cloud_name)
+
+
+class TokenCache(object):
+    """
+    Stores tokens in a JSON file guarded by a file lock, so concurrent
+    processes reuse the same unexpired token. Readers share the lock; the
+    file is replaced atomically on writes.
+
+    :param path: (str) – Location of the cache file.
+    :param refresh_margin: (int) – Seconds before expiry at which a cached
+        token is no longer handed out.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH,
+                 refresh_margin=DEFAULT_REFRESH_MARGIN):
+        self.path = path
+        self.refresh_margin = refresh_margin
+
+    def locked(self, shared=False):
+        """
+        Hold the cache lock for the duration of the block.
+
+        :param shared: (bool) – Only read the cache under it.
+        """
+        return file_lock(self.path, shared)
+
+    def fresh(self, token):
+        """
+        Whether a token is outside the refresh margin.
+
+        :param token: (dict) – token as held by the credentials object.
+        :return: bool
+        """
+        try:
+            expires_at = float(token.get('expires_at') or 0)
+        except (TypeError, ValueError):
+            return False
+
+        return expires_at - self.refresh_margin > time.time()
+
+    def _read(self):
+        try:
+            with open(self.path) as cache_file:
+                return json.load(cache_file)
+        except (IOError, OSError, ValueError):
+            return {}
+
+    def _write(self, entries):
+        write_json(self.path, entries)
+
+    def get(self, key):
+        """
+        Return the cached token for key if it is outside the refresh margin.
+
+        :param key: (str) – built with cache_key().
+        :return: token dict or None
+        """
+        with self.locked(shared=True):
+            token = self._read().get(key)
+
+        if token and self.fresh(token):
+            return token
+
+        return None
+
+    def put(self, key, token):
+        """
+        Store a token, dropping any entries that have already expired.
+
+        :param key: (str) – built with cache_key().
+        :param token: (dict) – token as held by the credentials object.
+        :return: the stored token, with expires_at filled in
+        """
+        token = dict(token)
+        if 'expires_at' not in token:
+            token['expires_at'] = time.time() + float(token.get('expires_in', 3599))
+        token['expires_at'] = float(token['expires_at'])
+
+        with self.locked():
+            now = time.time()
+            entries = dict((k, v) for k, v in self._read().items()
+                           if v.get('expires_at', 0) > now)
+            entries[key] = token
+            self._write(entries)
+
+        return token
+
+    def clear(self, key=None):
+        """
+        Remove one entry, or every entry when key is None.
+
+        :param key: (str) – built with cache_key().
+        :return: none
+        """
+        with self.locked():
+            entries = {} if key is None else self._read()
+            entries.pop(key, None)
+            self._write(entries)
+
+
+def _cached_credentials():
+    global _credentials_class
+
+    if _credentials_class is None:
+        from azure.common.credentials import ServicePrincipalCredentials
+
+        class CachedServicePrincipalCredentials(ServicePrincipalCredentials):
+            """
+            ServicePrincipalCredentials that consult a TokenCache before
+            asking AAD for a token.
+
+            msrestazure calls set_token() before every request, so a token
+            still outside the refresh margin is used from memory; the cache
+            file is only read once it is about to expire.
+            """
+
+            def __init__(self, client_id, secret, token_cache=None, **kwargs):
+                self.token_cache = token_cache or TokenCache()
+                self.cache_key = cache_key(
+                    kwargs.get('tenant'),
+                    client_id,
+                    kwargs['cloud_environment'].name)
+                self._token_lock = threading.Lock()
+                super(CachedServicePrincipalCredentials, self).__init__(
+                    client_id, secret, **kwargs)
+
+            def _request_token(self):
+                # A context of our own: ADAL would hand back its cached copy
+                # of the token until five minutes before expiry, and the
+                # shared one may be in use by threads signing requests.
+                import re
+
+                import adal
+                from msrest.exceptions import (AuthenticationError,
+                                               raise_with_traceback)
+
+                authority = self.cloud_environment.endpoints.active_directory
+                adfs = bool(re.match('.+(/adfs|/adfs/)$', authority, re.I))
+                if adfs:
+                    authority = authority.rstrip('/')
+                else:
+                    authority = authority + '/' + self._tenant
+
+                context = adal.AuthenticationContext(
+                    authority,
+                    timeout=self._timeout,
+                    verify_ssl=self._verify,
+                    proxies=self._proxies,
+                    validate_authority=not adfs,
+                    api_version=None)
+                try:
+                    return self._convert_token(
+                        context.acquire_token_with_client_credentials(
+                            self.resource, self.id, self.secret))
+                except adal.AdalError as err:
+                    raise_with_traceback(AuthenticationError, '', err)
+
+            def set_token(self, force=False):
+                """
+                Load a token from the cache, or from AAD when the cache has
+                none outside the refresh margin. The new token replaces
+                self.token in a single assignment.
+
+                :param force: (bool) – skip the cache and ask AAD for a new
+                    token, e.g. to renew one ahead of the margin.
+                """
+                if not force and self.token_cache.fresh(self.token or {}):
+                    return
+
+                with self._token_lock:
+                    token = None
+                    if not force:
+                        # another thread may have loaded one meanwhile
+                        if self.token_cache.fresh(self.token or {}):
+                            return
+                        token = self.token_cache.get(self.cache_key)
+
+                    if token is None:
+                        token = self.token_cache.put(self.cache_key,
+                                                     self._request_token())
+                    self.token = token
+
+        _credentials_class = CachedServicePrincipalCredentials
+
+    return _credentials_class
+
+
+def service_principal_credentials(client_id, secret, tenant, cloud_environment,
+                                  token_cache=None, **kwargs):
+    """
+    Create Service Principal credentials backed by the on-disk token cache.
+
+    The token endpoint comes from cloud_environment, so pointing a Cloud at a
+    local stand-in AAD endpoint exercises the cache without network access.
+
+    :param client_id: (str) – The service principal client id.
+    :param secret: (str) – The service principal secret.
+    :param tenant: (str) – The AAD tenant id.
+    :param cloud_environment: (Cloud) – e.g. AZURE_US_GOV_CLOUD.
+    :param token_cache: (TokenCache) – defaults to the per-user cache file.
+    :param kwargs: other ServicePrincipalCredentials settings, e.g. verify
+        or timeout.
+    :return: ServicePrincipalCredentials
+    :raises: AuthenticationError
+    """
+    return _cached_credentials()(
+        client_id=client_id,
+        secret=secret,
+        tenant=tenant,
+        cloud_environment=cloud_environment,
+        token_cache=token_cache,
+        **kwargs)
+
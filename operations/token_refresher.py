@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+#
+# token_refresher.py
+#
+# Renews service principal tokens in the background so long-running
+# workflows never refresh on the request path.
+
+import threading
+import time
+
+import operations.metrics as metrics
+from operations.token_cache import DEFAULT_REFRESH_MARGIN
+
+# How often the refresher wakes up to look at the token expiry.
+DEFAULT_CHECK_INTERVAL = 30
+
+# Wait before retrying after a failed refresh.
+RETRY_INTERVAL = 10
+
+_lock = threading.Lock()
+_refreshers = {}
+
+
+def _expires_at(token):
+    try:
+        return float(token.get('expires_at') or token.get('expires_on'))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenRefresher(threading.Thread):
+    """
+    Daemon thread that asks AAD for a new token once the current one is
+    within margin seconds of expiry.
+
+    The new token replaces credentials.token in a single assignment, so
+    threads signing requests always see either the old or the new token.
+
+    :param credentials: (ServicePrincipalCredentials) – credentials shared
+        by the management clients.
+    :param margin: (int) – Seconds before expiry to renew the token.
+    :param interval: (int) – Seconds between expiry checks.
+    """
+
+    def __init__(self, credentials, margin=DEFAULT_REFRESH_MARGIN + DEFAULT_CHECK_INTERVAL,
+                 interval=DEFAULT_CHECK_INTERVAL):
+        super(TokenRefresher, self).__init__(name='cumulus-token-refresher')
+        self.daemon = True
+        self.credentials = credentials
+        self.margin = margin
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def due(self):
+        """
+        Whether the current token should be renewed now.
+
+        :return: bool
+        """
+        expires_at = _expires_at(self.credentials.token or {})
+        return expires_at is not None and expires_at - self.margin <= time.time()
+
+    def refresh(self):
+        """
+        Renew the token and record how long it took. Cached credentials are
+        made to skip their token cache, which would hand back the token
+        being renewed.
+
+        :return: (bool) whether a new token was obtained
+        """
+        previous = (self.credentials.token or {}).get('access_token')
+        started = time.time()
+        try:
+            if hasattr(self.credentials, 'token_cache'):
+                self.credentials.set_token(force=True)
+            else:
+                self.credentials.set_token()
+        except Exception as e:
+            metrics.increment('token_refresh_failures')
+            print(e)
+            raise
+        finally:
+            metrics.record('token_refresh_seconds', time.time() - started)
+
+        if (self.credentials.token or {}).get('access_token') == previous:
+            metrics.increment('token_refresh_unchanged')
+            return False
+
+        metrics.increment('token_refreshes')
+        return True
+
+    def run(self):
+        wait = self.interval
+        while not self._stopped.wait(wait):
+            wait = self.interval
+            if self.due():
+                try:
+                    if not self.refresh():
+                        wait = RETRY_INTERVAL
+                except Exception:
+                    wait = RETRY_INTERVAL
+
+    def stop(self):
+        """
+        Ask the thread to exit after its current check.
+
+        :return: none
+        """
+        self._stopped.set()
+
+
+def start(credentials, **kwargs):
+    """
+    Start a refresher for credentials unless one is already running.
+
+    :param credentials: (ServicePrincipalCredentials) – credentials to keep
+        fresh.
+    :return: TokenRefresher
+    """
+    with _lock:
+        refresher = _refreshers.get(id(credentials))
+        if refresher is None or not refresher.is_alive():
+            refresher = TokenRefresher(credentials, **kwargs)
+            refresher.start()
+            _refreshers[id(credentials)] = refresher
+
+        return refresher
+
+
+def stop_all():
+    """
+    Stop every running refresher.
+
+    :return: none
+    """
+    with _lock:
+        for refresher in _refreshers.values():
+            refresher.stop()
+        _refreshers.clear()
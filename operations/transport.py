@@ -0,0 +1,221 @@
+#!/usr/bin/python3
+#
+# transport.py
+#
+# HTTP connection pooling for the management clients. One session per
+# cloud/credentials pair is shared by every pooled client, and its adapter is
+# sized so parallel cumulus calls reuse connections instead of re-handshaking.
+
+import time
+
+import operations.circuit_breaker as circuit_breaker
+import operations.concurrency_limiter as concurrency_limiter
+import operations.hedging as hedging
+import operations.rate_limiter as rate_limiter
+
+# Default sizing assumes a thread pool of up to 32 workers driving cumulus.
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 32
+
+_adapter_class = None
+
+
+class TransportConfig(object):
+    """
+    Connection settings applied to the shared HTTP sessions.
+
+    :param pool_connections: (int) – Number of per-host connection pools to
+        keep (ARM, AAD, async-operation hosts).
+    :param pool_maxsize: (int) – Connections kept open per host; set this to
+        at least the number of worker threads.
+    :param pool_block: (bool) – Wait for a free connection instead of opening
+        a throwaway one when a host's pool is exhausted. Off by default, as
+        in requests; with it on, threads beyond pool_maxsize wait.
+    :param keep_alive: (bool) – Keep sessions open between calls.
+    :param gzip: (bool) – Ask ARM for gzip-compressed responses.
+    :param timeout: (int) – Connection timeout in seconds, or None for the
+        client default.
+    :param rate_limit: (bool) – Pass every request through the process-wide
+        rate_limiter.
+    :param adaptive_concurrency: (bool) – Cap requests in flight per
+        subscription, resource family and verb with the process-wide
+        concurrency_limiter.
+    :param circuit_breaker: (bool) – Fail requests to an endpoint at once
+        while its circuit_breaker is open.
+    :param hedged_reads: (bool) – Send a second copy of GETs slower than the
+        endpoint's 95th-percentile latency and use whichever answers first.
+    """
+
+    def __init__(self, pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE, pool_block=False,
+                 keep_alive=True, gzip=True, timeout=None, rate_limit=True,
+                 adaptive_concurrency=False, circuit_breaker=False,
+                 hedged_reads=False):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.gzip = gzip
+        self.timeout = timeout
+        self.rate_limit = rate_limit
+        self.adaptive_concurrency = adaptive_concurrency
+        self.circuit_breaker = circuit_breaker
+        self.hedged_reads = hedged_reads
+
+
+def adapter_class():
+    """
+    requests HTTPAdapter subclass that applies the circuit breakers, hedged
+    reads and the rate and concurrency limiters to every request it sends.
+
+    :return: type
+    """
+    global _adapter_class
+
+    if _adapter_class is None:
+        from requests.adapters import HTTPAdapter
+
+        class CumulusAdapter(HTTPAdapter):
+            """
+            HTTPAdapter that checks the endpoint's circuit breaker, waits for
+            a rate-limit token and then a concurrency slot before sending,
+            and feeds every response back to all three. The slot is only
+            taken once the token is in hand, so time spent waiting on the
+            rate limit does not count as latency. Hedged copies of a read
+            each take their own token and slot.
+            """
+
+            def __init__(self, rate_limit=True, adaptive_concurrency=False,
+                         circuit_breaker=False, hedged_reads=False, **kwargs):
+                self.rate_limit = rate_limit
+                self.adaptive_concurrency = adaptive_concurrency
+                self.circuit_breaker = circuit_breaker
+                self.hedged_reads = hedged_reads
+                super(CumulusAdapter, self).__init__(**kwargs)
+
+            def _send(self, request, **kwargs):
+                # the slot is held, and timed, for the HTTP exchange only
+                if not self.adaptive_concurrency:
+                    return super(CumulusAdapter, self).send(request, **kwargs)
+
+                with concurrency_limiter.default().request(
+                        request.method, request.url) as outcome:
+                    response = super(CumulusAdapter, self).send(request,
+                                                                **kwargs)
+                    outcome['ok'] = concurrency_limiter.ok(
+                        response.status_code)
+                    return response
+
+            def _limited(self, request, **kwargs):
+                if not self.rate_limit:
+                    return self._send(request, **kwargs)
+
+                limiter = rate_limiter.default()
+                limiter.acquire(request.method, request.url)
+                response = self._send(request, **kwargs)
+                limiter.observe(request.method, request.url,
+                                response.status_code, response.headers)
+                return response
+
+            def _hedged(self, request, **kwargs):
+                if not (self.hedged_reads and hedging.hedges(request.method)):
+                    return self._limited(request, **kwargs)
+
+                return hedging.default().send(
+                    lambda: self._limited(request.copy(), **kwargs),
+                    request.url)
+
+            def send(self, request, **kwargs):
+                if not self.circuit_breaker:
+                    return self._hedged(request, **kwargs)
+
+                breaker = circuit_breaker.default().breaker(request.url)
+                breaker.before()
+                started = time.time()
+                try:
+                    response = self._hedged(request, **kwargs)
+                except Exception:
+                    breaker.record(False, time.time() - started)
+                    raise
+
+                breaker.record(circuit_breaker.ok(response.status_code),
+                               time.time() - started)
+                return response
+
+        _adapter_class = CumulusAdapter
+
+    return _adapter_class
+
+
+def build_session(config):
+    """
+    Create a requests.Session with pooled adapters sized by config.
+
+    :param config: (TransportConfig) – connection settings.
+    :return: requests.Session
+    """
+    import requests
+
+    session = requests.Session()
+    adapter = adapter_class()(
+        rate_limit=config.rate_limit,
+        adaptive_concurrency=config.adaptive_concurrency,
+        circuit_breaker=config.circuit_breaker,
+        hedged_reads=config.hedged_reads,
+        pool_connections=config.pool_connections,
+        pool_maxsize=config.pool_maxsize,
+        pool_block=config.pool_block)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    # requests asks for gzip by default; identity turns it off
+    session.headers['Accept-Encoding'] = (
+        'gzip, deflate' if config.gzip else 'identity')
+    if not config.keep_alive:
+        session.headers['Connection'] = 'close'
+
+    return session
+
+
+class _SharedSession(object):
+    """
+    Stands in for the sender's threading.local, so the calls cumulus_aio and
+    bulk_apply run on worker threads use the shared session too.
+    """
+
+    def __init__(self, session):
+        self.session = session
+
+
+def attach_session(client, session, config):
+    """
+    Point a management client at a shared session.
+
+    msrest keeps the requests.Session on the pipeline's sender; replacing it
+    on every thread lets every client built for the same cloud and
+    credentials share one connection pool.
+
+    :param client: (SDKClient) – NetworkManagementClient or
+        ResourceManagementClient.
+    :param session: (requests.Session) – from build_session().
+    :param config: (TransportConfig) – connection settings.
+    :return: none
+    """
+    client.config.keep_alive = config.keep_alive
+    if config.timeout is not None:
+        client.config.connection.timeout = config.timeout
+
+    pipeline = getattr(client._client.config, 'pipeline', None)
+    driver = getattr(getattr(pipeline, '_sender', None), 'driver', None)
+    if driver is None:
+        return
+
+    # _init_session applies the client's retry policy to our adapters
+    if hasattr(driver, '_init_session'):
+        driver._init_session(session)
+    if hasattr(driver, '_session_mapping'):
+        # newer msrest keeps a session per thread; hand every thread ours
+        driver._session_mapping = _SharedSession(session)
+    else:
+        driver.session = session
+
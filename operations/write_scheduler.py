@@ -0,0 +1,336 @@
+#!/usr/bin/python3
+#
+# write_scheduler.py
+#
+# Keeps concurrent writes from tripping over each other in ARM. A PUT or
+# DELETE on a child (subnet, route, security rule) locks its parent, and so
+# does any write to the parent itself; ARM answers a second write while the
+# first is running with 409 AnotherOperationInProgress. Writes are keyed by
+# the resource id of their top-level resource:
+#
+# - every create_update/delete goes through middleware that holds the key's
+#   lock until the operation finishes, so threads writing to one VNet take
+#   turns instead of failing;
+# - WriteScheduler queues writes per key and starts each as soon as the one
+#   before it on the same key has finished, running writes on different keys
+#   in parallel, so throughput grows with the number of independent parents:
+#
+#     scheduler = write_scheduler.default()
+#     futures = [scheduler.submit(RESOURCE_TYPES['subnets'], 'create_update',
+#                                 (GROUP_NAME, VNET_NAME, name), parameters)
+#                for name, parameters in subnets]
+#     concurrent.futures.wait(futures)
+#
+# Conflicts that still happen are retried with jittered backoff (see
+# conflict_retry).
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import operations.authenticate_user as clients
+import operations.conflict_retry as conflict_retry
+import operations.lro as lro
+import operations.lro_scheduler as lro_scheduler
+import operations.metrics as metrics
+from operations.resource_types import resource_id
+
+WRITE_VERBS = ('create_update', 'delete')
+
+DEFAULT_WORKERS = 8
+
+# key -> _KeyLock, for as long as some thread holds or waits on it
+_locks = {}
+_locks_lock = threading.Lock()
+
+# keys each thread holds through hold(), which its own writes do not take
+# again
+_held = threading.local()
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def lock_key(rtype, key, context=None):
+    """
+    The key writes to a resource serialize on: the resource id of its
+    top-level resource, e.g. the virtual network for a subnet.
+
+    :param rtype: (ResourceType) – the resource family.
+    :param key: (tuple) – resource group name followed by resource names.
+    :param context: (ClientContext) – subscription/cloud to run against.
+    :return: (tuple) cloud name and lower-cased resource id
+    """
+    while rtype.parent is not None:
+        rtype = rtype.parent
+
+    context = clients.resolve_context(context)
+    return (context.cloud.name,
+            resource_id(rtype, context.subscription_id,
+                        key[:rtype.key_length]).lower())
+
+
+class _KeyLock(object):
+    """
+    The write lock of one key. It is dropped from _locks once no thread
+    holds or waits on it.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        # holders and waiters, counted under _locks_lock
+        self.users = 0
+        # a semaphore, not a Lock: no_wait writes are released from the
+        # polling thread that sees them finish
+        self._semaphore = threading.Semaphore()
+
+    def acquire(self, blocking=True):
+        return self._semaphore.acquire(blocking)
+
+    def release(self):
+        self._semaphore.release()
+        _leave(self)
+
+
+def _leave(lock):
+    with _locks_lock:
+        lock.users -= 1
+        if lock.users == 0:
+            del _locks[lock.key]
+
+
+def _acquire(key):
+    with _locks_lock:
+        lock = _locks.get(key)
+        if lock is None:
+            lock = _locks[key] = _KeyLock(key)
+        lock.users += 1
+
+    try:
+        if not lock.acquire(blocking=False):
+            metrics.increment('write_lock_waits')
+            lock.acquire()
+    except BaseException:
+        _leave(lock)
+        raise
+    return lock
+
+
+def _held_keys():
+    keys = getattr(_held, 'keys', None)
+    if keys is None:
+        keys = _held.keys = set()
+    return keys
+
+
+def _release_after(lock, result):
+    if hasattr(result, 'poll'):
+        lro_scheduler.default().submit(
+            result, callback=lambda operation: lock.release())
+    else:
+        lock.release()
+
+
+class Hold(object):
+    """
+    The write lock of one top-level resource, held across several steps,
+    e.g. reading a parent, merging into it and writing it back. Writes made
+    through dispatch on the holding thread do not take the lock again.
+
+    :param key: (tuple) – from lock_key().
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._lock = _acquire(key)
+        _held_keys().add(key)
+
+    def release(self, operation=None):
+        """
+        Give the lock up, or hand it to operation to give up when the
+        polling scheduler sees it finish.
+
+        :param operation: the handle of a no_wait write made while holding.
+        :return: none
+        """
+        _held_keys().discard(self.key)
+        _release_after(self._lock, operation)
+
+
+def hold(rtype, key, context=None):
+    """
+    Take the write lock of a resource's top-level resource.
+
+    :param rtype: (ResourceType) – the resource family.
+    :param key: (tuple) – resource group name followed by resource names.
+    :param context: (ClientContext) – subscription/cloud to run against.
+    :return: Hold
+    """
+    return Hold(lock_key(rtype, key, context))
+
+
+def middleware(call, proceed):
+    """
+    Dispatch middleware: hold the write lock of the call's top-level
+    resource until its operation finishes. A no_wait write returns once it
+    is accepted and releases the lock when the polling scheduler sees it
+    finish.
+
+    :param call: (dispatch.Call) – the call being made.
+    :param proceed: (callable) – the rest of the chain.
+    """
+    key = lock_key(call.rtype, call.key, call.context)
+    if key in _held_keys():
+        return proceed(call)
+
+    lock = _acquire(key)
+    try:
+        result = proceed(call)
+    except BaseException:
+        lock.release()
+        raise
+
+    _release_after(lock, result if call.no_wait else None)
+    return result
+
+
+class _Write(object):
+
+    def __init__(self, rtype, verb, key, parameters, context, options):
+        self.rtype = rtype
+        self.verb = verb
+        self.key = key
+        self.parameters = parameters
+        self.context = context
+        self.options = options
+        self.future = Future()
+        self.attempt = 0
+
+
+class WriteScheduler(object):
+    """
+    Runs cumulus calls concurrently, one write at a time per top-level
+    resource, in the order they were submitted.
+
+    Workers only send requests; the long-running operations are polled by
+    the process-wide PollingScheduler, so a queue waiting on a slow gateway
+    does not hold a worker. An accepted write that ARM later cancels for a
+    conflicting one is resent, as the retry policy allows, before the next
+    write on its key starts.
+
+    :param workers: (int) – threads used to send requests.
+    :param policy: (RetryPolicy) – defaults to conflict_retry.default().
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, policy=None):
+        self.policy = policy
+        self._lock = threading.Lock()
+        self._queues = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='cumulus-write')
+
+    def submit(self, rtype, verb, key, parameters=None, context=None,
+               **options):
+        """
+        Queue one cumulus call.
+
+        :param rtype: (ResourceType) – the resource family.
+        :param verb: (str) – 'create_update', 'get', 'delete' or 'list'.
+        :param key: (tuple) – resource group name followed by resource names.
+        :param parameters: resource parameters for 'create_update'.
+        :param context: (ClientContext) – subscription/cloud to run against.
+        :param options: other dispatch options, e.g. custom_headers.
+        :return: (Future) of the resource (None for deletes, a list for
+            'list'); a failed write raises its CloudError from result()
+        """
+        if verb not in WRITE_VERBS:
+            return self._executor.submit(_read, rtype, verb, key, context,
+                                         options)
+
+        write = _Write(rtype, verb, key, parameters, context, options)
+        key = lock_key(rtype, write.key, context)
+        with self._lock:
+            queue = self._queues.get(key)
+            if queue is not None:
+                queue.append(write)
+                return write.future
+
+            self._queues[key] = deque()
+
+        self._start(key, write)
+        return write.future
+
+    def pending(self):
+        """
+        :return: (int) writes queued behind another on the same key
+        """
+        with self._lock:
+            return sum(len(queue) for queue in self._queues.values())
+
+    def _start(self, key, write):
+        self._executor.submit(self._send, key, write)
+
+    def _send(self, key, write):
+        import operations.dispatch as dispatch
+
+        try:
+            operation = dispatch.call(
+                write.rtype, write.verb, write.key, write.parameters,
+                context=write.context, no_wait=True, **write.options)
+        except Exception as e:
+            operation = lro.CompletedOperation(exception=e)
+
+        lro_scheduler.default().submit(
+            operation, callback=lambda operation: self._finished(
+                key, write, operation))
+
+    def _finished(self, key, write, operation):
+        exception = operation.exception()
+        policy = self.policy or conflict_retry.default()
+        # writes rejected up front were already retried by lro.begin
+        if (exception is not None
+                and not isinstance(operation, lro.CompletedOperation)
+                and policy.retries(exception, write.attempt)):
+            metrics.increment('write_conflict_retries')
+            timer = threading.Timer(policy.delay(write.attempt, exception),
+                                    self._start, (key, write))
+            timer.daemon = True
+            write.attempt += 1
+            timer.start()
+            return
+
+        if exception is not None:
+            write.future.set_exception(exception)
+        else:
+            write.future.set_result(operation.result())
+
+        with self._lock:
+            queue = self._queues[key]
+            if not queue:
+                del self._queues[key]
+                return
+            write = queue.popleft()
+
+        self._start(key, write)
+
+
+def _read(rtype, verb, key, context, options):
+    import operations.dispatch as dispatch
+
+    result = dispatch.call(rtype, verb, key, context=context, **options)
+    return list(result) if verb == 'list' else result
+
+
+def default():
+    """
+    The process-wide write scheduler.
+
+    :return: WriteScheduler
+    """
+    global _default
+
+    with _default_lock:
+        if _default is None:
+            _default = WriteScheduler()
+
+        return _default
@@ -0,0 +1,15 @@
+#!/usr/bin/python3
+#
+# conftest.py
+#
+# Lets the tests import operations and models from the repository root, and
+# the stand-in servers from this directory.
+
+import os
+import sys
+
+TESTS = os.path.dirname(os.path.abspath(__file__))
+
+for path in (os.path.dirname(TESTS), TESTS):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,469 @@
+#!/usr/bin/python3
+#
+# stand_in_server.py
+#
+# Local HTTP servers that stand in for ARM and AAD, so the transport, the
+# rate limiter, the bulk applies and the token cache can be exercised
+# without a subscription. StandInServer answers any GET after an injectable
+# latency, for the circuit breaker and hedged reads; StandInThrottlingServer
+# adds ARM's per-subscription request budgets and 429s; StandInArm keeps
+# network resources with etags, for the real SDK clients;
+# StandInTokenEndpoint hands out client-credential tokens over HTTPS:
+#
+#     with StandInServer(latency=lambda: random.expovariate(10)) as server:
+#         session.get(server.url + '/resource')
+#
+#     with StandInThrottlingServer(capacity=100, rate=20) as server:
+#         session.get(server.url + '/subscriptions/{}/resourceGroups/g'
+#                     .format(SUBSCRIPTION_ID))
+#
+#     with StandInArm() as arm:
+#         cumulus.get_virtual_networks(GROUP_NAME, VNET_NAME,
+#                                      context=arm.context())
+#
+#     with StandInTokenEndpoint() as aad:
+#         token_cache.service_principal_credentials(
+#             CLIENT, KEY, TENANT_ID, aad.cloud(), verify=aad.certificate)
+
+import json
+import math
+import os
+import ssl
+import tempfile
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from operations.rate_limiter import REMAINING_HEADERS, category, subscription_of
+
+
+class StandInServer(object):
+    """
+    Answers every request with a small JSON resource after a delay, over
+    keep-alive connections.
+
+    :param latency: (callable) – returns the seconds to wait before each
+        response; called once per request.
+    :param status: (int) – HTTP status to answer with.
+    """
+
+    def __init__(self, latency=lambda: 0, status=200):
+        self.latency = latency
+        self.status = status
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                BaseHTTPRequestHandler.setup(self)
+                with stand_in._lock:
+                    stand_in.connections += 1
+
+            def do_GET(self):
+                with stand_in._lock:
+                    stand_in.requests += 1
+                time.sleep(stand_in.latency())
+
+                body = json.dumps({'id': self.path, 'name': 'stand-in',
+                                   'properties': {
+                                       'provisioningState': 'Succeeded'}})
+                body = body.encode('utf-8')
+                try:
+                    self.send_response(stand_in.status)
+                    self.send_header('Content-Type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # the client gave up: timed out or took the hedge
+                    pass
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    @property
+    def url(self):
+        """
+        Base URL of the server.
+        """
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        """
+        Serve requests on a background thread.
+
+        :return: self
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        name='cumulus-stand-in')
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stop serving and close the socket.
+
+        :return: none
+        """
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+class StandInThrottlingServer(StandInServer):
+    """
+    Holds each subscription to ARM-style request budgets: separate read,
+    write and delete buckets of capacity requests, refilled at rate per
+    second. Every response carries the bucket's
+    x-ms-ratelimit-remaining-subscription-* header, and a request that finds
+    its bucket empty is answered 429 with a Retry-After.
+
+    :param capacity: (int) – requests a full bucket allows.
+    :param rate: (float) – requests added to each bucket per second.
+    :param latency: (callable) – returns the seconds to wait before each
+        admitted response.
+    """
+
+    def __init__(self, capacity=100, rate=20, latency=lambda: 0):
+        self.capacity = capacity
+        self.rate = rate
+        self.throttled = 0
+        self._buckets = {}
+        super(StandInThrottlingServer, self).__init__(latency=latency)
+
+    def _take(self, method, path):
+        # (requests remaining, Retry-After or None when admitted)
+        key = (subscription_of(path), category(method))
+        with self._lock:
+            now = time.time()
+            tokens, updated = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                self.throttled += 1
+                return 0, int(math.ceil((1 - tokens) / self.rate))
+
+            self._buckets[key] = (tokens - 1, now)
+            return int(tokens - 1), None
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def _respond(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                with stand_in._lock:
+                    stand_in.requests += 1
+                remaining, retry_after = stand_in._take(self.command,
+                                                        self.path)
+
+                if retry_after is None:
+                    time.sleep(stand_in.latency())
+                    status, document = 200, {
+                        'id': self.path, 'name': 'stand-in',
+                        'properties': {'provisioningState': 'Succeeded'}}
+                else:
+                    status, document = 429, {'error': {
+                        'code': 'TooManyRequests',
+                        'message': 'Retry after {}s'.format(retry_after)}}
+
+                body = json.dumps(document).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header(REMAINING_HEADERS[category(self.command)],
+                                 str(remaining))
+                if retry_after is not None:
+                    self.send_header('Retry-After', str(retry_after))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_PUT = do_DELETE = _respond
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class StandInArm(StandInServer):
+    """
+    A minimal ARM network provider: GET and PUT of top-level network
+    resources and their children (subnets, routes, security rules), with
+    fresh etags on every write and If-Match checked like ARM does (412 on a
+    mismatch). Writes complete synchronously, after latency() seconds.
+
+    :param latency: (callable) – returns the seconds each PUT takes.
+    """
+
+    CHILDREN = ('subnets', 'routes', 'securityRules')
+
+    def __init__(self, latency=lambda: 0):
+        self.resources = {}
+        self.puts = []
+        super(StandInArm, self).__init__(latency=latency)
+
+    def context(self, subscription_id='00000000-0000-0000-0000-000000000000'):
+        """
+        A ClientContext whose clients talk to this server.
+
+        :param subscription_id: (str) – any subscription id.
+        :return: ClientContext
+        """
+        from msrest.authentication import BasicTokenAuthentication
+        from msrestazure.azure_cloud import Cloud, CloudEndpoints
+
+        from operations.client_pool import ClientContext
+
+        cloud = Cloud('StandInArm{}'.format(self._server.server_address[1]),
+                      endpoints=CloudEndpoints(resource_manager=self.url))
+        return ClientContext(subscription_id, cloud,
+                             BasicTokenAuthentication({'access_token': 'x'}))
+
+    @staticmethod
+    def _split(path):
+        # (top-level resource id, child collection, child name)
+        parts = path.split('/')
+        lowered = [part.lower() for part in parts]
+        start = lowered.index('providers') + 4
+        top = '/'.join(parts[:start]).lower()
+        if len(parts) < start + 2:
+            return top, None, None
+        return top, parts[start], parts[start + 1]
+
+    def _get(self, path):
+        top, collection, name = self._split(path)
+        resource = self.resources.get(top)
+        if resource is None or collection is None:
+            return resource
+
+        for child in resource['properties'].get(collection) or []:
+            if child['name'].lower() == name.lower():
+                return child
+
+    @staticmethod
+    def _stamp(resource, resource_id):
+        resource['id'] = resource_id
+        resource['etag'] = 'W/"{}"'.format(uuid.uuid4())
+        properties = resource.setdefault('properties', {})
+        properties['provisioningState'] = 'Succeeded'
+
+    def _put(self, path, body):
+        top, collection, name = self._split(path)
+        if collection is None:
+            body['name'] = path.rsplit('/', 1)[1]
+            properties = body.setdefault('properties', {})
+            for children in self.CHILDREN:
+                for child in properties.get(children) or []:
+                    self._stamp(child, '{}/{}/{}'.format(
+                        path, children, child['name']))
+            self._stamp(body, path)
+            self.resources[top] = body
+            return body
+
+        parent = self.resources[top]
+        body['name'] = name
+        self._stamp(body, path)
+        children = [child for child in
+                    parent['properties'].get(collection) or []
+                    if child['name'].lower() != name.lower()]
+        parent['properties'][collection] = children + [body]
+        parent['etag'] = 'W/"{}"'.format(uuid.uuid4())
+        return body
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def _answer(self, status, document):
+                body = json.dumps(document).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('x-ms-request-id', str(uuid.uuid4()))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _error(self, status, code):
+                self._answer(status, {'error': {'code': code, 'message': code}})
+
+            def do_GET(self):
+                path = urlsplit(self.path).path.rstrip('/')
+                with stand_in._lock:
+                    stand_in.requests += 1
+                    if path.lower().endswith('/providers'):
+                        return self._answer(200, {'value': [{
+                            'namespace': 'Microsoft.Network',
+                            'registrationState': 'Registered'}]})
+                    resource = stand_in._get(path)
+                    document = json.loads(json.dumps(resource))
+
+                if resource is None:
+                    return self._error(404, 'NotFound')
+                self._answer(200, document)
+
+            def do_PUT(self):
+                path = urlsplit(self.path).path.rstrip('/')
+                length = int(self.headers.get('Content-Length') or 0)
+                body = json.loads(self.rfile.read(length) or b'{}')
+                if_match = self.headers.get('If-Match')
+                with stand_in._lock:
+                    stand_in.requests += 1
+                    stand_in.puts.append(path)
+                    current = stand_in._get(path)
+                    if if_match and (current is None
+                                     or current.get('etag') != if_match):
+                        return self._error(412, 'PreconditionFailed')
+
+                time.sleep(stand_in.latency())
+                with stand_in._lock:
+                    document = json.loads(json.dumps(
+                        stand_in._put(path, body)))
+                self._answer(200, document)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+class StandInTokenEndpoint(StandInServer):
+    """
+    An AAD token endpoint for the client credentials flow. ADAL only talks
+    to https authorities, so it serves TLS with a throwaway self-signed
+    certificate; pass certificate as the credentials' verify setting. Every
+    request gets a new access token.
+
+    :param expires_in: (int) – lifetime of the tokens handed out, in seconds.
+    :param latency: (callable) – returns the seconds each token takes.
+    """
+
+    def __init__(self, expires_in=3599, latency=lambda: 0):
+        self.expires_in = expires_in
+        super(StandInTokenEndpoint, self).__init__(latency=latency)
+        self.certificate, key = self._self_signed()
+        tls = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        tls.load_cert_chain(self.certificate, key)
+        self._server.socket = tls.wrap_socket(self._server.socket,
+                                              server_side=True)
+
+    @staticmethod
+    def _self_signed():
+        # cryptography comes with ADAL
+        import datetime
+        import ipaddress
+
+        from cryptography import x509
+        from cryptography.hazmat.primitives import hashes, serialization
+        from cryptography.hazmat.primitives.asymmetric import ec
+        from cryptography.x509.oid import NameOID
+
+        key = ec.generate_private_key(ec.SECP256R1())
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME,
+                                             '127.0.0.1')])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(minutes=5))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .add_extension(x509.SubjectAlternativeName(
+                [x509.IPAddress(ipaddress.ip_address('127.0.0.1'))]),
+                critical=False)
+            .sign(key, hashes.SHA256()))
+
+        directory = tempfile.mkdtemp(prefix='cumulus-stand-in-')
+        certificate_path = os.path.join(directory, 'certificate.pem')
+        key_path = os.path.join(directory, 'key.pem')
+        with open(certificate_path, 'wb') as pem:
+            pem.write(certificate.public_bytes(serialization.Encoding.PEM))
+        with open(key_path, 'wb') as pem:
+            pem.write(key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption()))
+        return certificate_path, key_path
+
+    @property
+    def url(self):
+        """
+        Base URL of the server.
+        """
+        host, port = self._server.server_address[:2]
+        return 'https://{}:{}'.format(host, port)
+
+    def cloud(self, resource_manager='https://management.usgovcloudapi.net/'):
+        """
+        A Cloud whose active directory is this server. It is an ADFS-style
+        authority, so ADAL does not look it up with login.microsoftonline.com.
+
+        :param resource_manager: (str) – ARM endpoint of the cloud.
+        :return: Cloud
+        """
+        from msrestazure.azure_cloud import Cloud, CloudEndpoints
+
+        return Cloud(
+            'StandInAad{}'.format(self._server.server_address[1]),
+            endpoints=CloudEndpoints(
+                active_directory=self.url + '/adfs',
+                active_directory_resource_id=
+                'https://management.core.windows.net/',
+                resource_manager=resource_manager))
+
+    def _handler(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                with stand_in._lock:
+                    stand_in.requests += 1
+                time.sleep(stand_in.latency())
+
+                body = json.dumps({
+                    'token_type': 'Bearer',
+                    'expires_in': str(stand_in.expires_in),
+                    'expires_on': str(int(time.time() + stand_in.expires_in)),
+                    'resource': 'https://management.core.windows.net/',
+                    'access_token': str(uuid.uuid4())}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
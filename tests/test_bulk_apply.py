@@ -0,0 +1,140 @@
+#!/usr/bin/python3
+#
+# test_bulk_apply.py
+#
+# Bulk applies against a local stand-in ARM network provider, with other
+# writers changing the same parent at the same time.
+
+import threading
+import uuid
+
+import pytest
+
+pytest.importorskip('azure.mgmt.network')
+
+import operations.bulk_apply as bulk_apply
+import operations.dispatch as dispatch
+import operations.json_reads as json_reads
+from operations.resource_types import RESOURCE_TYPES
+from stand_in_server import StandInArm
+
+GROUP_NAME = 'group'
+
+# Seconds each PUT takes, widening the window between a bulk apply's read
+# and its write.
+LATENCY = 0.2
+
+
+@pytest.fixture
+def arm():
+    with StandInArm(latency=lambda: LATENCY) as arm:
+        yield arm
+
+
+def _create(context, family, name):
+    dispatch.call(RESOURCE_TYPES[family], 'create_update', (GROUP_NAME, name),
+                  {'location': 'usgovvirginia'}, context=context)
+
+
+def _children(context, family, name, collection):
+    parent = json_reads.get(RESOURCE_TYPES[family], (GROUP_NAME, name),
+                            context=context)
+    return sorted(child['name']
+                  for child in parent['properties'].get(collection) or [])
+
+
+def _concurrently(*targets):
+    threads = [threading.Thread(target=target) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _subnet(index):
+    return {'name': 'bulk{}'.format(index),
+            'address_prefix': '10.0.{}.0/24'.format(index)}
+
+
+def _rule(index):
+    return {'name': 'rule{}'.format(index), 'protocol': '*',
+            'access': 'Allow', 'direction': 'Inbound',
+            'priority': 100 + index, 'source_address_prefix': '*',
+            'destination_address_prefix': '*', 'source_port_range': '*',
+            'destination_port_range': '*'}
+
+
+def _route(index):
+    return {'name': 'route{}'.format(index),
+            'address_prefix': '10.{}.0.0/16'.format(index),
+            'next_hop_type': 'VnetLocal'}
+
+
+def test_concurrent_subnet_applies_lose_nothing(arm):
+    context = arm.context()
+    _create(context, 'virtual_networks', 'vnet')
+
+    def bulk(index):
+        return lambda: bulk_apply.apply_subnets(
+            GROUP_NAME, 'vnet', [_subnet(index)], context=context)
+
+    def single():
+        dispatch.call(RESOURCE_TYPES['subnets'], 'create_update',
+                      (GROUP_NAME, 'vnet', 'single'),
+                      {'address_prefix': '10.1.0.0/24'}, context=context)
+
+    _concurrently(single, *[bulk(index) for index in range(4)])
+
+    assert _children(context, 'virtual_networks', 'vnet', 'subnets') == [
+        'bulk0', 'bulk1', 'bulk2', 'bulk3', 'single']
+
+
+def test_concurrent_rule_and_route_applies_lose_nothing(arm):
+    context = arm.context()
+    _create(context, 'network_security_groups', 'nsg')
+    _create(context, 'route_tables', 'routes')
+
+    def rules(index):
+        return lambda: bulk_apply.apply_security_rules(
+            GROUP_NAME, 'nsg', [_rule(index)], context=context)
+
+    def routes(index):
+        return lambda: bulk_apply.apply_routes(
+            GROUP_NAME, 'routes', [_route(index)], context=context)
+
+    _concurrently(*[make(index) for index in range(3)
+                    for make in (rules, routes)])
+
+    assert _children(context, 'network_security_groups', 'nsg',
+                     'securityRules') == ['rule0', 'rule1', 'rule2']
+    assert _children(context, 'route_tables', 'routes', 'routes') == [
+        'route0', 'route1', 'route2']
+
+
+def test_a_write_between_read_and_put_is_kept(arm, monkeypatch):
+    # a writer outside this process, which the write lock cannot stop
+    context = arm.context()
+    _create(context, 'virtual_networks', 'vnet')
+    get = json_reads.get
+    raced = []
+
+    def racy_get(*args, **kwargs):
+        resource = get(*args, **kwargs)
+        if not raced:
+            raced.append(True)
+            with arm._lock:
+                vnet = arm._get(resource['id'])
+                vnet['properties'].setdefault('subnets', []).append({
+                    'name': 'outside',
+                    'properties': {'addressPrefix': '10.2.0.0/24'}})
+                vnet['etag'] = 'W/"{}"'.format(uuid.uuid4())
+        return resource
+
+    monkeypatch.setattr(json_reads, 'get', racy_get)
+    result = bulk_apply.apply_subnets(GROUP_NAME, 'vnet', [_subnet(0)],
+                                      context=context)
+
+    assert raced
+    assert result.added == ['bulk0']
+    assert _children(context, 'virtual_networks', 'vnet', 'subnets') == [
+        'bulk0', 'outside']
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+#
+# test_child_batching.py
+#
+# Child reads answered from their parent, against a local stand-in ARM
+# network provider.
+
+import threading
+import time
+
+import pytest
+
+pytest.importorskip('azure.mgmt.network')
+
+import operations.child_batching as child_batching
+import operations.dispatch as dispatch
+import operations.metrics as metrics
+from operations.resource_types import RESOURCE_TYPES
+from stand_in_server import StandInArm
+
+GROUP_NAME = 'group'
+SUBNETS = 4
+
+# Long enough that a read which waits out the window is easy to tell apart.
+WINDOW = 0.5
+REUSE = 0.2
+
+
+@pytest.fixture
+def arm():
+    with StandInArm() as arm:
+        context = arm.context()
+        for name in ('vnet', 'other'):
+            dispatch.call(
+                RESOURCE_TYPES['virtual_networks'], 'create_update',
+                (GROUP_NAME, name),
+                {'location': 'usgovvirginia',
+                 'subnets': [{'name': 'subnet{}'.format(index),
+                              'address_prefix': '10.0.{}.0/24'.format(index)}
+                             for index in range(SUBNETS)]},
+                context=context)
+        yield arm
+
+
+@pytest.fixture
+def batcher():
+    yield child_batching.enable(window=WINDOW, reuse=REUSE)
+    child_batching.disable()
+
+
+def _subnet(context, index, vnet='vnet'):
+    return dispatch.call(RESOURCE_TYPES['subnets'], 'get',
+                         (GROUP_NAME, vnet, 'subnet{}'.format(index)),
+                         context=context)
+
+
+def test_a_lone_read_does_not_wait(arm, batcher):
+    context = arm.context()
+    fetches = metrics.counter('batch_parent_fetches')
+
+    started = time.time()
+    assert _subnet(context, 0).name == 'subnet0'
+    assert time.time() - started < WINDOW
+    assert metrics.counter('batch_parent_fetches') == fetches + 1
+
+
+def test_concurrent_reads_share_one_parent_get(arm, batcher):
+    context = arm.context()
+    fetches = metrics.counter('batch_parent_fetches')
+    sent = arm.requests
+    names = []
+    barrier = threading.Barrier(SUBNETS)
+
+    def read(index):
+        barrier.wait()
+        names.append(_subnet(context, index).name)
+
+    threads = [threading.Thread(target=read, args=(index,))
+               for index in range(SUBNETS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(names) == ['subnet{}'.format(index)
+                             for index in range(SUBNETS)]
+    assert metrics.counter('batch_parent_fetches') == fetches + 1
+    assert arm.requests == sent + 1
+
+
+def test_parents_are_dropped_after_their_reuse(arm, batcher):
+    context = arm.context()
+    _subnet(context, 0)
+    assert len(batcher._batches) == 1
+
+    # still answering within the reuse period
+    sent = arm.requests
+    _subnet(context, 1)
+    assert arm.requests == sent
+
+    time.sleep(REUSE * 2.5)
+    _subnet(context, 0, vnet='other')
+    assert list(batcher._batches) == [
+        (context.cloud.name, '/subscriptions/{}/resourcegroups/{}/providers'
+         '/microsoft.network/virtualnetworks/other'.format(
+             context.subscription_id, GROUP_NAME))]
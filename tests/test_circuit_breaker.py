@@ -0,0 +1,204 @@
+#!/usr/bin/python3
+#
+# test_circuit_breaker.py
+#
+# The per-endpoint circuit breakers, through a shared session against a
+# local stand-in server.
+
+import time
+
+import pytest
+
+pytest.importorskip('requests')
+
+import operations.circuit_breaker as circuit_breaker
+import operations.transport as transport
+from operations.circuit_breaker import CircuitOpenError
+from stand_in_server import StandInServer
+
+THRESHOLD = 3
+SLO = 0.2
+RESET = 0.3
+
+
+@pytest.fixture
+def breakers():
+    previous = circuit_breaker._default
+    yield circuit_breaker.configure(failure_threshold=THRESHOLD,
+                                    latency_slo=SLO, reset_timeout=RESET)
+    with circuit_breaker._default_lock:
+        circuit_breaker._default = previous
+
+
+@pytest.fixture
+def server():
+    with StandInServer() as server:
+        yield server
+
+
+@pytest.fixture
+def session(breakers):
+    session = transport.build_session(transport.TransportConfig(
+        rate_limit=False, circuit_breaker=True))
+    yield session
+    session.close()
+
+
+def _get(session, server):
+    """
+    :return: (int) the response's status
+    """
+    response = session.get(server.url)
+    response.close()
+    return response.status_code
+
+
+def test_opens_after_consecutive_errors(breakers, session, server):
+    server.status = 500
+    for _ in range(THRESHOLD - 1):
+        assert _get(session, server) == 500
+    assert breakers.breaker(server.url).state == circuit_breaker.CLOSED
+
+    assert _get(session, server) == 500
+    assert breakers.breaker(server.url).state == circuit_breaker.OPEN
+
+
+def test_a_success_resets_the_count(breakers, session, server):
+    for status in [500] * (THRESHOLD - 1) + [200] + [500] * (THRESHOLD - 1):
+        server.status = status
+        _get(session, server)
+
+    assert breakers.breaker(server.url).state == circuit_breaker.CLOSED
+
+
+def test_opens_after_consecutive_slo_breaches(breakers, session, server):
+    server.latency = lambda: SLO * 1.5
+    for _ in range(THRESHOLD):
+        assert _get(session, server) == 200
+
+    assert breakers.breaker(server.url).state == circuit_breaker.OPEN
+
+
+def test_rejects_while_open(breakers, session, server):
+    server.status = 500
+    for _ in range(THRESHOLD):
+        _get(session, server)
+    sent = server.requests
+
+    for _ in range(5):
+        with pytest.raises(CircuitOpenError) as raised:
+            _get(session, server)
+        assert 0 < raised.value.retry_in <= RESET
+
+    assert server.requests == sent
+
+
+def test_closes_after_a_successful_probe(breakers, session, server):
+    server.status = 500
+    for _ in range(THRESHOLD):
+        _get(session, server)
+
+    server.status = 200
+    time.sleep(RESET)
+    assert _get(session, server) == 200
+    assert breakers.breaker(server.url).state == circuit_breaker.CLOSED
+    assert _get(session, server) == 200
+
+
+def test_reopens_after_a_failed_probe(breakers, session, server):
+    server.status = 500
+    for _ in range(THRESHOLD):
+        _get(session, server)
+
+    time.sleep(RESET)
+    sent = server.requests
+    assert _get(session, server) == 500
+    assert breakers.breaker(server.url).state == circuit_breaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        _get(session, server)
+    assert server.requests == sent + 1
+
+
+def test_lets_one_probe_through_when_half_open():
+    breaker = circuit_breaker.Breaker('stand-in', failure_threshold=1,
+                                      reset_timeout=0)
+    breaker.record(False, 0)
+
+    breaker.before()
+    assert breaker.state == circuit_breaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before()
+
+    breaker.record(True, 0)
+    breaker.before()
+    assert breaker.state == circuit_breaker.CLOSED
+
+
+@pytest.fixture
+def arm(breakers):
+    pytest.importorskip('azure.mgmt.network')
+
+    import operations.authenticate_user as clients
+    from stand_in_server import StandInArm
+
+    clients.configure_transport(rate_limit=False, circuit_breaker=True)
+    try:
+        with StandInArm() as arm:
+            yield arm
+    finally:
+        clients.configure_transport()
+
+
+def _open(breakers, arm):
+    breaker = breakers.breaker(arm.url)
+    # no probe while the test runs
+    breaker.reset_timeout = 60
+    for _ in range(THRESHOLD):
+        breaker.record(False, 0)
+
+
+def test_dispatch_reports_an_open_circuit(breakers, arm, capsys):
+    import operations.dispatch as dispatch
+    from operations.resource_types import RESOURCE_TYPES
+
+    context = arm.context()
+    vnets = RESOURCE_TYPES['virtual_networks']
+    key = ('group', 'vnet')
+    parameters = {'location': 'usgovvirginia'}
+    dispatch.call(vnets, 'create_update', key, parameters, context=context)
+    _open(breakers, arm)
+    sent = arm.requests
+    capsys.readouterr()
+
+    assert dispatch.call(vnets, 'get', key, context=context) is None
+    assert dispatch.call(vnets, 'create_update', key, parameters,
+                         context=context) is None
+    assert dispatch.call(vnets, 'delete', key, context=context) is None
+    assert capsys.readouterr().out.count('Circuit open') == 3
+
+    with pytest.raises(CircuitOpenError):
+        dispatch.call(vnets, 'get', key, context=context, strict=True)
+    operation = dispatch.call(vnets, 'create_update', key, parameters,
+                              context=context, no_wait=True)
+    assert isinstance(operation.exception(), CircuitOpenError)
+
+    assert arm.requests == sent
+
+
+def test_async_writes_report_an_open_circuit(breakers, arm, capsys):
+    import asyncio
+
+    import operations.cumulus_aio as cumulus_aio
+
+    context = arm.context()
+    parameters = {'location': 'usgovvirginia'}
+    create = lambda: asyncio.run(cumulus_aio.create_update_virtual_networks(
+        'group', 'vnet', parameters, context=context))
+    assert create().name == 'vnet'
+    _open(breakers, arm)
+    capsys.readouterr()
+
+    assert create() is None
+    assert asyncio.run(cumulus_aio.delete_virtual_networks(
+        'group', 'vnet', context=context)) is None
+    assert capsys.readouterr().out.count('Circuit open') == 2
@@ -0,0 +1,153 @@
+#!/usr/bin/python3
+#
+# test_client_pool.py
+#
+# The client pool's shared sessions, with stand-in clients, credentials and
+# sessions.
+
+from collections import namedtuple
+from types import SimpleNamespace
+
+import pytest
+
+import operations.client_pool as client_pool
+from operations.client_pool import ClientContext, ClientPool
+
+Cloud = namedtuple('Cloud', ['name'])
+
+CLOUD = Cloud('AzureUSGovernment')
+
+
+class Credentials(object):
+
+    def __init__(self, tenant='tenant', client_id='client'):
+        self._tenant = tenant
+        self.id = client_id
+
+
+class Session(object):
+
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def sessions(monkeypatch):
+    sessions = []
+
+    def build_session(config):
+        sessions.append(Session())
+        return sessions[-1]
+
+    def attach_session(client, session, config):
+        client['session'] = session
+
+    monkeypatch.setattr(client_pool.transport, 'build_session', build_session)
+    monkeypatch.setattr(client_pool.transport, 'attach_session',
+                        attach_session)
+    return sessions
+
+
+def _build(kind, context):
+    # like the SDK clients, each holds on to its credentials
+    return {'kind': kind, 'credentials': context.credentials}
+
+
+def _pool(**kwargs):
+    return ClientPool(_build, **kwargs)
+
+
+def _context(subscription_id, credentials):
+    return ClientContext(subscription_id, CLOUD, credentials)
+
+
+def test_one_session_per_identity(sessions):
+    pool = _pool()
+    a = pool.get('network', _context('a', Credentials()))
+    b = pool.get('resource', _context('b', Credentials()))
+    c = pool.get('network', _context('a', Credentials(client_id='other')))
+
+    assert a['session'] is b['session']
+    assert c['session'] is not a['session']
+    assert len(sessions) == 2
+
+
+def test_session_closes_with_its_last_client(sessions):
+    pool = _pool(max_size=2)
+    credentials = Credentials()
+    pool.get('network', _context('a', credentials))
+    pool.get('network', _context('b', credentials))
+    # evicts a; b still uses the session
+    pool.get('network', _context('c', Credentials(client_id='other')))
+    assert len(pool) == 2
+    assert not sessions[0].closed
+
+    # evicts b
+    pool.get('network', _context('d', Credentials(client_id='third')))
+    assert sessions[0].closed
+    assert not sessions[1].closed
+
+    # the identity gets a new session when it is next used
+    client = pool.get('network', _context('a', credentials))
+    assert client['session'] is sessions[3]
+    assert sessions[1].closed
+
+
+def test_idle_clients_release_their_session(sessions, monkeypatch):
+    pool = _pool(idle_timeout=60)
+    pool.get('network', _context('a', Credentials()))
+
+    later = client_pool.time.time() + 120
+    monkeypatch.setattr(client_pool, 'time',
+                        SimpleNamespace(time=lambda: later))
+    pool.get('network', _context('b', Credentials(client_id='other')))
+
+    assert len(pool) == 1
+    assert sessions[0].closed
+
+
+def test_clear_closes_every_session(sessions):
+    pool = _pool()
+    pool.get('network', _context('a', Credentials()))
+    pool.get('network', _context('a', Credentials(client_id='other')))
+
+    pool.clear()
+    assert len(pool) == 0
+    assert all(session.closed for session in sessions)
+
+
+def test_credentials_without_a_client_id_are_kept_apart():
+    first, second = object(), object()
+
+    assert ClientPool.identity(Credentials()) == ClientPool.identity(
+        Credentials())
+    assert ClientPool.identity(first) != ClientPool.identity(second)
+
+
+def test_attached_session_is_used_on_every_thread():
+    pytest.importorskip('azure.mgmt.network')
+
+    import threading
+
+    from azure.mgmt.network import NetworkManagementClient
+    from msrest.authentication import BasicTokenAuthentication
+
+    transport = client_pool.transport
+    config = transport.TransportConfig(rate_limit=False)
+    session = transport.build_session(config)
+    client = NetworkManagementClient(
+        BasicTokenAuthentication({'access_token': 'token'}), 'subscription')
+    transport.attach_session(client, session, config)
+    driver = client._client.config.pipeline._sender.driver
+
+    seen = []
+    worker = threading.Thread(target=lambda: seen.append(driver.session))
+    worker.start()
+    worker.join()
+
+    assert driver.session is session
+    assert seen == [session]
+    session.close()
@@ -0,0 +1,102 @@
+#!/usr/bin/python3
+#
+# test_concurrency_limiter.py
+#
+# The adaptive concurrency limits, fed latencies directly.
+
+import random
+
+import pytest
+
+import operations.concurrency_limiter as concurrency_limiter
+from operations.concurrency_limiter import AdaptiveLimit, ConcurrencyLimiter
+
+ARM = 'https://management.usgovcloudapi.net'
+SUBSCRIPTION_ID = '00000000-0000-0000-0000-000000000000'
+SUBNETS = ('/subscriptions/' + SUBSCRIPTION_ID + '/resourceGroups/g/providers'
+           '/Microsoft.Network/virtualNetworks/v/subnets')
+
+
+class Clock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(concurrency_limiter, 'time', clock)
+    return clock
+
+
+def _respond(clock, limit, latency, ok=True):
+    started = limit.acquire()
+    clock.now += latency
+    limit.release(started, ok)
+
+
+def test_jittered_latency_is_not_congestion(clock):
+    rng = random.Random(1)
+    limit = AdaptiveLimit(initial=8, maximum=32)
+
+    # one family's responses spread from 50ms to 400ms
+    for _ in range(3000):
+        _respond(clock, limit, rng.uniform(0.05, 0.4))
+
+    assert int(limit.limit) == 32
+
+
+def test_sustained_slowdown_lowers_the_limit(clock):
+    rng = random.Random(1)
+    limit = AdaptiveLimit(initial=8, maximum=32)
+    for _ in range(2000):
+        _respond(clock, limit, rng.uniform(0.05, 0.15))
+    assert int(limit.limit) == 32
+
+    for _ in range(20):
+        _respond(clock, limit, rng.uniform(0.5, 0.7))
+
+    assert int(limit.limit) < 32
+
+
+def test_throttling_halves_the_limit_once_per_burst(clock):
+    limit = AdaptiveLimit(initial=16)
+    started = [limit.acquire() for _ in range(8)]
+    clock.now += 0.1
+    for start in started:
+        limit.release(start, False)
+
+    assert int(limit.limit) == 8
+
+
+def test_limits_are_kept_per_family_and_verb():
+    limiter = ConcurrencyLimiter()
+    for method, url in (('GET', SUBNETS + '/s'), ('GET', SUBNETS),
+                        ('PUT', SUBNETS + '/s'),
+                        ('GET', SUBNETS.rsplit('/', 1)[0])):
+        with limiter.request(method, ARM + url + '?api-version=2018-08-01'):
+            pass
+
+    assert sorted(limiter.stats()) == [
+        (SUBSCRIPTION_ID, 'microsoft.network/virtualnetworks', 'read'),
+        (SUBSCRIPTION_ID, 'microsoft.network/virtualnetworks/subnets',
+         'read'),
+        (SUBSCRIPTION_ID, 'microsoft.network/virtualnetworks/subnets',
+         'write')]
+
+
+def test_operation_polls_are_not_limited():
+    limiter = ConcurrencyLimiter()
+    for path in ('/providers/Microsoft.Network/locations/usgovvirginia'
+                 '/operations/1', '/operationresults/1'):
+        with limiter.request('GET', '{}/subscriptions/{}{}'.format(
+                ARM, SUBSCRIPTION_ID, path)):
+            pass
+
+    assert limiter.stats() == {}
+    assert concurrency_limiter.family(
+        ARM + '/subscriptions/x/resourcegroups/g') == 'resourcegroups'
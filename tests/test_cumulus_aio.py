@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+#
+# test_cumulus_aio.py
+#
+# The asyncio cumulus functions against a local stand-in ARM network
+# provider.
+
+import asyncio
+import inspect
+
+import pytest
+
+pytest.importorskip('azure.mgmt.network')
+
+import operations.cumulus_aio as cumulus_aio
+import operations.cumulus_operations as cumulus
+from stand_in_server import StandInArm
+
+GROUP_NAME = 'group'
+
+
+@pytest.fixture
+def arm():
+    with StandInArm() as arm:
+        yield arm
+
+
+def test_functions_keep_the_synchronous_signatures():
+    for name in ('create_update_subnets', 'get_subnets', 'delete_subnets',
+                 'get_resource_group'):
+        function = getattr(cumulus_aio, name)
+
+        assert inspect.iscoroutinefunction(function)
+        assert function.__name__ == name
+        assert inspect.signature(function) == inspect.signature(
+            getattr(cumulus, name))
+        assert name in function.__doc__
+        assert name in cumulus_aio.__all__
+
+
+def test_wrong_arguments_raise_type_error():
+    with pytest.raises(TypeError):
+        asyncio.run(cumulus_aio.get_subnets(GROUP_NAME, 'vnet'))
+    with pytest.raises(TypeError):
+        asyncio.run(cumulus_aio.get_subnets(GROUP_NAME, 'vnet', 'subnet',
+                                            no_wait=True))
+
+
+def test_writes_and_reads(arm):
+    context = arm.context()
+
+    async def run():
+        vnet = await cumulus_aio.create_update_virtual_networks(
+            GROUP_NAME, 'vnet', {'location': 'usgovvirginia'},
+            context=context)
+        subnets = await asyncio.gather(*[
+            cumulus_aio.create_update_subnets(
+                GROUP_NAME, 'vnet', 'subnet{}'.format(index),
+                {'address_prefix': '10.0.{}.0/24'.format(index)},
+                context=context)
+            for index in range(3)])
+        read = await cumulus_aio.get_subnets(GROUP_NAME, 'vnet', 'subnet1',
+                                             context=context, output='json')
+        handle = await cumulus_aio.delete_subnets(
+            GROUP_NAME, 'vnet', 'subnet2', context=context, no_wait=True)
+        return vnet, subnets, read, handle
+
+    vnet, subnets, read, handle = asyncio.run(run())
+
+    assert vnet.name == 'vnet'
+    assert [subnet.name for subnet in subnets] == [
+        'subnet0', 'subnet1', 'subnet2']
+    assert read['properties']['addressPrefix'] == '10.0.1.0/24'
+    assert hasattr(handle, 'result')
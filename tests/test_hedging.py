@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+#
+# test_hedging.py
+#
+# Hedged reads: a Hedger driven directly, and the shared sessions against a
+# local stand-in server with a slow tail.
+
+import threading
+import time
+
+import pytest
+
+import operations.hedging as hedging
+import operations.metrics as metrics
+
+SAMPLES = 20
+FAST = 0.01
+SLOW = 1.0
+
+
+class Response(object):
+    """
+    What a send returns; the hedger closes the copy it discards.
+    """
+
+    def __init__(self, name, status_code=200):
+        self.name = name
+        self.status_code = status_code
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class Sends(object):
+    """
+    A send callable taking each copy's latency from latencies, and its
+    status from statuses, in order, and noting when each copy started.
+    """
+
+    def __init__(self, *latencies, statuses=(200, 200)):
+        self.latencies = list(latencies)
+        self.statuses = list(statuses)
+        self.started = []
+        self.responses = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            number = len(self.started)
+            self.started.append(time.time())
+            response = Response(number, self.statuses[number])
+            self.responses.append(response)
+        time.sleep(self.latencies[number])
+        return response
+
+
+@pytest.fixture
+def hedger():
+    return hedging.Hedger(min_samples=SAMPLES, min_delay=0.05, workers=4)
+
+
+def _warm(hedger, url, latency=FAST):
+    for _ in range(SAMPLES):
+        hedger.send(Sends(latency), url)
+
+
+def test_no_hedge_before_enough_samples(hedger):
+    sends = Sends(0.2)
+    hedger.send(sends, 'https://stand-in/a')
+
+    assert len(sends.started) == 1
+    assert hedger.delay('https://stand-in/a') is None
+
+
+def test_no_hedge_within_the_percentile(hedger):
+    url = 'https://stand-in/a'
+    _warm(hedger, url)
+    hedged = metrics.counter('hedged_requests')
+
+    sends = Sends(FAST, FAST)
+    assert hedger.send(sends, url).name == 0
+
+    assert len(sends.started) == 1
+    assert metrics.counter('hedged_requests') == hedged
+
+
+def test_hedges_after_the_percentile(hedger):
+    url = 'https://stand-in/a'
+    _warm(hedger, url)
+    delay = hedger.delay(url)
+    won = metrics.counter('hedged_wins')
+
+    sends = Sends(SLOW, FAST)
+    started = time.time()
+    response = hedger.send(sends, url)
+
+    assert len(sends.started) == 2
+    assert sends.started[1] - sends.started[0] >= delay * 0.9
+    assert response.name == 1
+    assert time.time() - started < SLOW / 2
+    assert metrics.counter('hedged_wins') == won + 1
+
+    # the slower first copy is closed once it arrives
+    time.sleep(SLOW)
+    assert sends.responses[0].closed
+    assert not response.closed
+
+
+def test_returns_the_first_copy_when_it_answers_first(hedger):
+    url = 'https://stand-in/a'
+    _warm(hedger, url)
+
+    sends = Sends(0.2, SLOW)
+    response = hedger.send(sends, url)
+
+    assert len(sends.started) == 2
+    assert response.name == 0
+
+
+@pytest.mark.parametrize('status', [500, 503, 429])
+def test_an_error_response_waits_for_the_other_copy(hedger, status):
+    url = 'https://stand-in/a'
+    _warm(hedger, url)
+
+    sends = Sends(0.2, 0.4, statuses=(status, 200))
+    response = hedger.send(sends, url)
+
+    assert response.name == 1
+    assert response.status_code == 200
+    assert sends.responses[0].closed
+
+
+def test_an_error_response_is_returned_when_both_copies_fail(hedger):
+    url = 'https://stand-in/a'
+    _warm(hedger, url)
+
+    sends = Sends(0.2, 0.4, statuses=(503, 500))
+    response = hedger.send(sends, url)
+
+    assert response.name == 0
+    assert not response.closed
+    assert sends.responses[1].closed
+
+
+def test_delay_is_kept_per_endpoint(hedger):
+    _warm(hedger, 'https://fast/a')
+    _warm(hedger, 'https://slower/a', latency=0.1)
+
+    assert hedger.delay('https://fast/a') == pytest.approx(0.05)
+    assert hedger.delay('https://slower/a') >= 0.1
+
+
+def test_sessions_hedge_the_slow_tail():
+    pytest.importorskip('requests')
+
+    import operations.transport as transport
+    from stand_in_server import StandInServer
+
+    latencies = iter([FAST] * SAMPLES + [SLOW, FAST])
+    previous = hedging._default
+    hedging.configure(min_samples=SAMPLES, workers=4)
+    try:
+        with StandInServer(latency=lambda: next(latencies)) as server:
+            session = transport.build_session(transport.TransportConfig(
+                rate_limit=False, hedged_reads=True))
+            for _ in range(SAMPLES):
+                session.get(server.url).close()
+            assert server.requests == SAMPLES
+
+            started = time.time()
+            response = session.get(server.url)
+            assert response.status_code == 200
+            assert time.time() - started < SLOW / 2
+            assert server.requests == SAMPLES + 2
+            session.close()
+    finally:
+        with hedging._default_lock:
+            hedging._default = previous
@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+#
+# test_lro_scheduler.py
+#
+# The polling scheduler, driving stand-in operations.
+
+import threading
+
+import pytest
+
+import operations.lro_scheduler as lro_scheduler
+import operations.metrics as metrics
+from operations.lro_scheduler import PollingProfile, PollingScheduler
+
+PROFILE = PollingProfile(1, 60, 2)
+
+
+class Operation(object):
+    """
+    Reports each of statuses in turn, one per poll, and finishes after the
+    last.
+    """
+
+    def __init__(self, *statuses, retry_after=None):
+        self.statuses = list(statuses)
+        self.polls = 0
+        self._retry_after = retry_after
+        self._finished = False
+
+    def poll(self):
+        self.polls += 1
+        self._finished = self.polls >= len(self.statuses)
+        return self._finished
+
+    def done(self):
+        return self._finished
+
+    def status(self):
+        return self.statuses[min(self.polls, len(self.statuses) - 1)]
+
+    def retry_after(self):
+        return self._retry_after
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setitem(lro_scheduler.POLLING_PROFILES, 'stand-in', PROFILE)
+    return PollingScheduler(workers=1)
+
+
+def _entry(operation):
+    return lro_scheduler._Entry(operation, PROFILE)
+
+
+def test_backoff_grows_while_the_status_holds(scheduler):
+    entry = _entry(Operation(*['InProgress'] * 10))
+    intervals = []
+    for _ in range(8):
+        scheduler._poll(entry)
+        intervals.append(entry.interval)
+
+    assert intervals == [2, 4, 8, 16, 32, 60, 60, 60]
+
+
+def test_a_status_change_resets_the_backoff(scheduler):
+    entry = _entry(Operation('Accepted', 'Accepted', 'Accepted', 'Updating',
+                             'Updating', 'Succeeded'))
+    intervals = []
+    for _ in range(4):
+        scheduler._poll(entry)
+        intervals.append(entry.interval)
+
+    assert intervals == [2, 4, 1, 2]
+
+
+def test_retry_after_replaces_the_interval(scheduler):
+    entry = _entry(Operation('InProgress', 'InProgress', retry_after=3))
+    entry.interval = 60
+    assert scheduler._next_delay(entry) == 3
+
+    entry.operation._retry_after = None
+    assert scheduler._next_delay(entry) == 60
+
+
+def test_callback_errors_are_counted(scheduler, monkeypatch):
+    monkeypatch.setitem(lro_scheduler.POLLING_PROFILES, 'stand-in',
+                        PollingProfile(0.01, 0.01, 1))
+    errors = metrics.counter('lro_callback_errors')
+    called = threading.Event()
+
+    def fails(operation):
+        raise RuntimeError('callback failed')
+
+    operation = Operation('Succeeded')
+    scheduler.submit(operation, 'stand-in', callback=fails)
+    scheduler.submit(operation, callback=lambda operation: called.set())
+
+    assert called.wait(5)
+    assert metrics.counter('lro_callback_errors') == errors + 1
+    assert scheduler.stats()['callback_errors'] == errors + 1
@@ -0,0 +1,61 @@
+#!/usr/bin/python3
+#
+# test_provider_registration.py
+#
+# The persisted provider registration state, with a stand-in resource client.
+
+import os
+import stat
+from types import SimpleNamespace
+
+import pytest
+
+from operations.provider_registration import REGISTERED, RegistrationManager
+
+
+class Providers(object):
+
+    def __init__(self, states):
+        self.states = states
+        self.calls = []
+
+    def list(self):
+        self.calls.append('list')
+        return [SimpleNamespace(namespace=namespace, registration_state=state)
+                for namespace, state in self.states.items()]
+
+    def register(self, namespace):
+        self.calls.append(namespace)
+        self.states[namespace] = REGISTERED
+        return SimpleNamespace(namespace=namespace,
+                               registration_state=REGISTERED)
+
+
+@pytest.fixture
+def providers():
+    return Providers({'Microsoft.Network': 'NotRegistered'})
+
+
+def _manager(providers, tmp_path):
+    return RegistrationManager(SimpleNamespace(providers=providers),
+                               'subscription',
+                               path=str(tmp_path / 'provider_state.json'))
+
+
+def test_registered_state_is_reused(providers, tmp_path):
+    _manager(providers, tmp_path).ensure_registered(['Microsoft.Network'])
+    assert providers.calls == ['list', 'Microsoft.Network']
+
+    states = _manager(providers, tmp_path).ensure_registered(
+        ['Microsoft.Network'])
+    assert states == {'Microsoft.Network': REGISTERED}
+    assert providers.calls == ['list', 'Microsoft.Network']
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='POSIX file modes')
+def test_state_file_is_private(providers, tmp_path):
+    manager = _manager(providers, tmp_path)
+    manager.ensure_registered(['Microsoft.Network'])
+
+    assert stat.S_IMODE(os.stat(manager.path).st_mode) == 0o600
+    assert not os.path.exists(manager.path + '.tmp')
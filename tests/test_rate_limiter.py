@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+#
+# test_rate_limiter.py
+#
+# The process-wide rate limiter against a local server that enforces ARM's
+# per-subscription budgets.
+
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip('requests')
+
+import operations.rate_limiter as rate_limiter
+import operations.transport as transport
+from stand_in_server import StandInThrottlingServer
+
+WORKERS = 8
+READS = 300
+CAPACITY = 50
+RATE = 50
+
+
+@pytest.fixture
+def limiter():
+    previous = rate_limiter._default
+    yield rate_limiter.configure()
+    with rate_limiter._default_lock:
+        rate_limiter._default = previous
+
+
+@pytest.fixture(scope='module')
+def server():
+    with StandInThrottlingServer(capacity=CAPACITY, rate=RATE) as server:
+        yield server
+
+
+def _read_all(server, rate_limit):
+    """
+    Read READS times from WORKERS threads, resending a throttled read after
+    its Retry-After as the SDK's retry policy would.
+
+    :return: (subscription id, 429s received)
+    """
+    session = transport.build_session(
+        transport.TransportConfig(rate_limit=rate_limit))
+    # a subscription of its own, so each run starts with a full budget
+    subscription_id = str(uuid.uuid4())
+    url = '{}/subscriptions/{}/resourceGroups/stand-in'.format(
+        server.url, subscription_id)
+
+    def read(_):
+        while True:
+            response = session.get(url)
+            response.close()
+            if response.status_code != 429:
+                return
+            time.sleep(float(response.headers['Retry-After']))
+
+    before = server.throttled
+    with ThreadPoolExecutor(max_workers=WORKERS) as executor:
+        list(executor.map(read, range(READS)))
+    session.close()
+    return subscription_id, server.throttled - before
+
+
+def test_unlimited_reads_are_throttled(server, limiter):
+    _, throttled = _read_all(server, rate_limit=False)
+
+    assert throttled > 0
+
+
+def test_limited_reads_are_never_throttled(server, limiter):
+    subscription_id, throttled = _read_all(server, rate_limit=True)
+
+    assert throttled == 0
+    # learned from the remaining-reads headers; DEFAULT_BUDGETS assumes 25
+    bucket = limiter.bucket(subscription_id, rate_limiter.READ)
+    assert bucket.rate == pytest.approx(RATE, rel=0.3)
+
+
+def test_subscription_of():
+    url = ('https://management.usgovcloudapi.net/subscriptions/ABC/'
+           'resourceGroups/g?api-version=2018-08-01')
+
+    assert rate_limiter.subscription_of(url) == 'abc'
+    assert rate_limiter.subscription_of('https://login.example/token') is None
@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+#
+# test_resource_cache.py
+#
+# The read-through resource cache against a local stand-in ARM network
+# provider.
+
+import pytest
+
+pytest.importorskip('azure.mgmt.network')
+
+import operations.dispatch as dispatch
+import operations.resource_cache as resource_cache
+from operations.resource_types import RESOURCE_TYPES
+from stand_in_server import StandInArm
+
+VNETS = RESOURCE_TYPES['virtual_networks']
+KEY = ('group', 'vnet')
+
+
+@pytest.fixture
+def arm():
+    with StandInArm() as arm:
+        dispatch.call(VNETS, 'create_update', KEY,
+                      {'location': 'usgovvirginia'}, context=arm.context())
+        yield arm
+
+
+@pytest.fixture
+def cache():
+    yield resource_cache.enable()
+    resource_cache.disable()
+
+
+def test_hits_are_served_without_a_request(arm, cache):
+    context = arm.context()
+    dispatch.call(VNETS, 'get', KEY, context=context)
+    sent = arm.requests
+
+    assert dispatch.call(VNETS, 'get', KEY, context=context).name == 'vnet'
+    assert arm.requests == sent
+
+
+def test_callers_get_their_own_copy(arm, cache):
+    context = arm.context()
+    first = dispatch.call(VNETS, 'get', KEY, context=context)
+    first.location = 'changed'
+    first.tags = {'changed': 'yes'}
+
+    second = dispatch.call(VNETS, 'get', KEY, context=context)
+    assert second is not first
+    assert second.location == 'usgovvirginia'
+    assert not second.tags
+
+    second.location = 'changed again'
+    assert dispatch.call(VNETS, 'get', KEY,
+                         context=context).location == 'usgovvirginia'
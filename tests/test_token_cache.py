@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+#
+# test_token_cache.py
+#
+# The file-backed token cache, offline, against a local stand-in AAD token
+# endpoint.
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+pytest.importorskip('adal')
+pytest.importorskip('cryptography')
+
+import operations.token_cache as token_cache
+from stand_in_server import StandInTokenEndpoint
+
+# Gets a token the way a workflow process does and prints it.
+PROCESS = """
+import sys
+
+from msrestazure.azure_cloud import Cloud, CloudEndpoints
+
+import operations.token_cache as token_cache
+
+name, authority, certificate, path = sys.argv[1:]
+cloud = Cloud(name, endpoints=CloudEndpoints(
+    active_directory=authority,
+    active_directory_resource_id='https://management.core.windows.net/'))
+credentials = token_cache.service_principal_credentials(
+    'client', 'secret', 'tenant', cloud,
+    token_cache=token_cache.TokenCache(path), verify=certificate)
+print(credentials.token['access_token'])
+"""
+
+
+@pytest.fixture
+def aad():
+    with StandInTokenEndpoint() as aad:
+        yield aad
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return token_cache.TokenCache(path=str(tmp_path / 'token_cache.json'))
+
+
+def _credentials(aad, cache):
+    return token_cache.service_principal_credentials(
+        'client', 'secret', 'tenant', aad.cloud(), token_cache=cache,
+        verify=aad.certificate)
+
+
+def _process(aad, cache):
+    cloud = aad.cloud()
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    return subprocess.Popen(
+        [sys.executable, '-c', PROCESS, cloud.name,
+         cloud.endpoints.active_directory, aad.certificate, cache.path],
+        stdout=subprocess.PIPE, env=environment)
+
+
+def test_processes_share_one_token(aad, cache):
+    first = _process(aad, cache)
+    token = first.communicate()[0].strip()
+
+    others = [_process(aad, cache) for _ in range(4)]
+    tokens = [process.communicate()[0].strip() for process in others]
+
+    assert first.returncode == 0
+    assert tokens == [token] * 4
+    assert aad.requests == 1
+
+
+def test_new_credentials_reload_the_cache_file(aad, cache):
+    token = _credentials(aad, cache).token['access_token']
+
+    reloaded = _credentials(
+        aad, token_cache.TokenCache(path=cache.path)).token['access_token']
+
+    assert reloaded == token
+    assert aad.requests == 1
+
+
+def test_tokens_inside_the_margin_are_not_reused(cache):
+    with StandInTokenEndpoint(
+            expires_in=token_cache.DEFAULT_REFRESH_MARGIN - 10) as aad:
+        first = _credentials(aad, cache).token['access_token']
+        second = _credentials(aad, cache).token['access_token']
+
+        assert first != second
+        assert aad.requests == 2
+
+
+def test_signing_requests_does_not_read_the_file(aad, cache, monkeypatch):
+    credentials = _credentials(aad, cache)
+    reads = []
+    read = cache._read
+    monkeypatch.setattr(cache, '_read', lambda: reads.append(1) or read())
+
+    for _ in range(100):
+        credentials.signed_session().close()
+
+    assert reads == []
+    assert aad.requests == 1
+
+
+def test_force_renews_and_writes_back(aad, cache):
+    credentials = _credentials(aad, cache)
+    token = credentials.token['access_token']
+
+    credentials.set_token(force=True)
+
+    assert credentials.token['access_token'] != token
+    assert (cache.get(credentials.cache_key)['access_token']
+            == credentials.token['access_token'])
+    assert aad.requests == 2
@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+#
+# test_write_scheduler.py
+#
+# The per-resource write locks.
+
+import threading
+import time
+
+import pytest
+
+import operations.write_scheduler as write_scheduler
+
+KEY = ('AzureUSGovernment', '/subscriptions/s/resourcegroups/g/providers'
+       '/microsoft.network/virtualnetworks/vnet')
+
+
+def test_locks_are_dropped_once_released():
+    lock = write_scheduler._acquire(KEY)
+    assert KEY in write_scheduler._locks
+
+    lock.release()
+    assert KEY not in write_scheduler._locks
+
+
+def test_locks_are_kept_while_a_thread_waits():
+    first = write_scheduler._acquire(KEY)
+    acquired = threading.Event()
+
+    def wait():
+        write_scheduler._acquire(KEY)
+        acquired.set()
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    while write_scheduler._locks[KEY].users < 2:
+        time.sleep(0.01)
+
+    first.release()
+    assert acquired.wait(5)
+    waiter.join()
+    assert KEY in write_scheduler._locks
+
+    write_scheduler._locks[KEY].release()
+    assert KEY not in write_scheduler._locks
+
+
+def test_dispatched_writes_leave_no_locks():
+    pytest.importorskip('azure.mgmt.network')
+
+    import operations.dispatch as dispatch
+    from operations.resource_types import RESOURCE_TYPES
+    from stand_in_server import StandInArm
+
+    vnets = RESOURCE_TYPES['virtual_networks']
+    subnets = RESOURCE_TYPES['subnets']
+    with StandInArm() as arm:
+        context = arm.context()
+        for name in ('vnet0', 'vnet1'):
+            dispatch.call(vnets, 'create_update', ('group', name),
+                          {'location': 'usgovvirginia'}, context=context)
+
+        scheduler = write_scheduler.WriteScheduler(workers=2)
+        futures = [
+            scheduler.submit(subnets, 'create_update',
+                             ('group', 'vnet0', 'subnet{}'.format(index)),
+                             {'address_prefix': '10.0.{}.0/24'.format(index)},
+                             context=context)
+            for index in range(3)]
+        for future in futures:
+            future.result(timeout=30)
+
+    assert write_scheduler._locks == {}